@@ -56,7 +56,9 @@ CREATE TABLE IF NOT EXISTS raw_prices (
     seller_name VARCHAR(255),
     seller_rating NUMERIC(3, 2),
     stock_quantity INTEGER,
+    listing_key VARCHAR(255),
     scraped_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    last_seen_at TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -64,6 +66,7 @@ CREATE INDEX idx_raw_prices_card_name ON raw_prices(card_name);
 CREATE INDEX idx_raw_prices_card_set ON raw_prices(card_set);
 CREATE INDEX idx_raw_prices_source ON raw_prices(source);
 CREATE INDEX idx_raw_prices_scraped_at ON raw_prices(scraped_at DESC);
+CREATE UNIQUE INDEX uq_raw_prices_source_listing_key ON raw_prices(source, listing_key);
 CREATE INDEX idx_raw_prices_card_name_trgm ON raw_prices USING gin(card_name gin_trgm_ops);
 
 -- Processed prices table (aggregated data)
@@ -136,6 +139,8 @@ CREATE TABLE IF NOT EXISTS scrape_logs (
     completed_at TIMESTAMP WITH TIME ZONE,
     duration_seconds INTEGER,
     error_message TEXT,
+    circuit_state JSONB,
+    timings JSONB,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -156,6 +161,74 @@ CREATE TABLE IF NOT EXISTS market_statistics (
 CREATE INDEX idx_market_statistics_metric_name ON market_statistics(metric_name);
 CREATE INDEX idx_market_statistics_calculated_at ON market_statistics(calculated_at DESC);
 
+-- Scrape checkpoints table (latest run per source, for --resume)
+CREATE TABLE IF NOT EXISTS scrape_checkpoints (
+    source VARCHAR(255) PRIMARY KEY,
+    run_id VARCHAR(36) NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    completed_keys JSONB NOT NULL DEFAULT '[]'::jsonb,
+    last_completed_key VARCHAR(255),
+    last_blueprint_id INTEGER,
+    items_scraped INTEGER DEFAULT 0,
+    started_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+-- CardTrader blueprint fingerprints table (incremental crawls)
+CREATE TABLE IF NOT EXISTS cardtrader_blueprint_fingerprints (
+    blueprint_id INTEGER PRIMARY KEY,
+    expansion_id INTEGER,
+    listings_hash VARCHAR(64) NOT NULL,
+    listing_hashes JSONB NOT NULL DEFAULT '{}'::jsonb,
+    listing_count INTEGER DEFAULT 0,
+    unchanged_runs INTEGER DEFAULT 0,
+    last_seen_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_changed_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX idx_cardtrader_blueprint_fingerprints_expansion_id ON cardtrader_blueprint_fingerprints(expansion_id);
+CREATE INDEX idx_cardtrader_blueprint_fingerprints_last_changed_at ON cardtrader_blueprint_fingerprints(last_changed_at);
+
+-- Catalog cache table (scraper catalog metadata cached between runs)
+CREATE TABLE IF NOT EXISTS catalog_cache (
+    source VARCHAR(255) NOT NULL,
+    cache_key VARCHAR(255) NOT NULL,
+    payload JSONB NOT NULL,
+    version VARCHAR(64),
+    item_count INTEGER DEFAULT 0,
+    fetched_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    PRIMARY KEY (source, cache_key)
+);
+
+CREATE INDEX idx_catalog_cache_fetched_at ON catalog_cache(fetched_at);
+
+-- Scrape jobs table (distributed work queue, claimed with FOR UPDATE SKIP LOCKED)
+CREATE TABLE IF NOT EXISTS scrape_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    source VARCHAR(50) NOT NULL,
+    unit_type VARCHAR(50) NOT NULL,
+    unit_key VARCHAR(255) NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    available_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    lease_owner VARCHAR(255),
+    lease_expires_at TIMESTAMP WITH TIME ZONE,
+    items_scraped INTEGER DEFAULT 0,
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    completed_at TIMESTAMP WITH TIME ZONE,
+    CONSTRAINT uq_scrape_jobs_unit UNIQUE (unit_type, unit_key)
+);
+
+CREATE INDEX idx_scrape_jobs_source ON scrape_jobs(source);
+CREATE INDEX idx_scrape_jobs_claim ON scrape_jobs(status, priority, available_at);
+
 -- Function to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -191,3 +264,7 @@ COMMENT ON TABLE deal_scores IS 'Calculated deal scores for listings';
 COMMENT ON TABLE alerts IS 'User-configured price alerts';
 COMMENT ON TABLE scrape_logs IS 'Scraping session logs';
 COMMENT ON TABLE market_statistics IS 'Overall market statistics';
+COMMENT ON TABLE scrape_checkpoints IS 'Scraper run progress for resuming interrupted runs';
+COMMENT ON TABLE cardtrader_blueprint_fingerprints IS 'CardTrader listing fingerprints for incremental crawls';
+COMMENT ON TABLE catalog_cache IS 'Scraper catalog metadata cached between runs';
+COMMENT ON TABLE scrape_jobs IS 'Distributed scrape work queue';
@@ -45,8 +45,10 @@ class MarketStatsCalculator:
             
             # Query raw prices
             from app.models import RawPrice  # Assuming raw_prices table exists
+            # Listings upserted by the scraper keep their first scraped_at,
+            # so a listing still live is in the window by its last sighting
             query = select(RawPrice).where(
-                RawPrice.scraped_at >= cutoff_date
+                func.coalesce(RawPrice.last_seen_at, RawPrice.scraped_at) >= cutoff_date
             )
             
             result = await session.execute(query)
@@ -100,7 +102,7 @@ class MarketStatsCalculator:
                 'price': float(price.price),
                 'currency': price.currency,
                 'condition': price.condition,
-                'scraped_at': price.scraped_at,
+                'scraped_at': price.last_seen_at or price.scraped_at,  # Latest sighting
                 'source': price.source,
             })
         
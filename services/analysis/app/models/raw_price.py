@@ -28,5 +28,7 @@ class RawPrice(Base):
     seller_name = Column(String(255))
     seller_rating = Column(Numeric(3, 2))
     stock_quantity = Column(Integer)
-    scraped_at = Column(DateTime(timezone=True))
+    listing_key = Column(String(255))  # Set for listings kept as one row across scrapes
+    scraped_at = Column(DateTime(timezone=True))  # First seen
+    last_seen_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True))
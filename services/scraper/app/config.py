@@ -2,6 +2,8 @@
 Scraper Configuration
 """
 
+from typing import Dict, List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -18,9 +20,14 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Long-running processes replace older connections
+    DB_POOL_PRE_PING: bool = True  # Check pooled connections (idle between runs) before use
 
     # Scraping Configuration
     SCRAPE_INTERVAL: int = 60  # minutes
+    PARALLEL_SCRAPE_CYCLE: bool = True  # Run enabled sources concurrently
     SCRAPE_TIMEOUT: int = 30  # seconds
     MAX_RETRIES: int = 3
     RETRY_DELAY: int = 5  # seconds
@@ -28,6 +35,17 @@ class Settings(BaseSettings):
     # Rate Limiting
     REQUESTS_PER_MINUTE: int = 30
     CONCURRENT_REQUESTS: int = 3
+    REQUESTS_PER_MINUTE_MAX: int = 60  # Adaptive limiter ramps up to this while the site is healthy
+    RATE_LIMIT_MIN_PER_SECOND: float = 0.05  # Floor after repeated 429/503s
+    RATE_LIMIT_INCREASE: float = 0.1  # req/s gained per second without throttling
+    RATE_LIMIT_DECREASE_FACTOR: float = 0.5  # Rate multiplier on 429/503
+    RATE_LIMIT_MAX_RETRY_AFTER: float = 300.0  # Cap for honoured Retry-After (seconds)
+
+    # Circuit Breaker (per host, or host + proxy)
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive 403/5xx/timeouts before failing fast
+    CIRCUIT_RECOVERY_SECONDS: float = 300.0  # Open time before the first half-open probe
+    CIRCUIT_MAX_RECOVERY_SECONDS: float = 3600.0  # Cap after repeated failed probes
+    CIRCUIT_HALF_OPEN_PROBES: int = 1  # Probe requests let through while half-open
 
     # Proxy Configuration
     PROXY_ENABLED: bool = False
@@ -35,20 +53,86 @@ class Settings(BaseSettings):
     PROXY_USERNAME: str = ""
     PROXY_PASSWORD: str = ""
     PROXY_COUNTRY: str = "NL"  # Netherlands default for EU
+    PROXY_URLS: List[str] = []  # More proxies for the pool, JSON list (same credentials)
+    PROXY_HEALTH_WINDOW: int = 100  # Recent requests per proxy used for success rate and latency
+    PROXY_MIN_SAMPLES: int = 10  # Requests before the success rate can quarantine a proxy
+    PROXY_MIN_SUCCESS_RATE: float = 0.7
+    PROXY_MAX_CONSECUTIVE_FAILURES: int = 5
+    PROXY_QUARANTINE_SECONDS: float = 600.0
 
     # Browser Configuration
     HEADLESS: bool = True
     USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 
+    # HTML Parsing
+    PARSER_BACKEND: str = "selectolax"  # selectolax (fast) or bs4
+    PARSE_IN_PROCESS_POOL: bool = False  # Parse pages in worker processes
+    PARSE_WORKERS: int = 0  # 0 = one per CPU
+
     # Data Sources (example)
     CARDMARKET_ENABLED: bool = True
     CARDTRADER_ENABLED: bool = True
     TCGPLAYER_EU_ENABLED: bool = False
+    TCGPLAYER_ENABLED: bool = False  # Orchestrator only (Partner API with config_tcgplayer USE_API)
+    EBAY_ENABLED: bool = False  # Job queue mode and orchestrator only
+
+    # Scrape Orchestrator (run_orchestrator.py): one long-running process runs
+    # every enabled source on its own schedule with warm HTTP clients and DB pool
+    ORCHESTRATOR_SCHEDULES: Dict[str, str] = {  # Crontab per source; sources without one only run on trigger
+        "CardMarket": "*/30 * * * *",
+        "CardTrader": "0 * * * *",
+        "eBay": "0 */6 * * *",
+        "TCGPlayer": "0 */2 * * *",
+    }
+    ORCHESTRATOR_TIMEZONE: str = "UTC"
+    ORCHESTRATOR_HOST: str = "127.0.0.1"  # Control API (trigger / status); keep it off public interfaces
+    ORCHESTRATOR_PORT: int = 8090  # 0 = no control API
+    ORCHESTRATOR_RUN_ON_START: bool = False  # Run every source once at startup
+    ORCHESTRATOR_SHUTDOWN_GRACE_SECONDS: float = 120.0  # Running scrapes get this long to finish on stop
+
+    # Distributed Job Queue (scrape_jobs table, claimed with SKIP LOCKED)
+    JOB_QUEUE_ENABLED: bool = False  # Plan scrape units into the queue and work them off
+    JOB_WORKER_CONCURRENCY: int = 4  # Units processed at once per container
+    JOB_LEASE_SECONDS: int = 300  # A unit is reclaimed if its worker stops heartbeating
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_POLL_INTERVAL: float = 5.0  # seconds to wait when the queue is empty
+    JOB_BLUEPRINT_BATCH_SIZE: int = 50  # CardTrader blueprints per unit
+
+    # Priority Scheduling (job queue mode): spend a request budget per cycle
+    # on the units with the highest expected information gain
+    PRIORITY_SCHEDULING: bool = True
+    SCRAPE_REQUEST_BUDGET: int = 20000  # Estimated requests planned per cycle
+    PRIORITY_MAX_AGE_HOURS: float = 168.0  # Staleness cap; never-fetched units count as this old
+    PRIORITY_STATS_DAYS: int = 7  # market_statistics window
+    PRIORITY_WEIGHT_VOLATILITY: float = 2.0
+    PRIORITY_WEIGHT_LIQUIDITY: float = 1.0
+    PRIORITY_WEIGHT_POPULARITY: float = 1.0
+    # Mirrors analysis_config.POPULAR_SETS (0-100)
+    POPULAR_SETS: Dict[str, float] = {
+        "Base Set": 100.0,
+        "151": 95.0,
+        "Paldean Fates": 90.0,
+        "Obsidian Flames": 85.0,
+        "Scarlet-Violet-151": 95.0,
+        "Paradox Rift": 80.0,
+    }
+    DEFAULT_POPULARITY: float = 50.0
 
     # Storage
     BATCH_SIZE: int = 100
+    INGEST_QUEUE_SIZE: int = 1000  # Max parsed rows waiting for the DB writer
+    INGEST_FLUSH_INTERVAL: float = 5.0  # seconds before a partial batch is written
+    LISTING_UPSERT_ENABLED: bool = True  # One row per (source, listing_key), kept current; False = append every sighting
     CACHE_ENABLED: bool = True
-    CACHE_TTL: int = 3600  # seconds
+    CACHE_TTL: int = 86400  # seconds a cached page is kept; pages are always revalidated (304) when fetched
+    CACHE_DIR: str = ".cache/http"  # Mounted as the scraper_cache volume in Docker
+
+    # HTTP Record / Replay (offline benchmarks and debugging)
+    HTTP_RECORD_DIR: str = ""  # Save every response here (one JSON file per request)
+    HTTP_REPLAY_DIR: str = ""  # Serve responses from here instead of the network
+
+    # Metrics (per-stage timings are also stored in scrape_logs.timings)
+    METRICS_PORT: int = 0  # Serve Prometheus metrics on /metrics at this port (0 = off)
 
 
 settings = Settings()
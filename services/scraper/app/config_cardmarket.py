@@ -20,6 +20,7 @@ class CardMarketConfig(BaseSettings):
     MIN_DELAY_SECONDS: float = 2.0  # Minimum delay between requests
     MAX_DELAY_SECONDS: float = 5.0  # Maximum delay for randomization
     REQUESTS_PER_MINUTE: int = 20   # Conservative rate limit
+    REQUESTS_PER_MINUTE_MAX: int = 30  # Adaptive limiter ceiling while no 429s are seen
     
     # Request Configuration
     TIMEOUT_SECONDS: int = 30
@@ -38,7 +39,9 @@ class CardMarketConfig(BaseSettings):
     
     # Scraping Scope
     MAX_PAGES_PER_SET: int = 10  # Limit pages to scrape per set
-    MAX_SETS_PER_RUN: int = 5    # Limit sets per scrape run
+    MAX_PAGES_PER_RUN: int = 200  # Crawl budget across all sets
+    MAX_SETS_PER_RUN: int = 0    # Limit sets per scrape run (0 = all, the page budget bounds the run)
+    CONCURRENT_FETCHES: int = 2  # Pages in flight; the host rate limiter still applies
     
     # Pokemon Sets to Scrape (expansions)
     PRIORITY_SETS: List[str] = [
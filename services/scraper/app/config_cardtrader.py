@@ -30,6 +30,32 @@ class CardTraderScraperConfig(BaseSettings):
     MAX_DELAY_SECONDS: float = 0.5
     REQUEST_TIMEOUT: int = 30
 
+    # Concurrency (blueprint workers share one global request budget)
+    CONCURRENT_WORKERS: int = 4  # 1 = sequential crawl
+    MAX_REQUESTS_PER_SECOND: int = 8  # Starting rate; CardTrader allows ~10 req/s on marketplace endpoints
+    MAX_REQUESTS_PER_SECOND_CEILING: int = 10  # Adaptive limiter never ramps above this
+    MAX_THROTTLE_RETRIES: int = 3  # Retries of a request answered 429/503
+
+    # HTTP Connection Pool (one client reused for the whole run)
+    HTTP2_ENABLED: bool = True  # Requires httpx[http2]; falls back to HTTP/1.1
+    MAX_CONNECTIONS: int = 10
+    MAX_KEEPALIVE_CONNECTIONS: int = 10
+    KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+
+    # Catalog Cache (expansions / blueprints kept in Postgres between runs)
+    CATALOG_CACHE_ENABLED: bool = True
+    EXPANSIONS_CACHE_TTL_HOURS: float = 24.0  # New sets show up within a day
+    BLUEPRINTS_CACHE_TTL_HOURS: float = 168.0  # Also refetched when the expansion record changes
+    CATALOG_CACHE_VERSION: int = 1  # Bump to drop everything cached before
+
+    # Streaming JSON (marketplace listings / expansions decoded while they download)
+    STREAM_JSON_MIN_BYTES: int = 256 * 1024  # Smaller bodies are decoded in one go (faster per row); requires ijson
+
+    # Incremental Crawl (only write new/changed listings)
+    INCREMENTAL_CRAWL: bool = True
+    STABLE_AFTER_HOURS: float = 24.0  # Blueprint unchanged this long counts as stable
+    STABLE_RECHECK_HOURS: float = 6.0  # Stable blueprints are refetched at most this often
+
     # Logging
     LOG_LEVEL: str = "INFO"
 
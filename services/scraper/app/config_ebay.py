@@ -44,9 +44,16 @@ class EbayScraperConfig(BaseSettings):
     
     # Rate Limiting
     REQUESTS_PER_MINUTE: int = 20   # eBay allows ~5000/day
+    REQUESTS_PER_MINUTE_MAX: int = 30  # Per-site ceiling for the adaptive limiter
     MIN_DELAY_SECONDS: float = 2.0
     MAX_DELAY_SECONDS: float = 5.0
     
+    # Concurrency (sites are separate hosts, each with its own rate limiter)
+    CONCURRENT_SITES: bool = True   # Crawl all sites at once; False = one site after another
+    SEARCHES_PER_SITE: int = 2      # Keyword searches in flight per site (pages stay sequential)
+    MAX_CONNECTIONS: int = 24       # Shared pooled client, across all sites
+    MAX_KEEPALIVE_CONNECTIONS: int = 12
+    
     # Retry Configuration
     MAX_RETRIES: int = 3
     RETRY_DELAY_SECONDS: int = 5
@@ -17,7 +17,19 @@ class TCGPlayerScraperConfig(BaseSettings):
     API_PUBLIC_KEY: str = ""  # Get from tcgplayer.com/partner
     API_PRIVATE_KEY: str = ""
     USE_API: bool = False  # Set to True if you have API credentials
-    
+    API_VERSION: str = "v1.39.0"  # "" = latest
+    API_CATEGORY_ID: int = 3  # Pokemon
+    API_PRODUCT_TYPES: list[str] = ["Cards", "Sealed Products"]
+    API_GROUP_IDS: dict[str, int] = {}  # TARGET_SETS name -> groupId, where name matching picks the wrong group
+    API_PAGE_SIZE: int = 100  # Catalog results per request (API maximum)
+    API_PRICING_BATCH_SIZE: int = 250  # Product IDs per pricing request
+    API_CONCURRENCY: int = 8  # API requests in flight at once
+    API_REQUESTS_PER_SECOND: float = 5.0
+    API_REQUESTS_PER_SECOND_MAX: float = 10.0  # Adaptive limiter ceiling while no 429s are seen
+    API_MAX_THROTTLE_RETRIES: int = 3  # Retries of a 429/503 response
+    API_TOKEN_CACHE_FILE: str = ".cache/tcgplayer_token.json"  # "" = keep the token in memory only
+    API_TOKEN_REFRESH_MARGIN_SECONDS: int = 3600  # Renew tokens this long before they expire
+
     # Target Game
     GAME_NAME: str = "pokemon"
     
@@ -61,6 +73,7 @@ class TCGPlayerScraperConfig(BaseSettings):
     
     # Rate Limiting (TCGPlayer is strict about scraping)
     REQUESTS_PER_MINUTE: int = 20
+    REQUESTS_PER_MINUTE_MAX: int = 30  # Adaptive limiter ceiling while no 429s are seen
     MIN_DELAY_SECONDS: float = 2.0
     MAX_DELAY_SECONDS: float = 5.0
     
@@ -0,0 +1,322 @@
+"""
+Scrape Job Worker
+Plans scrape units into the shared job queue and works them off
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.config_cardmarket import cardmarket_config
+from app.config_ebay import config as ebay_config
+from app.scrapers.cardmarket_production import CardMarketProductionScraper
+from app.scrapers.cardtrader_scraper_new import CardTraderScraperV2
+from app.scrapers.ebay_scraper import EbayScraper
+from app.utils.circuit_breaker import open_sources
+from app.utils.ingest_pipeline import RawPriceIngestPipeline
+from app.utils.job_queue import ScrapeJobQueue
+from app.utils.scrape_scheduler import PriorityScheduler
+
+logger = logging.getLogger(__name__)
+
+# Blueprint batches outrank every scheduled root unit, so started
+# expansions finish before new ones fan out
+FANOUT_PRIORITY = 1_000_000
+
+
+def enabled_sources() -> List[str]:
+    """
+    Sources whose units this deployment plans and works
+    """
+    sources = []
+    if settings.CARDTRADER_ENABLED:
+        sources.append("CardTrader")
+    if settings.CARDMARKET_ENABLED:
+        sources.append("CardMarket")
+    if settings.EBAY_ENABLED:
+        sources.append("eBay")
+    return sources
+
+
+class ScrapeJobWorker:
+    """
+    Runs scrape units claimed from the scrape_jobs queue
+
+    Units are small and independent (a CardTrader expansion or blueprint
+    batch, a CardMarket set, an eBay site + keyword), so any number of
+    workers in any number of containers can share one cycle. Each worker
+    keeps one warm scraper per source and runs JOB_WORKER_CONCURRENCY units
+    at a time; a unit is only marked done after its rows are written.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, sources: Optional[List[str]] = None):
+        """
+        Initialize job worker
+
+        Args:
+            concurrency: Units processed at once (defaults to settings.JOB_WORKER_CONCURRENCY)
+            sources: Sources to plan and claim (defaults to the enabled ones)
+        """
+        self.queue = ScrapeJobQueue()
+        self.concurrency = max(1, concurrency or settings.JOB_WORKER_CONCURRENCY)
+        self.sources = sources or enabled_sources()
+        self.running = False
+
+        self._scrapers: Dict[str, Any] = {}
+        self._scraper_lock = asyncio.Lock()
+        self._cardmarket_pipeline: Optional[RawPriceIngestPipeline] = None
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[int]]] = {
+            "cardtrader_expansion": self._run_cardtrader_expansion,
+            "cardtrader_blueprints": self._run_cardtrader_blueprints,
+            "cardmarket_singles": self._run_cardmarket_singles,
+            "cardmarket_sealed": self._run_cardmarket_sealed,
+            "ebay_search": self._run_ebay_search,
+        }
+
+    async def plan_cycle(self) -> int:
+        """
+        Enqueue this cycle's root units for every enabled source
+
+        Safe to run from several containers at once: units still pending
+        or running are not duplicated. With PRIORITY_SCHEDULING, only the
+        units with the best expected gain per request are queued, up to
+        SCRAPE_REQUEST_BUDGET.
+
+        Returns:
+            Number of units queued
+        """
+        units: List[Dict[str, Any]] = []
+
+        if "CardTrader" in self.sources:
+            scraper = await self._get_scraper("CardTrader")
+            for expansion in await scraper.fetch_recent_expansions():
+                units.append({
+                    "source": "CardTrader",
+                    "unit_type": "cardtrader_expansion",
+                    "unit_key": expansion["id"],
+                    "payload": self._expansion_payload(expansion, scraper.expansion_version(expansion)),
+                    "set_name": expansion.get("name_en") or expansion.get("name"),
+                })
+
+        if "CardMarket" in self.sources:
+            if cardmarket_config.SCRAPE_SINGLES:
+                set_names = cardmarket_config.PRIORITY_SETS
+                if cardmarket_config.MAX_SETS_PER_RUN:
+                    set_names = set_names[:cardmarket_config.MAX_SETS_PER_RUN]
+                for set_name in set_names:
+                    units.append({
+                        "source": "CardMarket",
+                        "unit_type": "cardmarket_singles",
+                        "unit_key": set_name,
+                        "payload": {"set_name": set_name},
+                        "set_name": set_name,
+                    })
+            if cardmarket_config.SCRAPE_SEALED:
+                units.append({
+                    "source": "CardMarket",
+                    "unit_type": "cardmarket_sealed",
+                    "unit_key": "sealed",
+                })
+
+        if "eBay" in self.sources:
+            for site in ebay_config.EBAY_SITES:
+                for keyword in ebay_config.SEARCH_KEYWORDS:
+                    units.append({
+                        "source": "eBay",
+                        "unit_type": "ebay_search",
+                        "unit_key": f"{site}:{keyword}",
+                        "payload": {"site": site, "keyword": keyword},
+                    })
+
+        if settings.PRIORITY_SCHEDULING:
+            scheduler = PriorityScheduler()
+            await scheduler.load_signals()
+            units = scheduler.select(units)
+
+        queued = await self.queue.enqueue_many(units)
+        logger.info(f"📋 Planned {queued}/{len(units)} scrape units ({', '.join(self.sources)})")
+        return queued
+
+    async def run(self) -> None:
+        """
+        Claim and run units until stop() is called
+        """
+        self.running = True
+        logger.info(f"Job worker {self.queue.worker_id} started: {self.concurrency} slots, sources {self.sources}")
+
+        await asyncio.gather(*(self._work_loop(self.queue.for_slot(slot)) for slot in range(self.concurrency)))
+
+    def stop(self) -> None:
+        """
+        Ask the work loops to exit after their current unit
+        """
+        self.running = False
+
+    async def close(self) -> None:
+        """
+        Write queued rows and close every scraper's client
+        """
+        for source, scraper in self._scrapers.items():
+            try:
+                if source == "CardTrader":
+                    # Blueprint units write through their own pipelines
+                    await scraper.cleanup_client()
+                elif source == "CardMarket":
+                    await self._cardmarket_pipeline.close()
+                    await scraper.cleanup_client()
+                elif source == "eBay":
+                    await scraper.close()
+            except Exception as e:
+                logger.error(f"Error closing {source} scraper: {e}")
+
+        self._scrapers = {}
+
+    async def _work_loop(self, queue: ScrapeJobQueue) -> None:
+        """
+        One slot: claim a unit, run it, repeat
+
+        Args:
+            queue: The slot's queue handle, owning the leases it claims
+        """
+        while self.running:
+            # Leave units of blocked sources queued and work the healthy ones
+            blocked = open_sources(self.sources)
+            sources = [source for source in self.sources if source not in blocked]
+            if not sources:
+                await asyncio.sleep(settings.JOB_POLL_INTERVAL)
+                continue
+
+            try:
+                jobs = await queue.claim(limit=1, sources=sources)
+            except Exception as e:
+                logger.error(f"Could not claim scrape job: {e}")
+                jobs = []
+
+            if not jobs:
+                await asyncio.sleep(settings.JOB_POLL_INTERVAL)
+                continue
+
+            await self._execute(jobs[0], queue)
+
+    async def _execute(self, job: Dict[str, Any], queue: ScrapeJobQueue) -> None:
+        """
+        Run one claimed unit and record the outcome
+        """
+        unit = f"{job['unit_type']}:{job['unit_key']}"
+        handler = self._handlers.get(job["unit_type"])
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"], queue))
+
+        error = None
+        items = 0
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown unit type {job['unit_type']}")
+            items = await handler(job["payload"] or {})
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        finally:
+            heartbeat.cancel()
+
+        try:
+            if error:
+                await queue.fail(job, error)
+            else:
+                await queue.complete(job["id"], items)
+                logger.info(f"✅ {unit}: {items} items")
+        except Exception as e:
+            # The lease will expire and another worker retries the unit
+            logger.error(f"Could not record outcome of {unit}: {e}")
+
+    async def _heartbeat(self, job_id: int, queue: ScrapeJobQueue) -> None:
+        """
+        Keep a unit's lease alive while it runs
+        """
+        interval = settings.JOB_LEASE_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await queue.heartbeat(job_id)
+            except Exception as e:
+                logger.warning(f"Heartbeat for scrape job {job_id} failed: {e}")
+
+    async def _get_scraper(self, source: str) -> Any:
+        """
+        The warm scraper for a source, created on first use
+        """
+        async with self._scraper_lock:
+            scraper = self._scrapers.get(source)
+            if scraper is not None:
+                return scraper
+
+            if source == "CardTrader":
+                scraper = CardTraderScraperV2()
+                await scraper.setup_client()
+            elif source == "CardMarket":
+                scraper = CardMarketProductionScraper()
+                await scraper.setup_client()
+                self._cardmarket_pipeline = RawPriceIngestPipeline()
+            elif source == "eBay":
+                scraper = EbayScraper()
+            else:
+                raise ValueError(f"Unknown source {source}")
+
+            self._scrapers[source] = scraper
+            return scraper
+
+    def _expansion_payload(self, expansion: Dict[str, Any], version: Optional[str] = None) -> Dict[str, Any]:
+        """Fields of a CardTrader expansion the scraper needs"""
+        return {
+            "id": expansion["id"],
+            "name": expansion.get("name"),
+            "name_en": expansion.get("name_en"),
+            "version": version,  # Catalog cache version of its blueprints
+        }
+
+    async def _run_cardtrader_expansion(self, payload: Dict[str, Any]) -> int:
+        """
+        Fan an expansion out into blueprint batch units
+        """
+        scraper = await self._get_scraper("CardTrader")
+        blueprints = await scraper.fetch_blueprints(payload["id"], payload.get("version"))
+        batch_size = max(1, settings.JOB_BLUEPRINT_BATCH_SIZE)
+
+        units = [
+            {
+                "source": "CardTrader",
+                "unit_type": "cardtrader_blueprints",
+                "unit_key": f"{payload['id']}:{start // batch_size}",
+                "payload": {
+                    "expansion": payload,
+                    "blueprints": [
+                        {"id": blueprint["id"], "name": blueprint.get("name")}
+                        for blueprint in blueprints[start:start + batch_size]
+                    ],
+                },
+                "priority": FANOUT_PRIORITY,
+            }
+            for start in range(0, len(blueprints), batch_size)
+        ]
+
+        await self.queue.enqueue_many(units)
+        logger.info(f"  {payload.get('name')}: {len(blueprints)} blueprints in {len(units)} batches")
+        return 0
+
+    async def _run_cardtrader_blueprints(self, payload: Dict[str, Any]) -> int:
+        scraper = await self._get_scraper("CardTrader")
+        return await scraper.scrape_blueprint_batch(payload["expansion"], payload["blueprints"])
+
+    async def _run_cardmarket_singles(self, payload: Dict[str, Any]) -> int:
+        scraper = await self._get_scraper("CardMarket")
+        return await scraper.scrape_singles_set(payload["set_name"], self._cardmarket_pipeline)
+
+    async def _run_cardmarket_sealed(self, payload: Dict[str, Any]) -> int:
+        scraper = await self._get_scraper("CardMarket")
+        return await scraper.scrape_sealed_products(self._cardmarket_pipeline)
+
+    async def _run_ebay_search(self, payload: Dict[str, Any]) -> int:
+        scraper = await self._get_scraper("eBay")
+        since = scraper.pipeline.mark()
+        count = await scraper.scrape_search(payload["site"], payload["keyword"])
+        await scraper.pipeline.flush(since)
+        return count
@@ -6,7 +6,7 @@ import asyncio
 import signal
 import sys
 import logging
-from typing import Any
+from typing import Any, Dict, Optional
 from datetime import datetime
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -17,6 +17,12 @@ from app.database import init_db, AsyncSessionLocal
 from app.scrapers.cardmarket import CardMarketScraper
 from app.scrapers.cardtrader import CardTraderScraper
 from app.models.scrape_log import ScrapeLog
+from app.job_worker import ScrapeJobWorker
+from app.utils.parse_pool import shutdown_parse_pool
+from app.utils.rate_limiter import rate_limiter_metrics
+from app.utils.circuit_breaker import circuit_breaker_states, open_sources
+from app.utils.proxy_manager import proxy_manager
+from app.utils.scrape_metrics import format_breakdown, get_scrape_metrics, run_breakdown, start_metrics_server
 
 # Configure logging
 logging.basicConfig(
@@ -35,6 +41,16 @@ class ScraperService:
         self.scheduler = AsyncIOScheduler()
         self.running = False
         self.scrapers = []
+        self.job_worker: Optional[ScrapeJobWorker] = None
+        self._job_worker_task: Optional[asyncio.Task] = None
+        self._metrics_runner: Optional[Any] = None
+        
+        # Job queue mode: cycles are planned into scrape_jobs and worked off
+        # by every running container instead of one in-process cycle
+        if settings.JOB_QUEUE_ENABLED:
+            self.job_worker = ScrapeJobWorker()
+            logger.info(f"Job queue mode: {', '.join(self.job_worker.sources)}")
+            return
         
         # Initialize scrapers based on config
         if settings.CARDMARKET_ENABLED:
@@ -52,10 +68,18 @@ class ScraperService:
         logger.info(f"Starting Pokemon Intel EU Scraper v{settings.APP_VERSION}")
         logger.info(f"Scrape interval: {settings.SCRAPE_INTERVAL} minutes")
         logger.info(f"Enabled scrapers: {len(self.scrapers)}")
+        logger.info(f"Cycle mode: {'parallel' if settings.PARALLEL_SCRAPE_CYCLE else 'sequential'}")
         
         # Initialize database
         await init_db()
         
+        if settings.METRICS_PORT:
+            self._metrics_runner = await start_metrics_server(settings.METRICS_PORT)
+        
+        if self.job_worker:
+            await self.start_job_queue()
+            return
+        
         # Schedule scraping jobs
         self.scheduler.add_job(
             self.run_scrape_cycle,
@@ -85,13 +109,54 @@ class ScraperService:
         except asyncio.CancelledError:
             pass
 
+    async def start_job_queue(self):
+        """
+        Plan cycles on the schedule and work units off the shared queue
+        """
+        self.scheduler.add_job(
+            self.job_worker.plan_cycle,
+            IntervalTrigger(minutes=settings.SCRAPE_INTERVAL),
+            id='plan_cycle',
+            name='Plan Pokemon Card Scrape Units',
+            max_instances=1,
+        )
+        
+        try:
+            await self.job_worker.plan_cycle()
+        except Exception as e:
+            logger.error(f"Initial planning failed: {e}")
+        
+        self.scheduler.start()
+        self.running = True
+        
+        logger.info("Scraper service started in job queue mode")
+        
+        self._job_worker_task = asyncio.create_task(self.job_worker.run())
+        try:
+            await self._job_worker_task
+        except asyncio.CancelledError:
+            pass
+
     async def stop(self):
         """
         Stop the scraper service
         """
         logger.info("Stopping scraper service...")
         self.running = False
-        self.scheduler.shutdown(wait=False)
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+        
+        if self.job_worker:
+            self.job_worker.stop()
+            if self._job_worker_task and not self._job_worker_task.done():
+                await asyncio.gather(self._job_worker_task, return_exceptions=True)
+            await self.job_worker.close()
+        
+        if self._metrics_runner:
+            await self._metrics_runner.cleanup()
+            self._metrics_runner = None
+        
+        shutdown_parse_pool()
         logger.info("Scraper service stopped")
 
     async def run_scrape_cycle(self):
@@ -105,19 +170,40 @@ class ScraperService:
         cycle_start = datetime.utcnow()
         total_scraped = 0
         
-        for scraper in self.scrapers:
-            try:
-                await self.run_scraper(scraper)
-                total_scraped += 1
-            except Exception as e:
-                logger.error(f"Error in {scraper.__class__.__name__}: {e}")
-                continue
+        if settings.PARALLEL_SCRAPE_CYCLE:
+            # Sources hit different hosts and each scraper owns its rate
+            # limiter, so run them side by side; one failing doesn't stop the rest
+            results = await asyncio.gather(
+                *(self.run_scraper(scraper) for scraper in self.scrapers),
+                return_exceptions=True,
+            )
+            for scraper, result in zip(self.scrapers, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error in {scraper.__class__.__name__}: {result}")
+                else:
+                    total_scraped += 1
+        else:
+            for scraper in self.scrapers:
+                try:
+                    await self.run_scraper(scraper)
+                    total_scraped += 1
+                except Exception as e:
+                    logger.error(f"Error in {scraper.__class__.__name__}: {e}")
+                    continue
         
         cycle_duration = (datetime.utcnow() - cycle_start).total_seconds()
         
         logger.info("=" * 60)
         logger.info(f"Scrape cycle completed in {cycle_duration:.2f}s")
         logger.info(f"Scrapers run: {total_scraped}/{len(self.scrapers)}")
+        for host, metrics in rate_limiter_metrics().items():
+            logger.info(f"Rate {host}: {metrics['rate']:.2f}/{metrics['max_rate']:.2f} req/s, {metrics['throttled']} throttled")
+        for proxy, health in proxy_manager.metrics().items():
+            quarantined = " (quarantined)" if health["quarantined"] else ""
+            logger.info(f"Proxy {proxy}: {health['success_rate']:.0%} ok, p50 {health['p50_ms']}ms, p95 {health['p95_ms']}ms{quarantined}")
+        for name, state in circuit_breaker_states().items():
+            if state["state"] != "closed":
+                logger.warning(f"Circuit {name}: {state['state']} ({state['last_error']}), next probe {state.get('next_probe_at')}")
         logger.info("=" * 60)
 
     async def run_scraper(self, scraper):
@@ -125,6 +211,23 @@ class ScraperService:
         Run a single scraper and log results
         """
         scraper_name = scraper.__class__.__name__
+        
+        # Don't spend the cycle retrying a source whose hosts are all blocked
+        if scraper.source_name in open_sources([scraper.source_name]):
+            logger.warning(f"⛔ Skipping {scraper_name}: circuit open")
+            now = datetime.utcnow()
+            await self.log_scrape_session(
+                source=scraper.source_name,
+                status="skipped",
+                items_scraped=0,
+                errors_count=0,
+                started_at=now,
+                completed_at=now,
+                duration_seconds=0,
+                error_message="Circuit open",
+            )
+            return
+        
         logger.info(f"\n--- Running {scraper_name} ---")
         
         started_at = datetime.utcnow()
@@ -132,6 +235,8 @@ class ScraperService:
         items_scraped = 0
         errors_count = 0
         error_message = None
+        metrics = get_scrape_metrics(scraper.source_name)
+        metrics_before = metrics.snapshot()
         
         try:
             # Run the scraper
@@ -150,6 +255,8 @@ class ScraperService:
             # Log to database
             completed_at = datetime.utcnow()
             duration = int((completed_at - started_at).total_seconds())
+            timings = run_breakdown(metrics_before, metrics.snapshot())
+            logger.info(f"⏱️ {scraper_name}: {format_breakdown(timings)}")
             
             await self.log_scrape_session(
                 source=scraper.source_name,
@@ -159,7 +266,8 @@ class ScraperService:
                 started_at=started_at,
                 completed_at=completed_at,
                 duration_seconds=duration,
-                error_message=error_message
+                error_message=error_message,
+                timings=timings
             )
 
     async def log_scrape_session(
@@ -171,7 +279,8 @@ class ScraperService:
         started_at: datetime,
         completed_at: datetime,
         duration_seconds: int,
-        error_message: str = None
+        error_message: str = None,
+        timings: Optional[Dict[str, Any]] = None
     ):
         """
         Log scraping session to database
@@ -186,7 +295,9 @@ class ScraperService:
                     started_at=started_at,
                     completed_at=completed_at,
                     duration_seconds=duration_seconds,
-                    error_message=error_message
+                    error_message=error_message,
+                    circuit_state=circuit_breaker_states(source),
+                    timings=timings,
                 )
                 session.add(log)
                 await session.commit()
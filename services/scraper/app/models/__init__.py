@@ -4,5 +4,9 @@ Scraper Database Models
 
 from app.models.raw_price import RawPrice
 from app.models.scrape_log import ScrapeLog
+from app.models.blueprint_fingerprint import BlueprintFingerprint
+from app.models.scrape_checkpoint import ScrapeCheckpoint
+from app.models.scrape_job import ScrapeJob
+from app.models.catalog_cache import CatalogCacheEntry
 
-__all__ = ["RawPrice", "ScrapeLog"]
+__all__ = ["RawPrice", "ScrapeLog", "BlueprintFingerprint", "ScrapeCheckpoint", "ScrapeJob", "CatalogCacheEntry"]
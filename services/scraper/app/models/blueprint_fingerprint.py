@@ -0,0 +1,35 @@
+"""
+CardTrader Blueprint Fingerprint Model
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class BlueprintFingerprint(Base):
+    """
+    Last-seen listing set per CardTrader blueprint, for incremental crawls
+    """
+
+    __tablename__ = "cardtrader_blueprint_fingerprints"
+
+    blueprint_id = Column(Integer, primary_key=True, autoincrement=False)
+    expansion_id = Column(Integer, index=True)
+    
+    # Fingerprints
+    listings_hash = Column(String(64), nullable=False)  # Hash of the whole listing set
+    listing_hashes = Column(JSONB, nullable=False, default=dict)  # listing_id -> listing hash
+    listing_count = Column(Integer, default=0)
+    
+    # Change tracking
+    unchanged_runs = Column(Integer, default=0)  # Consecutive fetches with an identical set
+    last_seen_at = Column(DateTime(timezone=True), nullable=False)
+    last_changed_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<BlueprintFingerprint(blueprint_id={self.blueprint_id}, listings={self.listing_count}, unchanged_runs={self.unchanged_runs})>"
@@ -0,0 +1,31 @@
+"""
+Catalog Cache Model
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class CatalogCacheEntry(Base):
+    """
+    Cached catalog metadata (e.g. CardTrader expansions and blueprints) between runs
+    """
+
+    __tablename__ = "catalog_cache"
+
+    source = Column(String(255), primary_key=True)
+    cache_key = Column(String(255), primary_key=True)  # e.g. "v1:expansions", "v1:blueprints:1234"
+    
+    # Cached API response
+    payload = Column(JSONB, nullable=False)
+    version = Column(String(64))  # Version of the parent record the payload was fetched for
+    item_count = Column(Integer, default=0)
+    
+    fetched_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<CatalogCacheEntry(source='{self.source}', key='{self.cache_key}', items={self.item_count})>"
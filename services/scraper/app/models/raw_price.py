@@ -11,7 +11,12 @@ from app.database import Base
 
 class RawPrice(Base):
     """
-    Append-only raw price data from scrapers
+    Raw price data from scrapers
+
+    Append-only, except rows with a listing_key (a marketplace's own
+    listing/item ID): those are upserted on (source, listing_key), so a
+    listing seen on every scrape stays one row whose price and
+    last_seen_at are kept current.
     """
 
     __tablename__ = "raw_prices"
@@ -35,9 +40,11 @@ class RawPrice(Base):
     seller_name = Column(String(255))
     seller_rating = Column(Numeric(3, 2))
     stock_quantity = Column(Integer)
+    listing_key = Column(String(255))  # Marketplace listing ID (None = not de-duplicated)
     
     # Timestamps
-    scraped_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    scraped_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)  # First seen
+    last_seen_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Indexes for common queries
@@ -45,6 +52,7 @@ class RawPrice(Base):
         Index('idx_card_name_scraped', 'card_name', 'scraped_at'),
         Index('idx_source_scraped', 'source', 'scraped_at'),
         Index('idx_card_set_name', 'card_set', 'card_name'),
+        Index('uq_raw_prices_source_listing_key', 'source', 'listing_key', unique=True),
     )
 
     def __repr__(self):
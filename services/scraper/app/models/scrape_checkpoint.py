@@ -0,0 +1,33 @@
+"""
+Scrape Checkpoint Model
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.database import Base
+
+
+class ScrapeCheckpoint(Base):
+    """
+    Progress of the latest run per source, so a crashed run can be resumed
+    """
+
+    __tablename__ = "scrape_checkpoints"
+
+    source = Column(String(255), primary_key=True)
+    run_id = Column(String(36), nullable=False)
+    status = Column(String(50), nullable=False)  # running, completed, failed
+    
+    # Progress
+    completed_keys = Column(JSONB, nullable=False, default=list)  # Expansions / sets finished this run
+    last_completed_key = Column(String(255))
+    last_blueprint_id = Column(Integer)
+    items_scraped = Column(Integer, default=0)
+    
+    # Timing
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<ScrapeCheckpoint(source='{self.source}', run_id='{self.run_id}', status='{self.status}', completed={len(self.completed_keys or [])})>"
@@ -0,0 +1,53 @@
+"""
+Scrape Job Model
+"""
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class ScrapeJob(Base):
+    """
+    One unit of scrape work (an expansion, a blueprint batch, a set page,
+    an eBay site + keyword), claimed by workers with FOR UPDATE SKIP LOCKED
+    """
+
+    __tablename__ = "scrape_jobs"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    
+    # Unit of work
+    source = Column(String(50), nullable=False, index=True)
+    unit_type = Column(String(50), nullable=False)  # cardtrader_expansion, cardtrader_blueprints, ...
+    unit_key = Column(String(255), nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    priority = Column(Integer, nullable=False, default=0)  # Higher is claimed first
+    
+    # State
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Retry backoff
+    
+    # Lease
+    lease_owner = Column(String(255))
+    lease_expires_at = Column(DateTime(timezone=True))
+    
+    # Result
+    items_scraped = Column(Integer, default=0)
+    last_error = Column(Text)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    completed_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        UniqueConstraint("unit_type", "unit_key", name="uq_scrape_jobs_unit"),
+        Index("idx_scrape_jobs_claim", "status", "priority", "available_at"),
+    )
+
+    def __repr__(self):
+        return f"<ScrapeJob(id={self.id}, unit='{self.unit_type}:{self.unit_key}', status='{self.status}', attempts={self.attempts})>"
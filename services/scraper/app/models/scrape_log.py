@@ -4,6 +4,7 @@ Scrape Log Model
 
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -34,6 +35,16 @@ class ScrapeLog(Base):
     # Error Details
     error_message = Column(Text)
     
+    # Circuit breaker per host at the end of the run (state, failures, trips, ...)
+    circuit_state = Column(JSONB)
+    
+    # Per-stage breakdown of the run: fetch/parse/write/sleep/rate_limit seconds,
+    # requests, bytes, errors, retries and a fetch latency histogram.
+    # Stage seconds add up concurrent tasks (can exceed duration_seconds), and
+    # other runs of the same source overlapping this one are counted in too
+    # (see run_breakdown)
+    timings = Column(JSONB)
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     def __repr__(self):
@@ -0,0 +1,390 @@
+"""
+Scrape Orchestrator
+Runs every enabled source on its own schedule in one long-running process
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+
+from app.config import settings
+from app.database import engine, init_db
+from app.scrapers.cardmarket_production import CardMarketProductionScraper
+from app.scrapers.cardtrader_scraper_new import CardTraderScraperV2
+from app.scrapers.ebay_scraper import EbayScraper
+from app.scrapers.tcgplayer_scraper import TCGPlayerScraper
+from app.utils.circuit_breaker import open_sources
+from app.utils.ingest_pipeline import RawPriceIngestPipeline
+from app.utils.parse_pool import shutdown_parse_pool
+from app.utils.scrape_metrics import prometheus_metrics
+
+logger = logging.getLogger(__name__)
+
+SOURCES = ("CardMarket", "CardTrader", "eBay", "TCGPlayer")
+
+
+def enabled_sources() -> List[str]:
+    """
+    Sources this deployment runs
+    """
+    flags = {
+        "CardMarket": settings.CARDMARKET_ENABLED,
+        "CardTrader": settings.CARDTRADER_ENABLED,
+        "eBay": settings.EBAY_ENABLED,
+        "TCGPlayer": settings.TCGPLAYER_ENABLED,
+    }
+    return [source for source in SOURCES if flags[source]]
+
+
+class ScrapeOrchestrator:
+    """
+    Runs every source in one event loop, each on its own schedule
+
+    Started from cron, every run_*.py run pays for interpreter start-up,
+    imports, a new DB pool, new HTTP clients and cold caches (catalog
+    cache, TCGPlayer API token). The orchestrator keeps one warm scraper
+    per source for the life of the process instead, so runs reuse its HTTP
+    clients and caches and every source shares the pooled DB engine.
+
+    Each source runs on its own crontab schedule (ORCHESTRATOR_SCHEDULES)
+    and can be triggered on demand (trigger(), or POST /run/<source> on the
+    control API). A source never runs twice at once; a run that comes due
+    while the last one is still going is skipped. A run that raises drops
+    its scraper, so the next run starts with fresh clients.
+    """
+
+    def __init__(self, sources: Optional[List[str]] = None, schedules: Optional[Dict[str, str]] = None):
+        """
+        Initialize orchestrator
+
+        Args:
+            sources: Sources to run (defaults to the enabled ones)
+            schedules: Crontab per source (defaults to settings.ORCHESTRATOR_SCHEDULES)
+        """
+        self.sources = sources or enabled_sources()
+        self.schedules = settings.ORCHESTRATOR_SCHEDULES if schedules is None else schedules
+        self.scheduler = AsyncIOScheduler(timezone=settings.ORCHESTRATOR_TIMEZONE)
+
+        self._scrapers: Dict[str, Any] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._stopping: Optional[asyncio.Event] = None
+        self._control_runner: Optional[Any] = None
+        self._runners: Dict[str, Callable[[Any, Dict[str, Any]], Awaitable[int]]] = {
+            "CardMarket": self._run_cardmarket,
+            "CardTrader": self._run_cardtrader,
+            "eBay": self._run_ebay,
+            "TCGPlayer": self._run_tcgplayer,
+        }
+
+        # Per-source run history for the status endpoint
+        self.state: Dict[str, Dict[str, Any]] = {
+            source: {"running": False, "runs": 0, "failures": 0, "last_run": None}
+            for source in self.sources
+        }
+
+    async def start(self, run_now: bool = False) -> None:
+        """
+        Connect the DB pool, schedule every source and open the control API
+
+        Args:
+            run_now: Also run every source right away
+        """
+        self._stopping = asyncio.Event()
+        await init_db()
+
+        for source in self.sources:
+            crontab = self.schedules.get(source)
+            if not crontab:
+                logger.info(f"🗓️ {source}: on trigger only")
+                continue
+
+            self.scheduler.add_job(
+                self._scheduled_run,
+                CronTrigger.from_crontab(crontab, timezone=settings.ORCHESTRATOR_TIMEZONE),
+                args=[source],
+                id=f"scrape_{source}",
+                name=f"{source} scrape",
+                max_instances=1,
+                coalesce=True,  # Runs missed while the loop was busy collapse into one
+                misfire_grace_time=300,
+            )
+        self.scheduler.start()
+
+        for job in self.scheduler.get_jobs():
+            logger.info(f"🗓️ {job.name}: {self.schedules[job.args[0]]} (next {job.next_run_time})")
+
+        if settings.ORCHESTRATOR_PORT:
+            self._control_runner = await start_control_server(
+                self, settings.ORCHESTRATOR_HOST, settings.ORCHESTRATOR_PORT
+            )
+
+        if run_now or settings.ORCHESTRATOR_RUN_ON_START:
+            for source in self.sources:
+                self.trigger(source)
+
+        logger.info(f"Scrape orchestrator started: {', '.join(self.sources)}")
+
+    async def run_forever(self) -> None:
+        """
+        Wait until request_stop() is called
+        """
+        await self._stopping.wait()
+
+    def request_stop(self) -> None:
+        """
+        Ask run_forever() to return (signal handlers call this)
+        """
+        if self._stopping:
+            self._stopping.set()
+
+    async def stop(self) -> None:
+        """
+        Stop scheduling, let running scrapes finish (up to the grace period) and close everything
+        """
+        logger.info("Stopping scrape orchestrator...")
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+
+        if self._control_runner:
+            await self._control_runner.cleanup()
+            self._control_runner = None
+
+        running = [task for task in self._tasks.values() if not task.done()]
+        if running:
+            logger.info(f"Waiting up to {settings.ORCHESTRATOR_SHUTDOWN_GRACE_SECONDS:.0f}s for {len(running)} running scrape(s)")
+            _, pending = await asyncio.wait(running, timeout=settings.ORCHESTRATOR_SHUTDOWN_GRACE_SECONDS)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        for source in list(self._scrapers):
+            await self._drop_scraper(source)
+
+        shutdown_parse_pool()
+        await engine.dispose()
+        logger.info("Scrape orchestrator stopped")
+
+    def trigger(self, source: str, resume: bool = False) -> bool:
+        """
+        Start a run of a source now, unless one is already running
+
+        Args:
+            source: Source name (one of self.sources)
+            resume: Continue the last unfinished run (CardMarket, CardTrader)
+
+        Returns:
+            True if a run was started
+        """
+        if source not in self.state:
+            raise ValueError(f"Source {source} is not run by this orchestrator")
+
+        task = self._tasks.get(source)
+        if task and not task.done():
+            logger.info(f"⏭️ {source} is still running, not starting another run")
+            return False
+
+        self._tasks[source] = asyncio.create_task(self._run(source, {"resume": resume}), name=f"scrape-{source}")
+        return True
+
+    async def run_once(self, sources: Optional[List[str]] = None, resume: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Run sources once, side by side, and wait for them (cron-style use)
+
+        Returns:
+            Last run of each source
+        """
+        sources = sources or self.sources
+        for source in sources:
+            self.trigger(source, resume=resume)
+        await asyncio.gather(*(self._tasks[source] for source in sources), return_exceptions=True)
+        return {source: self.state[source]["last_run"] for source in sources}
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Run state, last run and next scheduled run of every source
+        """
+        sources = {}
+        for source, state in self.state.items():
+            job = self.scheduler.get_job(f"scrape_{source}") if self.scheduler.running else None
+            sources[source] = {
+                **state,
+                "schedule": self.schedules.get(source),
+                "next_run_at": job.next_run_time.isoformat() if job and job.next_run_time else None,
+                "warm": source in self._scrapers,
+            }
+        return {"sources": sources}
+
+    async def _scheduled_run(self, source: str) -> None:
+        """Scheduler job (a coroutine, so it runs in the loop and not in a thread)"""
+        self.trigger(source)
+
+    async def _run(self, source: str, options: Dict[str, Any]) -> None:
+        """
+        One run of a source with its warm scraper, recorded in self.state
+        """
+        state = self.state[source]
+
+        # Don't spend the run retrying a source whose hosts are all blocked
+        if source in open_sources([source]):
+            logger.warning(f"⛔ Skipping {source}: circuit open")
+            state["last_run"] = {"status": "skipped", "started_at": datetime.utcnow().isoformat(), "error": "Circuit open"}
+            return
+
+        state["running"] = True
+        started_at = datetime.utcnow()
+        run: Dict[str, Any] = {"status": "running", "started_at": started_at.isoformat(), "items": 0, "error": None}
+        state["last_run"] = run
+        logger.info(f"▶️ {source} run started")
+
+        try:
+            scraper = await self._get_scraper(source)
+            run["items"] = await self._runners[source](scraper, options)
+            run["status"] = "success"
+            # Rows the run reported may not all have reached the database
+            pipeline = getattr(scraper, "pipeline", None)
+            if pipeline is not None and pipeline.failed_batches:
+                run["status"] = "partial"
+                run["error"] = f"{pipeline.failed_rows} rows in {pipeline.failed_batches} batches not written"
+                logger.warning(f"⚠️ {source} run partial: {run['error']}")
+        except asyncio.CancelledError:
+            run["status"] = "cancelled"
+            raise
+        except Exception as e:
+            run["status"] = "failed"
+            run["error"] = str(e) or e.__class__.__name__
+            state["failures"] += 1
+            logger.error(f"❌ {source} run failed: {e}")
+            await self._drop_scraper(source)
+        finally:
+            completed_at = datetime.utcnow()
+            run["completed_at"] = completed_at.isoformat()
+            run["duration_seconds"] = round((completed_at - started_at).total_seconds(), 1)
+            state["running"] = False
+            state["runs"] += 1
+            if run["status"] == "success":
+                logger.info(f"✅ {source}: {run['items']} items in {run['duration_seconds']:.0f}s")
+
+    async def _get_scraper(self, source: str) -> Any:
+        """
+        The warm scraper for a source, created (with its clients) on first use
+        """
+        scraper = self._scrapers.get(source)
+        if scraper is not None:
+            return scraper
+
+        if source == "CardMarket":
+            scraper = CardMarketProductionScraper()
+            await scraper.setup_client()
+        elif source == "CardTrader":
+            scraper = CardTraderScraperV2()
+            await scraper.setup_client()
+        elif source == "eBay":
+            scraper = EbayScraper()
+        elif source == "TCGPlayer":
+            scraper = TCGPlayerScraper()
+        else:
+            raise ValueError(f"Unknown source {source}")
+
+        self._scrapers[source] = scraper
+        return scraper
+
+    async def _drop_scraper(self, source: str) -> None:
+        """
+        Close a source's scraper and its clients
+        """
+        scraper = self._scrapers.pop(source, None)
+        if scraper is None:
+            return
+
+        try:
+            if source == "CardMarket":
+                await scraper.cleanup_client()
+            elif source == "CardTrader":
+                try:
+                    await scraper.pipeline.close()
+                finally:
+                    await scraper.cleanup_client()
+            else:
+                await scraper.close()
+        except Exception as e:
+            logger.error(f"Error closing {source} scraper: {e}")
+
+    async def _fresh_pipeline(self, scraper: Any) -> None:
+        """
+        Give a warm scraper a new ingest pipeline
+
+        Rows still queued by the last run are written first, and the
+        pipeline's counters (rows written, dropped batches) start from zero.
+        """
+        try:
+            await scraper.pipeline.close()
+        except Exception as e:
+            logger.warning(f"Could not close previous ingest pipeline: {e}")
+        scraper.pipeline = RawPriceIngestPipeline()
+
+    async def _run_cardmarket(self, scraper: CardMarketProductionScraper, options: Dict[str, Any]) -> int:
+        # scrape() opens its own pipeline per run
+        return await scraper.scrape(resume=options.get("resume", False))
+
+    async def _run_cardtrader(self, scraper: CardTraderScraperV2, options: Dict[str, Any]) -> int:
+        await self._fresh_pipeline(scraper)
+        items = await scraper.scrape_all(resume=options.get("resume", False))
+        # scrape_all() logs and swallows its errors, returning 0
+        if scraper.last_error:
+            raise RuntimeError(scraper.last_error)
+        return items
+
+    async def _run_ebay(self, scraper: EbayScraper, options: Dict[str, Any]) -> int:
+        await self._fresh_pipeline(scraper)
+        stats = await scraper.scrape_all_sites()
+        return sum(stats.values())
+
+    async def _run_tcgplayer(self, scraper: TCGPlayerScraper, options: Dict[str, Any]) -> int:
+        await self._fresh_pipeline(scraper)
+        return await scraper.scrape_all_sets()
+
+
+async def start_control_server(orchestrator: ScrapeOrchestrator, host: str, port: int) -> Any:
+    """
+    Serve the orchestrator's control API on http://<host>:<port>
+
+    GET /status, POST /run/<source>[?resume=1] and GET /metrics (Prometheus).
+
+    Returns:
+        The aiohttp runner (call cleanup() on shutdown)
+    """
+    from aiohttp import web
+
+    sources = {source.lower(): source for source in orchestrator.sources}
+
+    async def handle_status(request: Any) -> Any:
+        return web.json_response(orchestrator.status())
+
+    async def handle_run(request: Any) -> Any:
+        source = sources.get(request.match_info["source"].lower())
+        if source is None:
+            return web.json_response(
+                {"error": f"Unknown source, expected one of {', '.join(orchestrator.sources)}"}, status=404
+            )
+
+        resume = request.query.get("resume", "").lower() in ("1", "true", "yes")
+        started = orchestrator.trigger(source, resume=resume)
+        return web.json_response({"source": source, "started": started}, status=202 if started else 409)
+
+    async def handle_metrics(request: Any) -> Any:
+        return web.Response(text=prometheus_metrics(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/status", handle_status)
+    app.router.add_post("/run/{source}", handle_run)
+    app.router.add_get("/metrics", handle_metrics)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"🎛️ Orchestrator control API at http://{host}:{port} (/status, /run/<source>, /metrics)")
+    return runner
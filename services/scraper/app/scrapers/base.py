@@ -6,13 +6,17 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import logging
+import time
 
 import httpx
-from bs4 import BeautifulSoup
 
 from app.config import settings
-from app.utils.rate_limiter import RateLimiter
-from app.utils.proxy_manager import proxy_manager
+from app.utils.rate_limiter import get_host_limiter
+from app.utils.circuit_breaker import get_breaker
+from app.utils.proxy_manager import ProxyClientPool, proxy_manager
+from app.utils.http_cache import http_cache
+from app.utils.html_parser import parse_document
+from app.utils.scrape_metrics import get_scrape_metrics, source_of
 
 logger = logging.getLogger(__name__)
 
@@ -20,16 +24,13 @@ logger = logging.getLogger(__name__)
 class BaseScraper(ABC):
     """
     Abstract base class for all scrapers
-    Uses httpx + BeautifulSoup by default (more reliable than Playwright)
+    Uses httpx + selectolax by default (more reliable than Playwright),
+    BeautifulSoup with PARSER_BACKEND=bs4
     """
 
     def __init__(self):
         self.name = self.__class__.__name__
-        self.rate_limiter = RateLimiter(
-            max_calls=settings.REQUESTS_PER_MINUTE,
-            period=60,
-        )
-        self.client: Optional[httpx.AsyncClient] = None
+        self.clients: Optional[ProxyClientPool] = None
         self.headers = {
             "User-Agent": settings.USER_AGENT,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
@@ -42,59 +43,94 @@ class BaseScraper(ABC):
 
     async def setup_client(self):
         """
-        Setup HTTP client
+        Setup HTTP clients (one per proxy, created as proxies get picked)
         """
-        proxy_config = proxy_manager.get_proxy()
-        proxies = None
-        
-        if proxy_config and proxy_config.get("server"):
-            proxies = {
-                "http://": proxy_config["server"],
-                "https://": proxy_config["server"],
-            }
-            logger.info(f"Using proxy: {proxy_config['server']}")
+        if proxy_manager.enabled and proxy_manager.proxies:
+            logger.info(f"Using proxy pool: {len(proxy_manager.proxies)} proxies")
         
-        self.client = httpx.AsyncClient(
+        self.clients = ProxyClientPool(
             headers=self.headers,
-            proxies=proxies,
             timeout=settings.SCRAPE_TIMEOUT,
             follow_redirects=True,
         )
 
     async def cleanup_client(self):
         """
-        Cleanup HTTP client
+        Cleanup HTTP clients
         """
-        if self.client:
-            await self.client.aclose()
-            self.client = None
+        if self.clients:
+            await self.clients.aclose()
+            self.clients = None
 
-    async def get_html(self, url: str) -> str:
+    async def get_html(self, url: str) -> Optional[str]:
         """
         Get HTML content from URL with rate limiting
-        """
-        await self.rate_limiter.acquire()
         
-        if not self.client:
+        Returns None when the page is unchanged since the last fetch
+        (answered 304 Not Modified to the cached validators), in which
+        case the caller can skip parsing and saving it. The validators are
+        cached as soon as the page arrives: a caller that fails to parse or
+        save it must http_cache.invalidate(url), or the next fetch gets a
+        304 and the page's data is never written.
+        """
+        if not self.clients:
             await self.setup_client()
         
+        # Healthiest, fastest proxies get most requests (None without a pool)
+        proxy = proxy_manager.select()
+        proxy_server = proxy["server"] if proxy else None
+        
+        # Fail fast while the host (through this proxy) is blocking or down
+        breaker = get_breaker(url, proxy_server, source=getattr(self, "source_name", self.name))
+        breaker.before_request()
+        
+        metrics = get_scrape_metrics(source_of(self))
+        rate_limiter = get_host_limiter(
+            url,
+            initial_rate=settings.REQUESTS_PER_MINUTE / 60,
+            max_rate=settings.REQUESTS_PER_MINUTE_MAX / 60,
+        )
+        with metrics.timer("rate_limit"):
+            await rate_limiter.acquire()
+        
         try:
             logger.debug(f"Fetching: {url}")
-            response = await self.client.get(url)
+            started = time.monotonic()
+            response = await self.clients.get(proxy).get(url, headers=http_cache.conditional_headers(url))
+            latency = time.monotonic() - started
+            metrics.observe_fetch(latency, response.status_code, response.num_bytes_downloaded)
+            if proxy_server:
+                proxy_manager.report_response(proxy_server, response.status_code, latency)
+            rate_limiter.on_response(response.status_code, response.headers.get("Retry-After"))
+            breaker.on_response(response.status_code)
+            
+            if response.status_code == 304:
+                logger.debug(f"Not modified: {url}")
+                http_cache.touch(url)
+                return None
+            
             response.raise_for_status()
+            http_cache.store(url, response)
             return response.text
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error {e.response.status_code} for {url}")
             raise
         except httpx.RequestError as e:
+            metrics.observe_fetch(time.monotonic() - started)
+            if proxy_server:
+                proxy_manager.report(proxy_server, ok=False)
+            breaker.on_error(e)
             logger.error(f"Request error for {url}: {e}")
             raise
 
-    def parse_html(self, html: str) -> BeautifulSoup:
+    def parse_html(self, html: str) -> Any:
         """
-        Parse HTML with BeautifulSoup
+        Parse HTML with the configured parser backend
+
+        Returns:
+            BeautifulSoup document or SelectolaxNode (see parse_document)
         """
-        return BeautifulSoup(html, "lxml")
+        return parse_document(html)
 
     @abstractmethod
     async def scrape(self) -> List[Dict[str, Any]]:
@@ -9,30 +9,102 @@ Features:
 - Graceful error handling
 - Both singles and sealed products
 - EU proxy support
-- Append-only database writes
+- Append-only database writes, streamed while scraping
 
 DO NOT use this scraper aggressively. Be respectful of CardMarket's servers.
 """
 
+import asyncio
 import logging
 import random
 import re
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 from decimal import Decimal
+from urllib.parse import urljoin, urlsplit
 
 import httpx
-from bs4 import BeautifulSoup
 
 from app.config_cardmarket import cardmarket_config
-from app.models.raw_price import RawPrice
 from app.database import AsyncSessionLocal
+from app.models.scrape_log import ScrapeLog
+from app.utils.bulk_writer import RawPriceBulkWriter
+from app.utils.ingest_pipeline import IngestWriteError, RawPriceIngestPipeline
 from app.utils.user_agent_rotator import UserAgentRotator
 from app.utils.delay_manager import DelayManager
 from app.utils.retry import retry_with_backoff
+from app.utils.http_cache import http_cache
+from app.utils.rate_limiter import get_host_limiter
+from app.utils.checkpoint_store import ScrapeCheckpointStore
+from app.utils.circuit_breaker import circuit_breaker_states, get_breaker
+from app.utils.proxy_manager import ProxyClientPool, ProxyManager, proxy_manager
+from app.utils.crawl_frontier import CrawlFrontier, FrontierItem
+from app.utils.html_parser import parse_document
+from app.utils.extraction_plan import ExtractionPlan
+from app.utils.parse_pool import run_parse
+from app.utils.scrape_metrics import format_breakdown, get_scrape_metrics, run_breakdown
 
 logger = logging.getLogger(__name__)
 
+# Row and field selectors, fallbacks in priority order. Adjust these to
+# CardMarket's actual HTML structure (table rows, divs, grid layout)
+SINGLES_PLAN = ExtractionPlan(
+    rows=(
+        "div.table-body div.row",
+        "table.table tbody tr",
+        "div[class*='product-row']",
+        "div.col-md-3.col-sm-6",  # Grid layout
+    ),
+    fields={
+        "name": ("div.card-name a", "a.product-name", "h4 a", "a[href*='/Single/']"),
+        "number": ("span.card-number, .icon-info",),
+        "price": ("span.price-label", "dd.price", "span[class*='price']"),
+        "condition": ("span.icon-condition, .condition",),
+        "language": ("span.icon-language, img.language-flag",),
+        "availability": ("span.amount-available, .article-count",),
+        "seller": ("span.seller-name, a.seller-link",),
+    },
+)
+
+SEALED_PLAN = ExtractionPlan(
+    rows=(
+        "div.table-body div.row",
+        "table.table tbody tr",
+        "div[class*='product-row']",
+    ),
+    fields={
+        "name": ("div.product-name a", "a.product-name", "h4 a"),
+        "price": ("span.price-label, dd.price",),
+        "language": ("span.icon-language, img.language-flag",),
+        "availability": ("span.amount-available",),
+    },
+)
+
+# CardMarket URLs like: /Products/Singles/Set-Name/Card-Name-123456
+PRODUCT_ID_RE = re.compile(r'/(\d+)$')
+# Card numbers like "#123/456" or "123"
+CARD_NUMBER_RE = re.compile(r'#?(\d+)')
+FIRST_INT_RE = re.compile(r'(\d+)')
+PRICE_SYMBOLS_RE = re.compile(r'[€$£\s]')
+PRICE_NUMBER_RE = re.compile(r'(\d+\.?\d*)')
+
+# Sets recognised in sealed product names, in priority order
+SET_NAME_PATTERNS = (
+    r'Base Set',
+    r'Scarlet[^V]*Violet[^1]*151',
+    r'Paldean Fates',
+    r'Obsidian Flames',
+    r'Paradox Rift',
+    r'Temporal Forces',
+)
+# One pass for all of them: alternatives are tried in order from the start
+# of the name, so the first pattern found anywhere wins (not the leftmost match)
+SET_NAME_RE = re.compile(
+    "^(?:" + "|".join(f".*?({pattern})" for pattern in SET_NAME_PATTERNS) + ")",
+    re.IGNORECASE | re.DOTALL,
+)
+
 
 class CardMarketProductionScraper:
     """
@@ -48,14 +120,27 @@ class CardMarketProductionScraper:
     def __init__(self):
         self.source_name = "CardMarket"
         self.config = cardmarket_config
-        self.client: Optional[httpx.AsyncClient] = None
+        self.clients: Optional[ProxyClientPool] = None
+        
+        # CARDMARKET_PROXY_URL gets its own pool, otherwise the shared one is used
+        if self.config.USE_PROXY and self.config.PROXY_URL:
+            self.proxies = ProxyManager(servers=[self.config.PROXY_URL])
+        else:
+            self.proxies = proxy_manager
         
         # Initialize utilities
         self.ua_rotator = UserAgentRotator(self.config.USER_AGENTS)
         self.delay_manager = DelayManager(
             min_delay=self.config.MIN_DELAY_SECONDS,
-            max_delay=self.config.MAX_DELAY_SECONDS
+            max_delay=self.config.MAX_DELAY_SECONDS,
+            source=self.source_name,
         )
+        self.rate_limiter = get_host_limiter(
+            self.config.BASE_URL,
+            initial_rate=self.config.REQUESTS_PER_MINUTE / 60,
+            max_rate=self.config.REQUESTS_PER_MINUTE_MAX / 60,
+        )
+        self.checkpoint = ScrapeCheckpointStore(self.source_name)
         
         logger.info(f"Initialized {self.source_name} scraper")
         logger.info(f"Rate limit: {self.config.REQUESTS_PER_MINUTE} req/min")
@@ -63,15 +148,12 @@ class CardMarketProductionScraper:
     
     async def setup_client(self):
         """
-        Setup HTTP client with proper configuration
+        Setup HTTP clients with proper configuration (one per proxy)
         """
-        proxy_config = None
-        if self.config.USE_PROXY and self.config.PROXY_URL:
-            proxy_config = self.config.PROXY_URL
-            logger.info(f"Using proxy: {proxy_config}")
+        if self.proxies.enabled and self.proxies.proxies:
+            logger.info(f"Using proxy pool: {len(self.proxies.proxies)} proxies")
         
-        self.client = httpx.AsyncClient(
-            proxies=proxy_config,
+        self.clients = ProxyClientPool(
             timeout=self.config.TIMEOUT_SECONDS,
             follow_redirects=True,
             limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
@@ -79,32 +161,62 @@ class CardMarketProductionScraper:
     
     async def cleanup_client(self):
         """
-        Cleanup HTTP client
+        Cleanup HTTP clients
         """
-        if self.client:
-            await self.client.aclose()
-            self.client = None
+        if self.clients:
+            await self.clients.aclose()
+            self.clients = None
     
     @retry_with_backoff(max_retries=3, base_delay=2.0)
-    async def fetch_page(self, url: str) -> str:
+    async def fetch_page(self, url: str) -> Optional[str]:
         """
         Fetch a page with retry logic and proper headers
         
+        While the host's circuit is open this raises CircuitOpenError at
+        once instead of retrying.
+        
         Args:
             url: URL to fetch
             
         Returns:
-            HTML content as string
+            HTML content as string, or None if the page is unchanged since
+            the last fetch (304 Not Modified); callers that fail to parse or
+            write a page invalidate its cache entry
         """
-        if not self.client:
+        if not self.clients:
             await self.setup_client()
         
         headers = self.ua_rotator.get_headers(random=True)
+        headers.update(http_cache.conditional_headers(url))
+        
+        # Each attempt picks the healthiest proxy, so a retry can move off a bad one
+        proxy = self.proxies.select()
+        proxy_server = proxy["server"] if proxy else None
+        breaker = get_breaker(url, proxy_server, source=self.source_name)
+        breaker.before_request()
+        metrics = get_scrape_metrics(self.source_name)
         
         try:
             logger.debug(f"Fetching: {url}")
-            response = await self.client.get(url, headers=headers)
+            with metrics.timer("rate_limit"):
+                await self.rate_limiter.acquire()
+            started = time.monotonic()
+            response = await self.clients.get(proxy).get(url, headers=headers)
+            latency = time.monotonic() - started
+            metrics.observe_fetch(latency, response.status_code, response.num_bytes_downloaded)
+            if proxy_server:
+                self.proxies.report_response(proxy_server, response.status_code, latency)
+            self.rate_limiter.on_response(response.status_code, response.headers.get("Retry-After"))
+            breaker.on_response(response.status_code)
+            
+            if response.status_code == 304:
+                logger.debug(f"Not modified: {url}")
+                http_cache.touch(url)
+                await self.delay_manager.wait()
+                return None
+            
             response.raise_for_status()
+            http_cache.store(url, response)
             
             # Wait before next request (respectful scraping)
             await self.delay_manager.wait()
@@ -115,95 +227,328 @@ class CardMarketProductionScraper:
             logger.error(f"HTTP {e.response.status_code} for {url}")
             raise
         except httpx.RequestError as e:
+            metrics.observe_fetch(time.monotonic() - started)
+            if proxy_server:
+                self.proxies.report(proxy_server, ok=False)
+            breaker.on_error(e)
             logger.error(f"Request error for {url}: {e}")
             raise
     
-    async def scrape(self) -> List[Dict[str, Any]]:
+    async def scrape(self, resume: bool = False) -> int:
         """
         Main scraping method - orchestrates the entire scrape
         
+        Parsed products are streamed to the database while scraping
+        continues, so nothing is held in memory for the whole run.
+        Every finished set is checkpointed once its rows are written.
+        
+        Args:
+            resume: Skip sets completed by the last unfinished run
+        
         Returns:
-            List of scraped product data
+            Number of products saved
         """
         logger.info("=" * 70)
         logger.info(f"Starting {self.source_name} Production Scrape")
         logger.info("=" * 70)
         
-        all_data = []
+        started_at = datetime.utcnow()
+        metrics_before = get_scrape_metrics(self.source_name).snapshot()
+        
+        # Clients set up by the caller (orchestrator) stay open for its next run
+        owns_clients = self.clients is None
         
         try:
-            await self.setup_client()
+            if owns_clients:
+                await self.setup_client()
+            await self.checkpoint.start(resume=resume)
             
-            # Scrape singles if enabled
-            if self.config.SCRAPE_SINGLES:
-                singles_data = await self.scrape_singles()
-                all_data.extend(singles_data)
-                logger.info(f"Collected {len(singles_data)} singles")
-            
-            # Scrape sealed products if enabled
-            if self.config.SCRAPE_SEALED:
-                sealed_data = await self.scrape_sealed()
-                all_data.extend(sealed_data)
-                logger.info(f"Collected {len(sealed_data)} sealed products")
+            async with RawPriceIngestPipeline() as pipeline:
+                # Scrape singles if enabled
+                if self.config.SCRAPE_SINGLES:
+                    singles_count = await self.scrape_singles(pipeline)
+                    logger.info(f"Collected {singles_count} singles")
+                
+                # Scrape sealed products if enabled
+                if self.config.SCRAPE_SEALED:
+                    sealed_count = await self.scrape_sealed(pipeline)
+                    logger.info(f"Collected {sealed_count} sealed products")
             
-            # Save to database
-            if all_data:
-                await self.save_to_database(all_data)
+            await self.checkpoint.finish("completed")
             
+            timings = run_breakdown(metrics_before, get_scrape_metrics(self.source_name).snapshot())
             logger.info("=" * 70)
-            logger.info(f"Scrape completed: {len(all_data)} total items")
+            logger.info(f"Scrape completed: {pipeline.total_written} total items")
+            logger.info(f"Time: {format_breakdown(timings)}")
             logger.info("=" * 70)
+            await self._log_scrape("success", pipeline.total_written, started_at, timings)
             
         except Exception as e:
             logger.error(f"Scrape failed: {e}", exc_info=True)
+            timings = run_breakdown(metrics_before, get_scrape_metrics(self.source_name).snapshot())
+            await self._log_scrape("failed", 0, started_at, timings, error_message=str(e))
+            if self.checkpoint.run_id:
+                try:
+                    await self.checkpoint.finish("failed")
+                    logger.info("Progress saved; rerun with --resume to continue")
+                except Exception as checkpoint_error:
+                    logger.warning(f"Could not save checkpoint: {checkpoint_error}")
             raise
         finally:
-            await self.cleanup_client()
+            if owns_clients:
+                await self.cleanup_client()
         
-        return all_data
+        return pipeline.total_written
     
-    async def scrape_singles(self) -> List[Dict[str, Any]]:
+    async def _log_scrape(
+        self,
+        status: str,
+        items_scraped: int,
+        started_at: datetime,
+        timings: Dict[str, Any],
+        error_message: Optional[str] = None,
+    ):
+        """
+        Log the run with its per-stage timing breakdown to scrape_logs
+        """
+        completed_at = datetime.utcnow()
+        try:
+            async with AsyncSessionLocal() as session:
+                session.add(ScrapeLog(
+                    source=self.source_name,
+                    status=status,
+                    items_scraped=items_scraped,
+                    errors_count=0 if status == "success" else 1,
+                    started_at=started_at,
+                    completed_at=completed_at,
+                    duration_seconds=int((completed_at - started_at).total_seconds()),
+                    error_message=error_message,
+                    circuit_state=circuit_breaker_states(self.source_name),
+                    timings=timings,
+                ))
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Could not log scrape run: {e}")
+    
+    async def scrape_singles(self, pipeline: RawPriceIngestPipeline) -> int:
         """
         Scrape Pokemon singles (individual cards)
         
+        Args:
+            pipeline: Ingest pipeline that parsed cards are streamed into
+            
         Returns:
-            List of card data dictionaries
+            Number of cards found
         """
         logger.info("\n--- Scraping Pokemon Singles ---")
-        all_cards = []
         
-        # Use priority sets (limited to avoid overwhelming)
-        sets_to_scrape = self.config.PRIORITY_SETS[:self.config.MAX_SETS_PER_RUN]
+        # All priority sets; the crawl budget bounds the run
+        sets_to_scrape = self.config.PRIORITY_SETS
+        if self.config.MAX_SETS_PER_RUN:
+            sets_to_scrape = sets_to_scrape[:self.config.MAX_SETS_PER_RUN]
         
+        pending_sets = []
         for set_name in sets_to_scrape:
-            logger.info(f"Processing set: {set_name}")
+            if self.checkpoint.is_done(f"singles:{set_name}"):
+                logger.info(f"Skipping set: {set_name} (done before resume)")
+                continue
+            pending_sets.append(set_name)
+        
+        total_cards, _ = await self.crawl_singles(
+            pending_sets,
+            pipeline,
+            page_budget=self.config.MAX_PAGES_PER_RUN,
+            checkpoint=True,
+        )
+        return total_cards
+    
+    async def scrape_singles_set(self, set_name: str, pipeline: RawPriceIngestPipeline) -> int:
+        """
+        Scrape every page of one set's singles; rows are written before this returns
+        
+        Args:
+            set_name: CardMarket set slug
+            pipeline: Ingest pipeline that parsed cards are streamed into
+            
+        Returns:
+            Number of cards found (0 if the pages are unchanged)
             
+        Raises:
+            RuntimeError: If a page of the set could not be crawled
+        """
+        total_cards, incomplete = await self.crawl_singles(
+            [set_name],
+            pipeline,
+            page_budget=self.config.MAX_PAGES_PER_SET,
+        )
+        if incomplete:
+            raise RuntimeError(f"Crawl of {set_name} incomplete")
+        return total_cards
+    
+    def singles_url(self, set_name: str) -> str:
+        """
+        First singles page of a set
+        """
+        # Real CardMarket URL pattern: /en/Pokemon/Products/Singles/[Set-Name]
+        return f"{self.config.POKEMON_BASE}/Products/Singles/{set_name}"
+    
+    async def crawl_singles(
+        self,
+        set_names: List[str],
+        pipeline: RawPriceIngestPipeline,
+        page_budget: int,
+        checkpoint: bool = False,
+    ) -> Tuple[int, Set[str]]:
+        """
+        Crawl all pages of the given sets through a crawl frontier
+        
+        Each set's first page seeds the frontier; pagination links found on
+        every page are queued (de-duplicated, capped by MAX_PAGES_PER_SET and
+        the page budget) and fetched by CONCURRENT_FETCHES workers, all
+        sharing the host rate limiter.
+        
+        Args:
+            set_names: CardMarket set slugs
+            pipeline: Ingest pipeline that parsed cards are streamed into
+            page_budget: Max pages fetched in this crawl
+            checkpoint: Mark fully crawled sets done in the run checkpoint
+            
+        Returns:
+            (cards found, sets that could not be fully crawled)
+        """
+        # The seed URL is page 1 without ?site=1; links back to it carry it
+        frontier = CrawlFrontier(
+            budget=page_budget,
+            max_pages_per_key=self.config.MAX_PAGES_PER_SET,
+            default_params={"site": "1"},
+        )
+        for set_name in set_names:
+            frontier.add(self.singles_url(set_name), set_name)
+        
+        cards_per_set: Dict[str, int] = {}
+        crawled_urls: List[str] = []
+        # Only batches holding this crawl's rows count against its sets
+        since = pipeline.mark()
+        workers = [
+            asyncio.create_task(
+                self._crawl_worker(frontier, pipeline, since, cards_per_set, crawled_urls, checkpoint)
+            )
+            for _ in range(max(1, self.config.CONCURRENT_FETCHES))
+        ]
+        
+        try:
+            await frontier.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        total_cards = sum(cards_per_set.values())
+        logger.info(f"Crawled {frontier.pages()} pages across {len(set_names)} sets: {total_cards} cards")
+        
+        try:
+            await pipeline.flush(since)
+        except IngestWriteError as e:
+            # Dropped rows may belong to any of the sets; refetch their pages
+            # in full next time instead of getting a 304
+            logger.warning(f"  {e}")
+            for url in crawled_urls:
+                http_cache.invalidate(url)
+            return total_cards, set(set_names)
+        
+        return total_cards, frontier.incomplete
+    
+    async def _crawl_worker(
+        self,
+        frontier: CrawlFrontier,
+        pipeline: RawPriceIngestPipeline,
+        since: int,
+        cards_per_set: Dict[str, int],
+        crawled_urls: List[str],
+        checkpoint: bool,
+    ):
+        """
+        Fetch pages off the frontier until cancelled
+        """
+        while True:
+            item = await frontier.get()
             try:
-                # Build URL for singles
-                # Real CardMarket URL pattern: /en/Pokemon/Products/Singles/[Set-Name]
-                url = f"{self.config.POKEMON_BASE}/Products/Singles/{set_name}"
-                
-                # Fetch first page
-                html = await self.fetch_page(url)
-                
-                # Parse cards from page
-                cards = await self.parse_singles_page(html, set_name)
-                all_cards.extend(cards)
-                
-                logger.info(f"  ✓ Found {len(cards)} cards in {set_name}")
-                
-                # Note: In production, you'd paginate through multiple pages
-                # For safety, we're limiting to first page per set
-                
+                cards = await self._crawl_singles_page(item, frontier, pipeline)
+                cards_per_set[item.key] = cards_per_set.get(item.key, 0) + cards
+                crawled_urls.append(item.url)
             except Exception as e:
-                logger.error(f"  ✗ Error scraping set {set_name}: {e}")
-                continue
+                logger.error(f"  ✗ Error scraping {item.key} page {item.page}: {e}")
+                frontier.mark_incomplete(item.key)
+                # Its cards were not queued: do not let a 304 skip them next time
+                http_cache.invalidate(item.url)
+            finally:
+                set_finished = frontier.done(item)
+            
+            if set_finished:
+                try:
+                    await self._singles_set_crawled(item.key, frontier, pipeline, since, cards_per_set, checkpoint)
+                except Exception as e:
+                    logger.warning(f"Could not checkpoint set {item.key}: {e}")
+    
+    async def _crawl_singles_page(
+        self,
+        item: FrontierItem,
+        frontier: CrawlFrontier,
+        pipeline: RawPriceIngestPipeline,
+    ) -> int:
+        """
+        Fetch one singles page, queue its pagination links and its cards
+        
+        Returns:
+            Number of cards found (0 if the page is unchanged)
+        """
+        html = await self.fetch_page(item.url)
+        
+        if html is None:
+            # Unchanged page: nothing to save, but keep following its pagination
+            cached = http_cache.get(item.url)
+            if cached:
+                for link in await run_parse(self, "parse_page_links_html", cached["body"], item.url):
+                    frontier.add(link, item.key)
+            logger.debug(f"  = {item.key} page {item.page} unchanged since last scrape")
+            return 0
+        
+        cards, links = await self.parse_singles_listing(html, item.key, item.url)
+        for link in links:
+            frontier.add(link, item.key)
         
-        return all_cards
+        await pipeline.put_many(self.to_raw_price_row(card) for card in cards)
+        logger.debug(f"  {item.key} page {item.page}: {len(cards)} cards, {len(links)} page links")
+        return len(cards)
+    
+    async def _singles_set_crawled(
+        self,
+        set_name: str,
+        frontier: CrawlFrontier,
+        pipeline: RawPriceIngestPipeline,
+        since: int,
+        cards_per_set: Dict[str, int],
+        checkpoint: bool,
+    ):
+        """
+        Log a finished set and checkpoint it once its rows are written
+        """
+        count = cards_per_set.get(set_name, 0)
+        
+        if not frontier.is_complete(set_name):
+            logger.warning(f"  ~ {set_name}: {count} cards, crawl incomplete")
+            return
+        
+        logger.info(f"  ✓ Found {count} cards in {set_name} ({frontier.pages(set_name)} pages)")
+        
+        if checkpoint:
+            # Set counts as done once its rows are in the database
+            await pipeline.flush(since)
+            await self.checkpoint.mark_done(f"singles:{set_name}", items=count)
     
     async def parse_singles_page(self, html: str, set_name: str) -> List[Dict[str, Any]]:
         """
-        Parse singles (cards) from HTML page
+        Parse singles (cards) from HTML page, in the parse process pool if enabled
         
         Args:
             html: Page HTML
@@ -212,22 +557,76 @@ class CardMarketProductionScraper:
         Returns:
             List of card data
         """
-        soup = BeautifulSoup(html, "lxml")
+        return await run_parse(self, "parse_singles_html", html, set_name)
+    
+    async def parse_singles_listing(
+        self, html: str, set_name: str, page_url: str
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Parse cards and pagination links from a singles page, in the parse
+        process pool if enabled
+        
+        Returns:
+            (card data, absolute URLs of the set's other pages)
+        """
+        return await run_parse(self, "parse_singles_listing_html", html, set_name, page_url)
+    
+    def parse_singles_listing_html(
+        self, html: str, set_name: str, page_url: str
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Parse cards and pagination links from one document (synchronous)
+        """
+        soup = parse_document(html)
+        return self._extract_cards(soup, set_name), self._extract_page_links(soup, page_url)
+    
+    def parse_page_links_html(self, html: str, page_url: str) -> List[str]:
+        """
+        Parse only the pagination links of a page (synchronous)
+        """
+        return self._extract_page_links(parse_document(html), page_url)
+    
+    def _extract_page_links(self, soup: Any, page_url: str) -> List[str]:
+        """
+        Absolute URLs of pagination links that stay on the same listing
+        
+        CardMarket paginates with ?site=N on the set's own path.
+        """
+        base_path = urlsplit(page_url).path
+        links = []
+        
+        for anchor in soup.select("a[href*='site=']"):
+            href = anchor.get("href")
+            if not href:
+                continue
+            url = urljoin(page_url, href)
+            if urlsplit(url).path == base_path and url not in links:
+                links.append(url)
+        
+        return links
+    
+    def parse_singles_html(self, html: str, set_name: str) -> List[Dict[str, Any]]:
+        """
+        Parse singles (cards) from HTML page (synchronous, CPU-bound)
+        
+        Args:
+            html: Page HTML
+            set_name: Name of the set
+            
+        Returns:
+            List of card data
+        """
+        return self._extract_cards(parse_document(html), set_name)
+    
+    def _extract_cards(self, soup: Any, set_name: str) -> List[Dict[str, Any]]:
+        """
+        Extract card data from a parsed singles page
+        """
         cards = []
         
         try:
-            # CardMarket typically uses:
-            # - Table rows for product listings
-            # - Divs with specific classes
-            # Adjust selectors based on actual HTML structure
-            
-            # Try multiple selector patterns
-            product_rows = (
-                soup.select("div.table-body div.row") or
-                soup.select("table.table tbody tr") or
-                soup.select("div[class*='product-row']") or
-                soup.select("div.col-md-3.col-sm-6")  # Grid layout
-            )
+            # Selector variants are resolved once for the whole page
+            product_rows = SINGLES_PLAN.extract(soup)
             
             if not product_rows:
                 logger.warning(f"No product rows found for {set_name}")
@@ -235,9 +634,9 @@ class CardMarketProductionScraper:
             
             logger.debug(f"Found {len(product_rows)} potential products")
             
-            for row in product_rows:
+            for row, nodes in product_rows:
                 try:
-                    card_data = self.extract_card_data(row, set_name)
+                    card_data = self.extract_card_data(row, set_name, nodes)
                     if card_data and self.validate_data(card_data):
                         cards.append(card_data)
                 except Exception as e:
@@ -249,25 +648,26 @@ class CardMarketProductionScraper:
         
         return cards
     
-    def extract_card_data(self, element, set_name: str) -> Optional[Dict[str, Any]]:
+    def extract_card_data(
+        self, element, set_name: str, nodes: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Extract card data from HTML element
         
         Args:
             element: BeautifulSoup element
             set_name: Pokemon set name
+            nodes: Field nodes from SINGLES_PLAN.extract (queried here if None)
             
         Returns:
             Dictionary with card data or None
         """
         try:
+            if nodes is None:
+                nodes = SINGLES_PLAN.extract_row(element)
+            
             # Extract card name (required)
-            name_elem = (
-                element.select_one("div.card-name a") or
-                element.select_one("a.product-name") or
-                element.select_one("h4 a") or
-                element.select_one("a[href*='/Single/']")
-            )
+            name_elem = nodes["name"]
             
             if not name_elem:
                 return None
@@ -280,27 +680,20 @@ class CardMarketProductionScraper:
             product_id = None
             href = name_elem.get('href', '')
             if href:
-                # CardMarket URLs like: /Products/Singles/Set-Name/Card-Name-123456
-                match = re.search(r'/(\d+)$', href)
+                match = PRODUCT_ID_RE.search(href)
                 if match:
                     product_id = match.group(1)
             
             # Extract card number
-            number_elem = element.select_one("span.card-number, .icon-info")
+            number_elem = nodes["number"]
             card_number = None
             if number_elem:
-                number_text = number_elem.get_text(strip=True)
-                # Extract number from text like "#123/456" or "123"
-                match = re.search(r'#?(\d+)', number_text)
+                match = CARD_NUMBER_RE.search(number_elem.get_text(strip=True))
                 if match:
                     card_number = match.group(1)
             
             # Extract price (required)
-            price_elem = (
-                element.select_one("span.price-label") or
-                element.select_one("dd.price") or
-                element.select_one("span[class*='price']")
-            )
+            price_elem = nodes["price"]
             
             price = None
             if price_elem:
@@ -312,14 +705,14 @@ class CardMarketProductionScraper:
                 return None
             
             # Extract condition
-            condition_elem = element.select_one("span.icon-condition, .condition")
+            condition_elem = nodes["condition"]
             condition = "Near Mint"  # Default
             if condition_elem:
                 condition_text = condition_elem.get_text(strip=True)
                 condition = self.normalize_condition(condition_text)
             
             # Extract language
-            language_elem = element.select_one("span.icon-language, img.language-flag")
+            language_elem = nodes["language"]
             language = "EN"  # Default
             if language_elem:
                 if language_elem.name == 'img':
@@ -329,16 +722,15 @@ class CardMarketProductionScraper:
                 language = self.parse_language(lang_text)
             
             # Extract availability/listing count
-            availability_elem = element.select_one("span.amount-available, .article-count")
+            availability_elem = nodes["availability"]
             listing_count = None
             if availability_elem:
-                avail_text = availability_elem.get_text(strip=True)
-                match = re.search(r'(\d+)', avail_text)
+                match = FIRST_INT_RE.search(availability_elem.get_text(strip=True))
                 if match:
                     listing_count = int(match.group(1))
             
             # Extract seller info (for cheapest listing)
-            seller_elem = element.select_one("span.seller-name, a.seller-link")
+            seller_elem = nodes["seller"]
             seller_name = None
             if seller_elem:
                 seller_name = seller_elem.get_text(strip=True)
@@ -369,35 +761,80 @@ class CardMarketProductionScraper:
             logger.debug(f"Error extracting card data: {e}")
             return None
     
-    async def scrape_sealed(self) -> List[Dict[str, Any]]:
+    async def scrape_sealed(self, pipeline: RawPriceIngestPipeline) -> int:
         """
         Scrape Pokemon sealed products (booster boxes, ETBs, etc.)
         
+        Args:
+            pipeline: Ingest pipeline that parsed products are streamed into
+            
         Returns:
-            List of sealed product data
+            Number of sealed products found
         """
         logger.info("\n--- Scraping Pokemon Sealed Products ---")
-        all_products = []
+        total_products = 0
+        
+        if self.checkpoint.is_done("sealed"):
+            logger.info("  Skipping sealed products (done before resume)")
+            return total_products
         
         try:
-            # CardMarket sealed products URL
-            # Real URL: /en/Pokemon/Products/Sealed-Products
-            url = f"{self.config.POKEMON_BASE}/Products/Sealed-Products"
-            
-            html = await self.fetch_page(url)
-            products = await self.parse_sealed_page(html)
-            all_products.extend(products)
-            
-            logger.info(f"  ✓ Found {len(products)} sealed products")
+            total_products = await self.scrape_sealed_products(pipeline)
+            await self.checkpoint.mark_done("sealed", items=total_products)
             
         except Exception as e:
             logger.error(f"  ✗ Error scraping sealed products: {e}")
         
-        return all_products
+        return total_products
+    
+    async def scrape_sealed_products(self, pipeline: RawPriceIngestPipeline) -> int:
+        """
+        Scrape the sealed products page; its rows are written before this returns
+        
+        Args:
+            pipeline: Ingest pipeline that parsed products are streamed into
+            
+        Returns:
+            Number of sealed products found (0 if the page is unchanged)
+        """
+        # CardMarket sealed products URL
+        # Real URL: /en/Pokemon/Products/Sealed-Products
+        url = f"{self.config.POKEMON_BASE}/Products/Sealed-Products"
+        
+        html = await self.fetch_page(url)
+        if html is None:
+            logger.info("  = Sealed products unchanged since last scrape")
+            return 0
+        
+        try:
+            products = await self.parse_sealed_page(html)
+            since = pipeline.mark()
+            await pipeline.put_many(self.to_raw_price_row(product) for product in products)
+            await pipeline.flush(since)
+        except Exception:
+            # Refetch in full next time rather than get a 304 for unsaved products
+            http_cache.invalidate(url)
+            raise
+        
+        logger.info(f"  ✓ Found {len(products)} sealed products")
+        
+        return len(products)
     
     async def parse_sealed_page(self, html: str) -> List[Dict[str, Any]]:
         """
-        Parse sealed products from HTML
+        Parse sealed products from HTML, in the parse process pool if enabled
+        
+        Args:
+            html: Page HTML
+            
+        Returns:
+            List of product data
+        """
+        return await run_parse(self, "parse_sealed_html", html)
+    
+    def parse_sealed_html(self, html: str) -> List[Dict[str, Any]]:
+        """
+        Parse sealed products from HTML (synchronous, CPU-bound)
         
         Args:
             html: Page HTML
@@ -405,24 +842,20 @@ class CardMarketProductionScraper:
         Returns:
             List of product data
         """
-        soup = BeautifulSoup(html, "lxml")
+        soup = parse_document(html)
         products = []
         
         try:
             # Similar structure to singles
-            product_rows = (
-                soup.select("div.table-body div.row") or
-                soup.select("table.table tbody tr") or
-                soup.select("div[class*='product-row']")
-            )
+            product_rows = SEALED_PLAN.extract(soup)
             
             if not product_rows:
                 logger.warning("No sealed products found")
                 return products
             
-            for row in product_rows:
+            for row, nodes in product_rows:
                 try:
-                    product_data = self.extract_sealed_data(row)
+                    product_data = self.extract_sealed_data(row, nodes)
                     if product_data and self.validate_data(product_data):
                         products.append(product_data)
                 except Exception as e:
@@ -434,23 +867,23 @@ class CardMarketProductionScraper:
         
         return products
     
-    def extract_sealed_data(self, element) -> Optional[Dict[str, Any]]:
+    def extract_sealed_data(self, element, nodes: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """
         Extract sealed product data from HTML element
         
         Args:
             element: BeautifulSoup element
+            nodes: Field nodes from SEALED_PLAN.extract (queried here if None)
             
         Returns:
             Dictionary with product data or None
         """
         try:
+            if nodes is None:
+                nodes = SEALED_PLAN.extract_row(element)
+            
             # Extract product name
-            name_elem = (
-                element.select_one("div.product-name a") or
-                element.select_one("a.product-name") or
-                element.select_one("h4 a")
-            )
+            name_elem = nodes["name"]
             
             if not name_elem:
                 return None
@@ -463,7 +896,7 @@ class CardMarketProductionScraper:
             product_id = None
             href = name_elem.get('href', '')
             if href:
-                match = re.search(r'/(\d+)$', href)
+                match = PRODUCT_ID_RE.search(href)
                 if match:
                     product_id = match.group(1)
             
@@ -471,7 +904,7 @@ class CardMarketProductionScraper:
             set_name = self.extract_set_from_name(product_name)
             
             # Extract price
-            price_elem = element.select_one("span.price-label, dd.price")
+            price_elem = nodes["price"]
             price = None
             if price_elem:
                 price = self.parse_price(price_elem.get_text(strip=True))
@@ -480,7 +913,7 @@ class CardMarketProductionScraper:
                 return None
             
             # Extract language
-            language_elem = element.select_one("span.icon-language, img.language-flag")
+            language_elem = nodes["language"]
             language = "EN"
             if language_elem:
                 if language_elem.name == 'img':
@@ -489,10 +922,10 @@ class CardMarketProductionScraper:
                     language = self.parse_language(language_elem.get_text(strip=True))
             
             # Extract availability
-            availability_elem = element.select_one("span.amount-available")
+            availability_elem = nodes["availability"]
             listing_count = None
             if availability_elem:
-                match = re.search(r'(\d+)', availability_elem.get_text(strip=True))
+                match = FIRST_INT_RE.search(availability_elem.get_text(strip=True))
                 if match:
                     listing_count = int(match.group(1))
             
@@ -534,11 +967,11 @@ class CardMarketProductionScraper:
         """
         try:
             # Remove currency symbols and whitespace
-            cleaned = re.sub(r'[€$£\s]', '', price_text)
+            cleaned = PRICE_SYMBOLS_RE.sub('', price_text)
             # Replace comma with dot (European format)
             cleaned = cleaned.replace(',', '.')
             # Extract first number
-            match = re.search(r'(\d+\.?\d*)', cleaned)
+            match = PRICE_NUMBER_RE.search(cleaned)
             if match:
                 price = float(match.group(1))
                 # Validate price range
@@ -627,20 +1060,9 @@ class CardMarketProductionScraper:
         Returns:
             Set name
         """
-        # Common patterns in sealed product names
-        set_patterns = [
-            r'Base Set',
-            r'Scarlet[^V]*Violet[^1]*151',
-            r'Paldean Fates',
-            r'Obsidian Flames',
-            r'Paradox Rift',
-            r'Temporal Forces',
-        ]
-        
-        for pattern in set_patterns:
-            if re.search(pattern, product_name, re.IGNORECASE):
-                match = re.search(pattern, product_name, re.IGNORECASE)
-                return match.group(0)
+        match = SET_NAME_RE.match(product_name)
+        if match:
+            return match.group(match.lastindex)
         
         return "Unknown Set"
     
@@ -686,49 +1108,56 @@ class CardMarketProductionScraper:
         
         logger.info(f"Saving {len(data)} items to database...")
         
-        async with AsyncSessionLocal() as session:
-            try:
-                # Map to RawPrice model
-                records = []
-                for item in data:
-                    record = RawPrice(
-                        card_name=item['product_name'],
-                        card_set=item['set_name'],
-                        card_number=item.get('card_number'),
-                        condition=item.get('condition', 'Unknown'),
-                        language=item.get('language', 'EN'),
-                        price=Decimal(str(item['price'])),
-                        currency=item.get('currency', 'EUR'),
-                        source=self.source_name,
-                        source_url=item.get('source_url'),
-                        seller_name=item.get('seller_name'),
-                        seller_rating=None,
-                        stock_quantity=item.get('availability'),
-                        scraped_at=item['scraped_at'],
-                    )
-                    records.append(record)
-                
-                # Bulk insert (append-only, no updates)
-                session.add_all(records)
-                await session.commit()
-                
-                logger.info(f"✅ Successfully saved {len(records)} records")
-                
-            except Exception as e:
-                await session.rollback()
-                logger.error(f"❌ Database error: {e}", exc_info=True)
-                raise
+        try:
+            # Bulk COPY (append-only, no updates)
+            async with RawPriceBulkWriter() as writer:
+                await writer.add_many(self.to_raw_price_row(item) for item in data)
+            
+            logger.info(f"✅ Successfully saved {writer.total_written} records")
+            
+        except Exception as e:
+            logger.error(f"❌ Database error: {e}", exc_info=True)
+            raise
+    
+    def to_raw_price_row(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Map a scraped product dict to a raw_prices row
+        
+        Args:
+            item: Product data dictionary
+            
+        Returns:
+            Row dict keyed by raw_prices column names
+        """
+        return {
+            "card_name": item['product_name'],
+            "card_set": item['set_name'],
+            "card_number": item.get('card_number'),
+            "condition": item.get('condition', 'Unknown'),
+            "language": item.get('language', 'EN'),
+            "price": Decimal(str(item['price'])),
+            "currency": item.get('currency', 'EUR'),
+            "source": self.source_name,
+            "source_url": item.get('source_url'),
+            "seller_name": item.get('seller_name'),
+            "seller_rating": None,
+            "stock_quantity": item.get('availability'),
+            "scraped_at": item['scraped_at'],
+        }
 
 
 # Main execution function for cron/script
-async def run_cardmarket_scraper():
+async def run_cardmarket_scraper(resume: bool = False):
     """
     Entry point for running the CardMarket scraper
     Can be called from cron or command line
+    
+    Args:
+        resume: Continue the last unfinished run from its checkpoint
     """
     scraper = CardMarketProductionScraper()
     try:
-        await scraper.scrape()
+        await scraper.scrape(resume=resume)
         return 0  # Success
     except Exception as e:
         logger.error(f"Scraper failed: {e}")
@@ -8,9 +8,10 @@ from typing import List, Dict, Any
 from datetime import datetime
 
 from app.scrapers.base import BaseScraper
-from app.models.raw_price import RawPrice
-from app.database import AsyncSessionLocal
+from app.utils.bulk_writer import RawPriceBulkWriter
+from app.utils.http_cache import http_cache
 from app.utils.retry import retry_with_backoff
+from app.utils.scrape_metrics import get_scrape_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,7 @@ class CardTraderScraper(BaseScraper):
         """
         logger.info(f"Starting {self.source_name} scrape")
         all_data = []
+        fetched_urls = []
         
         try:
             await self.setup_client()
@@ -51,18 +53,31 @@ class CardTraderScraper(BaseScraper):
                 
                 try:
                     html = await self.get_html(url)
-                    cards_data = await self.parse(html, expansion_name)
+                    if html is None:
+                        logger.info(f"Unchanged since last scrape: {expansion_name}")
+                        continue
+                    
+                    with get_scrape_metrics(self.source_name).timer("parse"):
+                        cards_data = await self.parse(html, expansion_name)
                     all_data.extend(cards_data)
+                    fetched_urls.append(url)
                     
                     logger.info(f"Found {len(cards_data)} cards in {expansion_name}")
                     
                 except Exception as e:
                     logger.error(f"Error scraping expansion {expansion_name}: {e}")
+                    # Refetch in full next time rather than get a 304 for unsaved data
+                    http_cache.invalidate(url)
                     continue
             
             # Save to database
             if all_data:
-                await self.save(all_data)
+                try:
+                    await self.save(all_data)
+                except Exception:
+                    for url in fetched_urls:
+                        http_cache.invalidate(url)
+                    raise
             
             logger.info(f"Completed {self.source_name} scrape: {len(all_data)} items")
             
@@ -238,13 +253,10 @@ class CardTraderScraper(BaseScraper):
             logger.info("No data to save")
             return
         
-        async with AsyncSessionLocal() as session:
-            try:
-                raw_prices = [RawPrice(**item) for item in data]
-                session.add_all(raw_prices)
-                await session.commit()
-                logger.info(f"✅ Saved {len(raw_prices)} prices to database")
-            except Exception as e:
-                await session.rollback()
-                logger.error(f"❌ Error saving to database: {e}")
-                raise
+        try:
+            async with RawPriceBulkWriter() as writer:
+                await writer.add_many(data)
+            logger.info(f"✅ Saved {writer.total_written} prices to database")
+        except Exception as e:
+            logger.error(f"❌ Error saving to database: {e}")
+            raise
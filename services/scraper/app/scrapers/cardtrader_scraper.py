@@ -16,11 +16,11 @@ import httpx
 from bs4 import BeautifulSoup
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.raw_price import RawPrice
 from app.models.scrape_log import ScrapeLog
 from app.utils.delay_manager import DelayManager
 from app.utils.user_agent_rotator import UserAgentRotator
 from app.utils.retry import retry
+from app.utils.ingest_pipeline import RawPriceIngestPipeline
 from app.config_cardtrader import config
 
 
@@ -46,6 +46,7 @@ class CardTraderScraper:
             max_delay=config.MAX_DELAY_SECONDS
         )
         self.user_agent_rotator = UserAgentRotator(config.USER_AGENTS)
+        self.pipeline = RawPriceIngestPipeline()
         self.http_client = httpx.AsyncClient(
             timeout=30.0,
             follow_redirects=True
@@ -82,6 +83,8 @@ class CardTraderScraper:
         
         logger.info(f"📊 Total: {total_count} listings scraped")
         
+        await self.pipeline.close()
+        
         # Log scrape run
         await self._log_scrape(
             source="cardtrader",
@@ -301,25 +304,21 @@ class CardTraderScraper:
     async def _save_web_product(self, product: Dict[str, Any]) -> bool:
         """Save web-scraped product to database"""
         try:
-            raw_price = RawPrice(
-                card_name=product["product_name"],
-                card_set=product["set_name"],
-                card_number="",  # Not always available
-                condition=product["condition"],
-                language=product["language"],
-                price=product["price"],
-                currency="EUR",  # CardTrader uses EUR
-                source="CardTrader",
-                source_url=product["url"],
-                seller_name=product["seller"],
-                seller_rating=None,
-                stock_quantity=product["quantity"],
-                country="EU",
-                scraped_at=datetime.utcnow(),
-            )
-            
-            self.session.add(raw_price)
-            await self.session.flush()
+            await self.pipeline.put({
+                "card_name": product["product_name"],
+                "card_set": product["set_name"],
+                "card_number": "",  # Not always available
+                "condition": product["condition"],
+                "language": product["language"],
+                "price": product["price"],
+                "currency": "EUR",  # CardTrader uses EUR
+                "source": "CardTrader",
+                "source_url": product["url"],
+                "seller_name": product["seller"],
+                "seller_rating": None,
+                "stock_quantity": product["quantity"],
+                "scraped_at": datetime.utcnow(),
+            })
             
             return True
             
@@ -331,25 +330,22 @@ class CardTraderScraper:
         """Save API product to database"""
         try:
             # API provides more structured data
-            raw_price = RawPrice(
-                card_name=product.get("name", ""),
-                card_set=product.get("expansion", {}).get("name", ""),
-                card_number=product.get("number", ""),
-                condition=self.condition_map.get(product.get("condition", "Near Mint"), "NM"),
-                language=product.get("language", {}).get("code", "EN"),
-                price=Decimal(str(product.get("price", 0))),
-                currency="EUR",
-                source="CardTrader-API",
-                source_url=f"{config.BASE_URL}/products/{product.get('id', '')}",
-                seller_name=product.get("seller", {}).get("username", ""),
-                seller_rating=product.get("seller", {}).get("reputation", 0),
-                stock_quantity=product.get("quantity", 1),
-                country=product.get("seller", {}).get("country", "EU"),
-                scraped_at=datetime.utcnow(),
-            )
-            
-            self.session.add(raw_price)
-            await self.session.flush()
+            await self.pipeline.put({
+                "card_name": product.get("name", ""),
+                "card_set": product.get("expansion", {}).get("name", ""),
+                "card_number": product.get("number", ""),
+                "condition": self.condition_map.get(product.get("condition", "Near Mint"), "NM"),
+                "language": product.get("language", {}).get("code", "EN"),
+                "price": Decimal(str(product.get("price", 0))),
+                "currency": "EUR",
+                "source": "CardTrader-API",
+                "source_url": f"{config.BASE_URL}/products/{product.get('id', '')}",
+                "seller_name": product.get("seller", {}).get("username", ""),
+                "seller_rating": product.get("seller", {}).get("reputation", 0),
+                "stock_quantity": product.get("quantity", 1),
+                "listing_key": product.get("id"),
+                "scraped_at": datetime.utcnow(),
+            })
             
             return True
             
@@ -373,8 +369,11 @@ class CardTraderScraper:
             logger.error(f"Error logging scrape: {e}")
     
     async def close(self):
-        """Close HTTP client"""
-        await self.http_client.aclose()
+        """Write queued rows and close HTTP client"""
+        try:
+            await self.pipeline.close()
+        finally:
+            await self.http_client.aclose()
 
 
 async def run_cardtrader_scraper(session: AsyncSession) -> int:
@@ -10,20 +10,38 @@ API Structure:
 
 import logging
 import asyncio
+import hashlib
+import json
+import time
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Any, AsyncIterator, Dict, List, Optional
 from decimal import Decimal
 
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.raw_price import RawPrice
 from app.models.scrape_log import ScrapeLog
 from app.config_cardtrader import config
 from app.database import AsyncSessionLocal
+from app.utils.rate_limiter import THROTTLE_STATUS_CODES, get_host_limiter
+from app.utils.circuit_breaker import circuit_breaker_states, get_breaker
+from app.utils.ingest_pipeline import RawPriceIngestPipeline
+from app.utils.fingerprint_store import BlueprintFingerprintStore
+from app.utils.checkpoint_store import ScrapeCheckpointStore
+from app.utils.catalog_cache import CatalogCache
+from app.utils.json_stream import iter_json_items
+from app.utils.replay import client_transport
+from app.utils.scrape_metrics import format_breakdown, get_scrape_metrics, run_breakdown
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 
 class CardTraderScraperV2:
     """
@@ -37,13 +55,47 @@ class CardTraderScraperV2:
             "Authorization": f"Bearer {self.api_token}",
             "Content-Type": "application/json"
         }
+        self.client: Optional[httpx.AsyncClient] = None
+        self.pipeline = RawPriceIngestPipeline()
         self.total_listings_scraped = 0
         self.total_blueprints_processed = 0
+        self.total_blueprints_skipped = 0
+        self.last_error: Optional[str] = None  # Why the last scrape_all() failed (None = it did not)
+        
+        # Per-blueprint change detection (None = write every listing)
+        self.fingerprints: Optional[BlueprintFingerprintStore] = None
+        if config.INCREMENTAL_CRAWL:
+            self.fingerprints = BlueprintFingerprintStore(
+                stable_after_hours=config.STABLE_AFTER_HOURS,
+                stable_recheck_hours=config.STABLE_RECHECK_HOURS,
+            )
+        
+        # Expansions and blueprints cached between runs (None = fetch every run)
+        self.catalog: Optional[CatalogCache] = None
+        if config.CATALOG_CACHE_ENABLED:
+            self.catalog = CatalogCache("CardTrader", schema_version=config.CATALOG_CACHE_VERSION)
+        
+        # Completed expansions of the current run (for --resume)
+        self.checkpoint = ScrapeCheckpointStore("CardTrader")
+        self._expansion_progress: Dict[int, Dict[str, int]] = {}
+        
+        # Adaptive request budget shared by every worker (backs off on 429/503)
+        self.rate_limiter = get_host_limiter(
+            self.api_base,
+            initial_rate=config.MAX_REQUESTS_PER_SECOND,
+            max_rate=config.MAX_REQUESTS_PER_SECOND_CEILING,
+        )
+        self.breaker = get_breaker(self.api_base, source="CardTrader")
+        self.source_name = "CardTrader"
+        self.metrics = get_scrape_metrics(self.source_name)
     
-    async def scrape_all(self) -> int:
+    async def scrape_all(self, resume: bool = False) -> int:
         """
         Main scraper entry point
         
+        Args:
+            resume: Skip expansions completed by the last unfinished run
+        
         Returns:
             Total number of listings scraped
         """
@@ -52,54 +104,106 @@ class CardTraderScraperV2:
         logger.info("=" * 60)
         
         start_time = datetime.utcnow()
+        metrics_before = self.metrics.snapshot()
+        
+        # Per-run counters (a warm scraper is run again and again)
+        self.total_listings_scraped = 0
+        self.total_blueprints_processed = 0
+        self.total_blueprints_skipped = 0
+        self.last_error = None
+        self._expansion_progress = {}
+        
+        # A client set up by the caller (orchestrator) stays open for its next run
+        owns_client = self.client is None
         
         try:
-            # Step 1: Get Pokemon expansions
-            expansions = await self._fetch_pokemon_expansions()
-            logger.info(f"Found {len(expansions)} Pokemon expansions")
+            if owns_client:
+                await self.setup_client()
+            
+            if self.fingerprints:
+                await self.fingerprints.load()
             
-            # Focus on recent/popular expansions (last 100 expansions = most recent sets)
-            # CardTrader has 3000+ expansions total, but most are old/inactive
-            recent_expansions = expansions[:100]  # Get most recent 100
+            await self.checkpoint.start(resume=resume)
+            
+            # Step 1: Get Pokemon expansions
+            recent_expansions = await self.fetch_recent_expansions()
             logger.info(f"Processing {len(recent_expansions)} recent expansions for optimal data coverage")
             
-            # Step 2: For each expansion, get blueprints and marketplace listings
-            for i, expansion in enumerate(recent_expansions, 1):
-                expansion_id = expansion['id']
-                expansion_name = expansion['name']
-                
-                logger.info(f"[{i}/{len(recent_expansions)}] Processing: {expansion_name}")
-                
-                # Get blueprints for this expansion
-                blueprints = await self._fetch_blueprints(expansion_id)
-                logger.info(f"  Found {len(blueprints)} blueprints")
-                
-                # Process all blueprints (no limit)
-                for blueprint in blueprints:
-                    blueprint_id = blueprint['id']
-                    blueprint_name = blueprint.get('name', 'Unknown')
+            # Step 2: Fan blueprints out to a pool of workers that fetch and
+            # save marketplace listings under one shared request budget
+            worker_count = max(1, config.CONCURRENT_WORKERS)
+            queue: asyncio.Queue = asyncio.Queue(maxsize=worker_count * 10)
+            workers = [
+                asyncio.create_task(self._blueprint_worker(queue))
+                for _ in range(worker_count)
+            ]
+            logger.info(f"Started {len(workers)} blueprint workers ({config.MAX_REQUESTS_PER_SECOND}-{config.MAX_REQUESTS_PER_SECOND_CEILING} req/s adaptive budget)")
+            
+            try:
+                for i, expansion in enumerate(recent_expansions, 1):
+                    expansion_id = expansion['id']
+                    expansion_name = expansion['name']
+                    
+                    if self.checkpoint.is_done(expansion_id):
+                        logger.info(f"[{i}/{len(recent_expansions)}] Skipping {expansion_name} (done before resume)")
+                        continue
+                    
+                    logger.info(f"[{i}/{len(recent_expansions)}] Processing: {expansion_name}")
                     
-                    listings = await self._fetch_marketplace_listings(blueprint_id)
+                    # Get blueprints for this expansion (cached unless stale)
+                    blueprints = await self.fetch_blueprints(expansion_id, self.expansion_version(expansion))
+                    logger.info(f"  Found {len(blueprints)} blueprints")
                     
-                    if listings:
-                        await self._save_listings(listings, blueprint, expansion)
-                        self.total_blueprints_processed += 1
-                        
-                        # Log progress every 10 blueprints
-                        if self.total_blueprints_processed % 10 == 0:
-                            logger.info(f"    Progress: {self.total_blueprints_processed} blueprints, {self.total_listings_scraped} listings")
+                    if not blueprints:
+                        await self.checkpoint.mark_done(expansion_id)
+                        continue
                     
-                    # Smaller delay for faster scraping (be respectful but efficient)
-                    await asyncio.sleep(0.3)
+                    # Workers mark the expansion done when its last blueprint is saved;
+                    # batches dropped past this mark may hold its rows
+                    self._expansion_progress[expansion_id] = {
+                        "pending": len(blueprints),
+                        "failed": 0,
+                        "listings": 0,
+                        "since": self.pipeline.mark(),
+                    }
+                    
+                    # Queue all blueprints (no limit); blocks while workers catch up
+                    for blueprint in blueprints:
+                        await queue.put((blueprint, expansion))
+                
+                await queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+            
+            # Wait for the writer to land everything still queued
+            await self.pipeline.close()
+            
+            if self.fingerprints:
+                if self.pipeline.failed_batches:
+                    # Which blueprints lost rows is unknown: refetch them all next run
+                    logger.warning("Not saving blueprint fingerprints, some rows were not written")
+                    self.fingerprints.discard()
+                else:
+                    await self.fingerprints.flush()
+            
+            await self.checkpoint.finish("completed")
             
             end_time = datetime.utcnow()
             duration = (end_time - start_time).total_seconds()
+            timings = run_breakdown(metrics_before, self.metrics.snapshot())
             
             logger.info("=" * 60)
             logger.info(f"✅ Scrape complete!")
             logger.info(f"   Blueprints processed: {self.total_blueprints_processed}")
+            logger.info(f"   Blueprints skipped (stable): {self.total_blueprints_skipped}")
             logger.info(f"   Listings scraped: {self.total_listings_scraped}")
+            if self.catalog:
+                logger.info(f"   Catalog cache: {self.catalog.hits} hits, {self.catalog.refreshes} fetched")
             logger.info(f"   Duration: {duration:.1f}s")
+            logger.info(f"   Request rate: {self.rate_limiter.current_rate:.1f} req/s ({self.rate_limiter.throttled} throttled)")
+            logger.info(f"   Time: {format_breakdown(timings)}")
             logger.info("=" * 60)
             
             # Log to database
@@ -110,7 +214,13 @@ class CardTraderScraperV2:
                     completed_at=end_time,
                     duration_seconds=int(duration),
                     items_scraped=self.total_listings_scraped,
-                    status="success" if self.total_listings_scraped > 0 else "no_data"
+                    status=(
+                        "partial" if self.pipeline.failed_batches
+                        else "success" if self.total_listings_scraped > 0
+                        else "no_data"
+                    ),
+                    circuit_state=circuit_breaker_states("CardTrader"),
+                    timings=timings,
                 )
                 session.add(scrape_log)
                 await session.commit()
@@ -119,47 +229,326 @@ class CardTraderScraperV2:
             
         except Exception as e:
             logger.error(f"Scraper failed: {e}", exc_info=True)
+            self.last_error = str(e) or e.__class__.__name__
+            if self.checkpoint.run_id:
+                try:
+                    await self.checkpoint.finish("failed")
+                    logger.info("Progress saved; rerun with --resume to continue")
+                except Exception as checkpoint_error:
+                    logger.warning(f"Could not save checkpoint: {checkpoint_error}")
             return 0
+        finally:
+            if owns_client:
+                await self.cleanup_client()
     
-    async def _fetch_pokemon_expansions(self) -> List[Dict[str, Any]]:
+    async def setup_client(self):
         """
-        Fetch all Pokemon expansions (game_id=5)
+        Setup the pooled HTTP client shared by every API call in a run
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.api_base}/expansions",
-                headers=self.headers,
-                timeout=30.0
-            )
+        http2 = config.HTTP2_ENABLED and HTTP2_AVAILABLE
+        if config.HTTP2_ENABLED and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested but h2 is not installed, falling back to HTTP/1.1")
+        
+        limits = httpx.Limits(
+            max_connections=config.MAX_CONNECTIONS,
+            max_keepalive_connections=config.MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.KEEPALIVE_EXPIRY_SECONDS,
+        )
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=config.REQUEST_TIMEOUT,
+            http2=http2,
+            limits=limits,
+            transport=client_transport(http2=http2, limits=limits),  # None = network
+        )
+    
+    async def cleanup_client(self):
+        """
+        Cleanup HTTP client
+        """
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+    
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None, stream: bool = False) -> httpx.Response:
+        """
+        GET an API path through the shared client, within the request budget
+        
+        Throttled requests (429/503) are retried after the limiter has
+        backed off and waited out any Retry-After. While the API's circuit
+        is open this raises CircuitOpenError without sending anything.
+        
+        With stream=True the body is not read yet; the caller iterates it
+        and must close the response (see _stream_items).
+        """
+        if not self.client:
+            await self.setup_client()
+        
+        for attempt in range(config.MAX_THROTTLE_RETRIES + 1):
+            self.breaker.before_request()
+            with self.metrics.timer("rate_limit"):
+                await self.rate_limiter.acquire()
+            
+            request = self.client.build_request("GET", f"{self.api_base}{path}", params=params)
+            started = time.monotonic()
+            try:
+                response = await self.client.send(request, stream=stream)
+            except httpx.RequestError as e:
+                self.metrics.observe_fetch(time.monotonic() - started)
+                self.breaker.on_error(e)
+                raise
+            # Streamed bodies are counted by _stream_items once read
+            self.metrics.observe_fetch(time.monotonic() - started, response.status_code, response.num_bytes_downloaded)
+            self.rate_limiter.on_response(response.status_code, response.headers.get("Retry-After"))
+            self.breaker.on_response(response.status_code)
+            
+            if response.status_code not in THROTTLE_STATUS_CODES:
+                break
+            
+            await response.aclose()
+            if attempt < config.MAX_THROTTLE_RETRIES:
+                self.metrics.count("retries")
+            logger.debug(f"Throttled on {path} (attempt {attempt + 1}), retrying")
+        
+        if response.is_error:
+            await response.aclose()
             response.raise_for_status()
+        return response
+    
+    async def _stream_items(self, path: str, params: Optional[Dict[str, Any]], prefix: str) -> AsyncIterator[Any]:
+        """
+        Yield the JSON objects at `prefix` of an API response while it downloads
+        
+        Args:
+            path: API path
+            params: Query parameters
+            prefix: ijson prefix of the objects (see iter_json_items)
+        """
+        response = await self._get(path, params=params, stream=True)
+        try:
+            async for item in iter_json_items(response, prefix, config.STREAM_JSON_MIN_BYTES, self.metrics):
+                yield item
+        except httpx.RequestError as e:
+            # The connection can also fail while the body is still arriving
+            self.breaker.on_error(e)
+            raise
+        finally:
+            self.metrics.count("bytes_downloaded", response.num_bytes_downloaded)
+            await response.aclose()
+    
+    async def _blueprint_worker(self, queue: asyncio.Queue):
+        """
+        Pull (blueprint, expansion) pairs off the queue and save their listings
+        """
+        while True:
+            blueprint, expansion = await queue.get()
+            saved = 0
+            failed = True
+            try:
+                saved = await self._process_blueprint(blueprint, expansion)
+                failed = False
+            except Exception as e:
+                logger.warning(f"Error processing blueprint {blueprint.get('id')}: {e}")
+            finally:
+                try:
+                    await self._blueprint_done(blueprint, expansion, saved, failed)
+                except Exception as e:
+                    logger.warning(f"Could not checkpoint expansion {expansion.get('id')}: {e}")
+                queue.task_done()
+    
+    async def _process_blueprint(
+        self,
+        blueprint: Dict[str, Any],
+        expansion: Dict[str, Any],
+        pipeline: Optional[RawPriceIngestPipeline] = None,
+    ) -> int:
+        """
+        Fetch one blueprint's listings and queue the new/changed ones
+        
+        Args:
+            blueprint: CardTrader blueprint
+            expansion: Its expansion
+            pipeline: Pipeline of a job queue unit (defaults to the run's
+                pipeline); the fingerprint is kept pending for that unit
             
-            all_expansions = response.json()
+        Returns:
+            Number of listings queued
+        """
+        unit = pipeline
+        pipeline = pipeline or self.pipeline
+        
+        if self.fingerprints and self.fingerprints.should_skip(blueprint['id']):
+            self.total_blueprints_skipped += 1
+            # Not refetched because it is stable: its listings are still live
+            await pipeline.mark_seen(self.source_name, self.fingerprints.listing_keys(blueprint['id']))
+            return 0
+        
+        # Listings are decoded one at a time and queued as they arrive,
+        # so big blueprints never sit in memory as a whole
+        listing_hashes: Dict[str, str] = {}
+        unchanged_keys: List[Any] = []
+        saved = 0
+        async for listing in self._iter_marketplace_listings(blueprint['id']):
+            if self.fingerprints:
+                # Only new or changed listings go to raw_prices; unchanged
+                # ones just refresh last_seen_at of their row
+                key, digest = self.fingerprints.fingerprint(listing)
+                listing_hashes[key] = digest
+                if not self.fingerprints.is_changed(blueprint['id'], key, digest):
+                    unchanged_keys.append(listing.get('id'))
+                    continue
             
-            # Filter for Pokemon (game_id=5)
-            pokemon_expansions = [
-                exp for exp in all_expansions
-                if exp.get('game_id') == 5
-            ]
+            if await self._save_listing(listing, blueprint, expansion, pipeline):
+                saved += 1
+        
+        await pipeline.mark_seen(self.source_name, unchanged_keys)
+        
+        if self.fingerprints:
+            self.fingerprints.record_hashes(blueprint['id'], expansion.get('id'), listing_hashes, unit=unit)
+        
+        if not saved:
+            return 0
+        
+        self.total_blueprints_processed += 1
+        
+        # Log progress every 10 blueprints
+        if self.total_blueprints_processed % 10 == 0:
+            logger.info(f"    Progress: {self.total_blueprints_processed} blueprints, {self.total_listings_scraped} listings")
+        
+        return saved
+    
+    async def scrape_blueprint_batch(self, expansion: Dict[str, Any], blueprints: List[Dict[str, Any]]) -> int:
+        """
+        Scrape a batch of blueprints as one job queue unit
+        
+        Rows and fingerprints are written before returning, so the unit
+        can be marked done as soon as this completes. Each unit writes
+        through its own pipeline, so units running at once on a warm
+        scraper never see or flush each other's rows and fingerprints.
+        
+        Returns:
+            Number of listings saved
+        """
+        if self.fingerprints:
+            await self.fingerprints.load([blueprint['id'] for blueprint in blueprints])
+        
+        saved = 0
+        pipeline = RawPriceIngestPipeline()
+        try:
+            for blueprint in blueprints:
+                saved += await self._process_blueprint(blueprint, expansion, pipeline)
             
-            return pokemon_expansions
+            # Raises if any of this unit's batches was dropped
+            await pipeline.flush()
+        except Exception:
+            if self.fingerprints:
+                self.fingerprints.discard(unit=pipeline)
+            raise
+        finally:
+            await pipeline.close()
+        
+        if self.fingerprints:
+            await self.fingerprints.flush(unit=pipeline)
+        
+        return saved
+    
+    async def _blueprint_done(self, blueprint: Dict[str, Any], expansion: Dict[str, Any], saved: int, failed: bool = False):
+        """
+        Count a finished blueprint; checkpoint its expansion once all are done
+        
+        An expansion with a failed blueprint, or with rows in flight when
+        an ingest batch was dropped, is not checkpointed, so --resume
+        scrapes it again.
+        """
+        progress = self._expansion_progress.get(expansion['id'])
+        if progress is None:
+            return
+        
+        progress["pending"] -= 1
+        progress["failed"] += int(failed)
+        progress["listings"] += saved
+        
+        if progress["pending"] == 0:
+            del self._expansion_progress[expansion['id']]
+            if progress["failed"]:
+                logger.warning(f"  {progress['failed']} blueprints of expansion {expansion['id']} failed, not checkpointing it")
+                return
+            # Rows must be in the database before the expansion counts as done
+            await self.pipeline.flush(progress["since"])
+            await self.checkpoint.mark_done(
+                expansion['id'],
+                items=progress["listings"],
+                last_blueprint_id=blueprint['id'],
+            )
+            logger.debug(f"  Checkpoint: expansion {expansion['id']} done")
+    
+    async def fetch_recent_expansions(self) -> List[Dict[str, Any]]:
+        """
+        Pokemon expansions worth scraping, most recent first
+        """
+        if self.catalog:
+            expansions = await self.catalog.get_or_fetch(
+                "expansions",
+                self._fetch_pokemon_expansions,
+                ttl_hours=config.EXPANSIONS_CACHE_TTL_HOURS,
+            )
+        else:
+            expansions = await self._fetch_pokemon_expansions()
+        logger.info(f"Found {len(expansions)} Pokemon expansions")
+        
+        # Focus on recent/popular expansions (last 100 expansions = most recent sets)
+        # CardTrader has 3000+ expansions total, but most are old/inactive
+        return expansions[:100]  # Get most recent 100
+    
+    async def _fetch_pokemon_expansions(self) -> List[Dict[str, Any]]:
+        """
+        Fetch all Pokemon expansions (game_id=5)
+        """
+        # Filter for Pokemon (game_id=5) while decoding, other games are never kept
+        pokemon_expansions = [
+            exp async for exp in self._stream_items("/expansions", None, "item")
+            if exp.get('game_id') == 5
+        ]
+        
+        return pokemon_expansions
+    
+    @staticmethod
+    def expansion_version(expansion: Dict[str, Any]) -> str:
+        """
+        Hash of an expansion record; its cached blueprints are refetched when it changes
+        """
+        payload = json.dumps(expansion, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+    
+    async def fetch_blueprints(self, expansion_id: int, version: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Blueprints of an expansion, from the catalog cache while fresh
+        
+        Args:
+            expansion_id: CardTrader expansion ID
+            version: expansion_version() of the expansion record (None = TTL only)
+        """
+        if not self.catalog:
+            return await self._fetch_blueprints(expansion_id)
+        
+        return await self.catalog.get_or_fetch(
+            f"blueprints:{expansion_id}",
+            lambda: self._fetch_blueprints(expansion_id),
+            ttl_hours=config.BLUEPRINTS_CACHE_TTL_HOURS,
+            version=version,
+        )
     
     async def _fetch_blueprints(self, expansion_id: int) -> List[Dict[str, Any]]:
         """
         Fetch all blueprints (cards) for a given expansion
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.api_base}/blueprints",
-                params={"expansion_id": expansion_id},
-                headers=self.headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
+        response = await self._get("/blueprints", params={"expansion_id": expansion_id})
+        with self.metrics.timer("parse"):
             return response.json()
     
-    async def _fetch_marketplace_listings(self, blueprint_id: int) -> List[Dict[str, Any]]:
+    async def _iter_marketplace_listings(self, blueprint_id: int) -> AsyncIterator[Dict[str, Any]]:
         """
-        Fetch marketplace listings for a given blueprint
+        Stream marketplace listings for a given blueprint, one at a time
         
         Response format:
         {
@@ -174,84 +563,82 @@ class CardTraderScraperV2:
             ]
         }
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.api_base}/marketplace/products",
-                params={"blueprint_id": blueprint_id},
-                headers=self.headers,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Response is a dict with blueprint_id as key
-            if isinstance(data, dict) and str(blueprint_id) in data:
-                return data[str(blueprint_id)]
-            
-            return []
+        # Response is a dict with blueprint_id as key
+        params = {"blueprint_id": blueprint_id}
+        async for listing in self._stream_items("/marketplace/products", params, f"{blueprint_id}.item"):
+            yield listing
     
-    async def _save_listings(
+    async def _save_listing(
         self,
-        listings: List[Dict[str, Any]],
+        listing: Dict[str, Any],
         blueprint: Dict[str, Any],
-        expansion: Dict[str, Any]
-    ):
+        expansion: Dict[str, Any],
+        pipeline: Optional[RawPriceIngestPipeline] = None,
+    ) -> bool:
         """
-        Save listings to database
+        Queue one listing into the ingest pipeline (written by COPY in batches)
+        
+        Args:
+            listing: CardTrader marketplace listing
+            blueprint: Its blueprint
+            expansion: Its expansion
+            pipeline: Pipeline to queue into (defaults to the run's pipeline)
+        
+        Returns:
+            True if the listing was queued
         """
-        async with AsyncSessionLocal() as session:
-            for listing in listings:
-                try:
-                    # Extract data
-                    price_cents = listing.get('price_cents', 0)
-                    price = Decimal(price_cents) / Decimal(100)  # Convert cents to euros
-                    currency = listing.get('price_currency', 'EUR')
-                    quantity = listing.get('quantity', 0)
-                    
-                    # Get card name
-                    card_name = listing.get('name_en') or blueprint.get('name', 'Unknown')
-                    
-                    # Get language
-                    properties = listing.get('properties_hash', {})
-                    language = properties.get('pokemon_language', 'EN').upper()
-                    
-                    # Condition (if available)
-                    condition = properties.get('condition', 'NM')
-                    
-                    # Create raw_price entry
-                    raw_price = RawPrice(
-                        card_name=card_name,
-                        card_set=expansion.get('name_en') or expansion.get('name'),
-                        card_number=str(blueprint.get('id')),  # Use blueprint_id as card number
-                        condition=condition,
-                        language=language,
-                        price=float(price),
-                        currency=currency,
-                        source="CardTrader",
-                        source_url=f"https://www.cardtrader.com/cards/{blueprint.get('id')}",
-                        seller_name=None,  # Not available in API response
-                        seller_rating=None,
-                        stock_quantity=quantity,
-                        scraped_at=datetime.utcnow()
-                    )
-                    
-                    session.add(raw_price)
-                    self.total_listings_scraped += 1
-                    
-                except Exception as e:
-                    logger.warning(f"Error saving listing: {e}")
-                    continue
+        try:
+            # Extract data
+            price_cents = listing.get('price_cents', 0)
+            price = Decimal(price_cents) / Decimal(100)  # Convert cents to euros
+            currency = listing.get('price_currency', 'EUR')
+            quantity = listing.get('quantity', 0)
             
-            await session.commit()
-
+            # Get card name
+            card_name = listing.get('name_en') or blueprint.get('name', 'Unknown')
+            
+            # Get language
+            properties = listing.get('properties_hash', {})
+            language = properties.get('pokemon_language', 'EN').upper()
+            
+            # Condition (if available)
+            condition = properties.get('condition', 'NM')
+            
+            # Build raw_prices row
+            row = {
+                "card_name": card_name,
+                "card_set": expansion.get('name_en') or expansion.get('name'),
+                "card_number": str(blueprint.get('id')),  # Use blueprint_id as card number
+                "condition": condition,
+                "language": language,
+                "price": price,
+                "currency": currency,
+                "source": "CardTrader",
+                "source_url": f"https://www.cardtrader.com/cards/{blueprint.get('id')}",
+                "seller_name": None,  # Not available in API response
+                "seller_rating": None,
+                "stock_quantity": quantity,
+                "listing_key": listing.get('id'),  # Upserted, so a listing stays one row
+                "scraped_at": datetime.utcnow(),
+            }
+            
+        except Exception as e:
+            logger.warning(f"Error saving listing: {e}")
+            return False
+        
+        await (pipeline or self.pipeline).put(row)
+        self.total_listings_scraped += 1
+        return True
 
-async def run_cardtrader_scraper():
+async def run_cardtrader_scraper(resume: bool = False):
     """
     Entry point for CardTrader scraper
+    
+    Args:
+        resume: Continue the last unfinished run from its checkpoint
     """
     scraper = CardTraderScraperV2()
-    total = await scraper.scrape_all()
+    total = await scraper.scrape_all(resume=resume)
     logger.info(f"CardTrader scraper finished. Total listings: {total}")
     return total
 
@@ -6,8 +6,10 @@ This scraper collects REAL market data (actual sold prices)
 which is critical for accurate deal scoring and trend analysis.
 """
 
+import asyncio
 import logging
 import re
+import time
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from decimal import Decimal
@@ -16,11 +18,18 @@ import httpx
 from bs4 import BeautifulSoup
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.raw_price import RawPrice
+from app.database import AsyncSessionLocal
 from app.models.scrape_log import ScrapeLog
 from app.utils.delay_manager import DelayManager
 from app.utils.user_agent_rotator import UserAgentRotator
 from app.utils.retry import retry
+from app.utils.html_parser import parse_document
+from app.utils.parse_pool import run_parse
+from app.utils.ingest_pipeline import RawPriceIngestPipeline
+from app.utils.rate_limiter import get_host_limiter
+from app.utils.circuit_breaker import circuit_breaker_states, get_breaker
+from app.utils.replay import client_transport
+from app.utils.scrape_metrics import format_breakdown, get_scrape_metrics, run_breakdown
 from app.config_ebay import config
 
 
@@ -33,22 +42,34 @@ class EbayScraper:
     
     Features:
     - Scrapes completed/sold listings only (real market data)
-    - Supports multiple EU eBay sites
+    - Supports multiple EU eBay sites, crawled concurrently
     - Extracts: product name, price, condition, seller, date sold
     - Handles currency conversion
     - Rate limited and respectful
     """
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: Optional[AsyncSession] = None):
         self.session = session
+        self.source_name = "eBay"
+        self.metrics = get_scrape_metrics(self.source_name)
         self.delay_manager = DelayManager(
             min_delay=config.MIN_DELAY_SECONDS,
-            max_delay=config.MAX_DELAY_SECONDS
+            max_delay=config.MAX_DELAY_SECONDS,
+            source=self.source_name
         )
         self.user_agent_rotator = UserAgentRotator(config.USER_AGENTS)
+        self.pipeline = RawPriceIngestPipeline()
+        
+        # One pooled client for every site; connections are kept per host
+        limits = httpx.Limits(
+            max_connections=config.MAX_CONNECTIONS,
+            max_keepalive_connections=config.MAX_KEEPALIVE_CONNECTIONS,
+        )
         self.http_client = httpx.AsyncClient(
             timeout=30.0,
-            follow_redirects=True
+            follow_redirects=True,
+            limits=limits,
+            transport=client_transport(limits=limits),  # None = network
         )
         
         # Currency symbols for different eBay sites
@@ -82,52 +103,106 @@ class EbayScraper:
         logger.info("Starting eBay scraper for sold listings")
         logger.info("=" * 60)
         
-        stats = {}
+        metrics_before = self.metrics.snapshot()
         
-        for site in config.EBAY_SITES:
-            logger.info(f"Scraping {site}...")
-            
-            try:
-                count = await self.scrape_site(site)
-                stats[site] = count
-                logger.info(f"✅ {site}: {count} listings scraped")
-                
-                # Delay between sites
-                await self.delay_manager.delay()
-                
-            except Exception as e:
-                logger.error(f"❌ Error scraping {site}: {e}")
-                stats[site] = 0
+        stats = await self.scrape_sites(config.EBAY_SITES)
         
         total = sum(stats.values())
         logger.info(f"📊 Total: {total} listings across {len(config.EBAY_SITES)} sites")
         
+        await self.pipeline.close()
+        
+        timings = run_breakdown(metrics_before, self.metrics.snapshot())
+        logger.info(f"⏱️ Time: {format_breakdown(timings)}")
+        
         # Log scrape run
         await self._log_scrape(
             source="ebay_all",
             items_scraped=total,
-            success=True
+            success=True,
+            timings=timings
         )
         
         return stats
     
+    async def scrape_sites(self, sites: List[str]) -> Dict[str, int]:
+        """
+        Scrape several eBay sites, all at once with CONCURRENT_SITES
+        
+        Every site is its own host with its own rate limiter and circuit
+        breaker, so running them side by side makes a full pass take about
+        as long as the slowest site.
+        
+        Args:
+            sites: eBay sites (e.g. ["ebay.de", "ebay.fr"])
+        
+        Returns:
+            Dict with listings scraped per site
+        """
+        if config.CONCURRENT_SITES:
+            logger.info(f"Scraping {len(sites)} sites concurrently ({config.SEARCHES_PER_SITE} searches per site)")
+            counts = await asyncio.gather(*(self._scrape_site_logged(site) for site in sites))
+            return dict(zip(sites, counts))
+        
+        stats = {}
+        for site in sites:
+            stats[site] = await self._scrape_site_logged(site)
+            
+            # Delay between sites
+            await self.delay_manager.delay()
+        
+        return stats
+    
+    async def _scrape_site_logged(self, site: str) -> int:
+        """Scrape one site, logging the outcome instead of raising"""
+        logger.info(f"Scraping {site}...")
+        
+        try:
+            count = await self.scrape_site(site)
+            logger.info(f"✅ {site}: {count} listings scraped")
+            return count
+        except Exception as e:
+            logger.error(f"❌ Error scraping {site}: {e}")
+            return 0
+    
     async def scrape_site(self, site: str) -> int:
-        """Scrape sold listings from a specific eBay site"""
-        count = 0
+        """
+        Scrape sold listings from a specific eBay site
         
-        for keyword in config.SEARCH_KEYWORDS:
-            try:
-                listings = await self.search_sold_listings(site, keyword)
-                
-                for listing in listings:
-                    if await self._save_listing(listing):
-                        count += 1
+        With CONCURRENT_SITES, up to SEARCHES_PER_SITE keywords are searched
+        at once; otherwise one after another.
+        """
+        concurrency = max(1, config.SEARCHES_PER_SITE) if config.CONCURRENT_SITES else 1
+        slots = asyncio.Semaphore(concurrency)
+        
+        async def search(keyword: str) -> int:
+            async with slots:
+                try:
+                    count = await self.scrape_search(site, keyword)
+                except Exception as e:
+                    logger.error(f"Error searching '{keyword}' on {site}: {e}")
+                    return 0
                 
                 # Delay between searches
                 await self.delay_manager.delay()
-                
-            except Exception as e:
-                logger.error(f"Error searching '{keyword}' on {site}: {e}")
+                return count
+        
+        counts = await asyncio.gather(*(search(keyword) for keyword in config.SEARCH_KEYWORDS))
+        return sum(counts)
+    
+    async def scrape_search(self, site: str, keyword: str) -> int:
+        """
+        Search one site for one keyword and queue the sold listings
+        
+        Returns:
+            Number of listings queued
+        """
+        count = 0
+        listings = await self.search_sold_listings(site, keyword)
+        
+        for listing in listings:
+            if await self._save_listing(listing):
+                count += 1
         
         return count
     
@@ -158,12 +233,34 @@ class EbayScraper:
             # Fetch page
             headers = {"User-Agent": self.user_agent_rotator.get_random()}
             
+            # Each eBay site has its own adaptive limiter
+            rate_limiter = get_host_limiter(
+                url,
+                initial_rate=config.REQUESTS_PER_MINUTE / 60,
+                max_rate=config.REQUESTS_PER_MINUTE_MAX / 60,
+            )
+            breaker = get_breaker(url, source="eBay")
+            breaker.before_request()
+            
             try:
-                response = await self.http_client.get(url, headers=headers)
+                with self.metrics.timer("rate_limit"):
+                    await rate_limiter.acquire()
+                started = time.monotonic()
+                try:
+                    response = await self.http_client.get(url, headers=headers)
+                except httpx.RequestError as e:
+                    self.metrics.observe_fetch(time.monotonic() - started)
+                    breaker.on_error(e)
+                    raise
+                self.metrics.observe_fetch(time.monotonic() - started, response.status_code, response.num_bytes_downloaded)
+                rate_limiter.on_response(response.status_code, response.headers.get("Retry-After"))
+                breaker.on_response(response.status_code)
                 response.raise_for_status()
                 
                 # Parse listings
-                page_listings = self._parse_search_results(
+                page_listings = await run_parse(
+                    self,
+                    "_parse_search_results",
                     response.text, 
                     site,
                     keyword
@@ -220,11 +317,11 @@ class EbayScraper:
         search_keyword: str
     ) -> List[Dict[str, Any]]:
         """Parse eBay search results page"""
-        soup = BeautifulSoup(html, "html.parser")
+        soup = parse_document(html, features="html.parser")
         listings = []
         
         # Find listing items (eBay uses different classes, try common ones)
-        items = soup.find_all("li", class_=re.compile(r"s-item"))
+        items = soup.select('li[class*="s-item"]')
         
         for item in items:
             try:
@@ -246,7 +343,7 @@ class EbayScraper:
         """Parse individual listing from search results"""
         try:
             # Title
-            title_elem = item_soup.find("div", class_=re.compile(r"s-item__title"))
+            title_elem = item_soup.select_one('div[class*="s-item__title"]')
             if not title_elem:
                 return None
             title = title_elem.get_text(strip=True)
@@ -256,7 +353,7 @@ class EbayScraper:
                 return None
             
             # Price
-            price_elem = item_soup.find("span", class_=re.compile(r"s-item__price"))
+            price_elem = item_soup.select_one('span[class*="s-item__price"]')
             if not price_elem:
                 return None
             
@@ -266,21 +363,21 @@ class EbayScraper:
                 return None
             
             # Condition (if available)
-            condition_elem = item_soup.find("span", class_=re.compile(r"SECONDARY_INFO"))
+            condition_elem = item_soup.select_one('span[class*="SECONDARY_INFO"]')
             condition = condition_elem.get_text(strip=True) if condition_elem else "Used"
             
             # Normalize condition
             condition = self._normalize_condition(condition)
             
             # URL
-            link_elem = item_soup.find("a", class_=re.compile(r"s-item__link"))
+            link_elem = item_soup.select_one('a[class*="s-item__link"]')
             url = link_elem["href"] if link_elem else ""
             
             # Extract item ID from URL
             item_id = self._extract_item_id(url)
             
             # Sold date (try to find it)
-            date_elem = item_soup.find("span", class_=re.compile(r"s-item__ended-date"))
+            date_elem = item_soup.select_one('span[class*="s-item__ended-date"]')
             sold_date = self._parse_date(date_elem.get_text(strip=True)) if date_elem else datetime.utcnow()
             
             # Currency
@@ -341,7 +438,8 @@ class EbayScraper:
     
     def _extract_item_id(self, url: str) -> str:
         """Extract eBay item ID from URL"""
-        match = re.search(r"/(\d+)", url)
+        # /itm/<id> or /itm/<title-slug>/<id>
+        match = re.search(r"/itm/(?:[^/?#]+/)?(\d+)", url) or re.search(r"/(\d+)", url)
         return match.group(1) if match else ""
     
     def _parse_date(self, date_text: str) -> datetime:
@@ -363,25 +461,22 @@ class EbayScraper:
     async def _save_listing(self, listing: Dict[str, Any]) -> bool:
         """Save listing to database"""
         try:
-            raw_price = RawPrice(
-                card_name=listing["product_name"],
-                card_set="",  # eBay doesn't always have set info
-                card_number=listing.get("product_id", ""),
-                condition=listing["condition"],
-                language="EN",  # Assume English, could be improved
-                price=listing["price"],
-                currency=listing["currency"],
-                source=listing["source"],
-                source_url=listing["source_url"],
-                seller_name="",  # Could be extracted if needed
-                seller_rating=None,
-                stock_quantity=1,  # Sold items are qty 1
-                country=listing["country"],
-                scraped_at=datetime.utcnow(),
-            )
-            
-            self.session.add(raw_price)
-            await self.session.flush()
+            await self.pipeline.put({
+                "card_name": listing["product_name"],
+                "card_set": "",  # eBay doesn't always have set info
+                "card_number": listing.get("product_id", ""),
+                "condition": listing["condition"],
+                "language": "EN",  # Assume English, could be improved
+                "price": listing["price"],
+                "currency": listing["currency"],
+                "source": listing["source"],
+                "source_url": listing["source_url"],
+                "seller_name": "",  # Could be extracted if needed
+                "seller_rating": None,
+                "stock_quantity": 1,  # Sold items are qty 1
+                "listing_key": listing.get("product_id"),  # Item ID; a sale is stored once
+                "scraped_at": datetime.utcnow(),
+            })
             
             return True
             
@@ -389,7 +484,7 @@ class EbayScraper:
             logger.error(f"Error saving listing: {e}")
             return False
     
-    async def _log_scrape(self, source: str, items_scraped: int, success: bool):
+    async def _log_scrape(self, source: str, items_scraped: int, success: bool, timings: Optional[Dict[str, Any]] = None):
         """Log scrape run to database"""
         try:
             log = ScrapeLog(
@@ -397,16 +492,27 @@ class EbayScraper:
                 status="success" if success else "failed",
                 items_scraped=items_scraped,
                 error_message=None if success else "Check logs for details",
-                scraped_at=datetime.utcnow()
+                completed_at=datetime.utcnow(),
+                circuit_state=circuit_breaker_states("eBay"),
+                timings=timings,
             )
-            self.session.add(log)
-            await self.session.commit()
+            if self.session is not None:
+                self.session.add(log)
+                await self.session.commit()
+            else:
+                # Long-running callers don't hold a session; borrow one from the pool
+                async with AsyncSessionLocal() as session:
+                    session.add(log)
+                    await session.commit()
         except Exception as e:
             logger.error(f"Error logging scrape: {e}")
     
     async def close(self):
-        """Close HTTP client"""
-        await self.http_client.aclose()
+        """Write queued rows and close HTTP client"""
+        try:
+            await self.pipeline.close()
+        finally:
+            await self.http_client.aclose()
 
 
 async def run_ebay_scraper(session: AsyncSession) -> Dict[str, int]:
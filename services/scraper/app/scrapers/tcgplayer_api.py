@@ -0,0 +1,364 @@
+"""
+TCGPlayer Partner API Client
+Catalog and pricing lookups in batches, for API ingestion instead of HTML scraping
+
+API Structure:
+1. POST /token (client credentials -> bearer token, valid for about two weeks)
+2. GET /catalog/categories/{categoryId}/groups (sets, 100 per page)
+3. GET /catalog/products?groupId={id} (products of a set, 100 per page)
+4. GET /pricing/product/{id,id,...} (prices of up to 250 products per request)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from app.config_tcgplayer import config
+from app.utils.rate_limiter import THROTTLE_STATUS_CODES, get_host_limiter
+from app.utils.circuit_breaker import get_breaker
+from app.utils.replay import client_transport
+from app.utils.scrape_metrics import get_scrape_metrics
+
+logger = logging.getLogger(__name__)
+
+
+# Bearer tokens by credentials, shared by every client of this process
+_tokens: Dict[str, Dict[str, Any]] = {}
+
+
+def _token_key(public_key: str) -> str:
+    """Cache key of a credential pair (the key itself is not stored)"""
+    return hashlib.sha256(public_key.encode("utf-8")).hexdigest()[:16]
+
+
+class TCGPlayerApiClient:
+    """
+    TCGPlayer Partner API client for Pokemon catalog and market prices
+    
+    One HTML search page yields a few dozen products; the API returns 100
+    products per catalog request and prices 250 products per pricing
+    request, so a set costs a handful of requests instead of one per page.
+    The bearer token is cached in memory and (optionally) on disk and only
+    renewed shortly before it expires or when the API rejects it.
+    
+    Every request shares one concurrency limit, the host's adaptive rate
+    limiter and its circuit breaker, so the pages of a listing and the
+    pricing batches are fetched in parallel within the partner rate limit.
+    """
+    
+    def __init__(self, public_key: Optional[str] = None, private_key: Optional[str] = None):
+        """
+        Initialize API client
+        
+        Args:
+            public_key: Partner public key (defaults to API_PUBLIC_KEY)
+            private_key: Partner private key (defaults to API_PRIVATE_KEY)
+        """
+        self.public_key = public_key or config.API_PUBLIC_KEY
+        self.private_key = private_key or config.API_PRIVATE_KEY
+        self.base_url = config.API_BASE_URL.rstrip("/")
+        self.api_url = f"{self.base_url}/{config.API_VERSION}" if config.API_VERSION else self.base_url
+        
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=config.API_CONCURRENCY),
+            transport=client_transport(),  # None = network
+        )
+        self._semaphore = asyncio.Semaphore(max(1, config.API_CONCURRENCY))
+        self._token_lock = asyncio.Lock()
+        
+        self.rate_limiter = get_host_limiter(
+            self.base_url,
+            initial_rate=config.API_REQUESTS_PER_SECOND,
+            max_rate=config.API_REQUESTS_PER_SECOND_MAX,
+        )
+        self.breaker = get_breaker(self.base_url, source="TCGPlayer")
+        self.metrics = get_scrape_metrics("TCGPlayer")
+        
+        # Counters for monitoring
+        self.requests_sent = 0
+        self.tokens_fetched = 0
+    
+    async def get_token(self) -> str:
+        """
+        Bearer token, from the cache while it is valid, otherwise fetched
+        
+        Concurrent callers wait for a single token request.
+        """
+        key = _token_key(self.public_key)
+        token = self._cached_token(key)
+        if token:
+            return token
+        
+        async with self._token_lock:
+            token = self._cached_token(key)
+            if token:
+                return token
+            
+            response = await self._send("POST", f"{self.base_url}/token", data={
+                "grant_type": "client_credentials",
+                "client_id": self.public_key,
+                "client_secret": self.private_key,
+            })
+            response.raise_for_status()
+            payload = response.json()
+            
+            entry = {
+                "access_token": payload["access_token"],
+                "expires_at": time.time() + int(payload.get("expires_in", 0)),
+            }
+            _tokens[key] = entry
+            self._store_token(key, entry)
+            self.tokens_fetched += 1
+            logger.info("🔑 Fetched TCGPlayer API token")
+            return entry["access_token"]
+    
+    def invalidate_token(self, token: str) -> None:
+        """
+        Forget a cached token the API rejected
+        
+        Requests that were sent with the same token fail together; only the
+        first one drops it, so the others reuse the renewed token.
+        """
+        key = _token_key(self.public_key)
+        entry = _tokens.get(key)
+        if entry and entry["access_token"] == token:
+            _tokens.pop(key, None)
+            self._store_token(key, None)
+    
+    def _cached_token(self, key: str) -> Optional[str]:
+        """Cached token that is not about to expire, loading the token file once"""
+        if key not in _tokens:
+            entry = self._load_token(key)
+            if entry:
+                _tokens[key] = entry
+        
+        entry = _tokens.get(key)
+        if entry and entry["expires_at"] - config.API_TOKEN_REFRESH_MARGIN_SECONDS > time.time():
+            return entry["access_token"]
+        return None
+    
+    def _load_token(self, key: str) -> Optional[Dict[str, Any]]:
+        """Token entry from the token file, if any"""
+        if not config.API_TOKEN_CACHE_FILE:
+            return None
+        try:
+            with open(config.API_TOKEN_CACHE_FILE, "r", encoding="utf-8") as f:
+                return json.load(f).get(key)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read TCGPlayer token cache: {e}")
+            return None
+    
+    def _store_token(self, key: str, entry: Optional[Dict[str, Any]]) -> None:
+        """Write (or with None, remove) a token entry in the token file"""
+        if not config.API_TOKEN_CACHE_FILE:
+            return
+        
+        path = Path(config.API_TOKEN_CACHE_FILE)
+        try:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+            except (FileNotFoundError, ValueError):
+                entries = {}
+            
+            if entry is None:
+                entries.pop(key, None)
+            else:
+                entries[key] = entry
+            
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)  # Tokens are credentials
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write TCGPlayer token cache: {e}")
+    
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send one request within the request budget, retrying throttled ones
+        
+        Throttled requests (429/503) are retried after the limiter has
+        backed off and waited out any Retry-After. While the API's circuit
+        is open this raises CircuitOpenError without sending anything.
+        """
+        for attempt in range(config.API_MAX_THROTTLE_RETRIES + 1):
+            self.breaker.before_request()
+            with self.metrics.timer("rate_limit"):
+                await self.rate_limiter.acquire()
+            
+            started = time.monotonic()
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.RequestError as e:
+                self.metrics.observe_fetch(time.monotonic() - started)
+                self.breaker.on_error(e)
+                raise
+            self.requests_sent += 1
+            self.metrics.observe_fetch(time.monotonic() - started, response.status_code, response.num_bytes_downloaded)
+            self.rate_limiter.on_response(response.status_code, response.headers.get("Retry-After"))
+            self.breaker.on_response(response.status_code)
+            
+            if response.status_code not in THROTTLE_STATUS_CODES:
+                break
+            
+            if attempt < config.API_MAX_THROTTLE_RETRIES:
+                self.metrics.count("retries")
+            logger.debug(f"Throttled on {url} (attempt {attempt + 1}), retrying")
+        
+        return response
+    
+    async def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        GET an API path with the bearer token
+        
+        A rejected token (401) is renewed once. A 404 is the API's answer
+        for "nothing found" and returns an empty result.
+        
+        Args:
+            path: Path below the versioned API URL, e.g. "/catalog/products"
+            params: Query parameters
+        
+        Returns:
+            Response payload ({"success", "errors", "results", "totalItems"})
+        """
+        async with self._semaphore:
+            for attempt in range(2):
+                token = await self.get_token()
+                headers = {"Authorization": f"bearer {token}", "Accept": "application/json"}
+                response = await self._send("GET", f"{self.api_url}{path}", params=params, headers=headers)
+                if response.status_code != 401 or attempt:
+                    break
+                logger.info("🔑 TCGPlayer API token rejected, renewing")
+                self.invalidate_token(token)
+        
+        if response.status_code == 404:
+            return {"success": False, "errors": [], "results": [], "totalItems": 0}
+        response.raise_for_status()
+        
+        with self.metrics.timer("parse"):
+            payload = response.json()
+        if payload.get("errors"):
+            logger.warning(f"TCGPlayer API {path}: {'; '.join(map(str, payload['errors']))}")
+        return payload
+    
+    async def get_all(self, path: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Every result of a paged listing
+        
+        The first page tells the total; the remaining pages are then
+        requested at once (bounded by the client's concurrency limit).
+        
+        Args:
+            path: Listing path
+            params: Query parameters besides offset and limit
+        
+        Returns:
+            Results of all pages in order
+        """
+        limit = config.API_PAGE_SIZE
+        params = dict(params or {})
+        first = await self.get_json(path, {**params, "offset": 0, "limit": limit})
+        results = list(first.get("results") or [])
+        total = int(first.get("totalItems") or 0)
+        
+        pages = await asyncio.gather(*(
+            self.get_json(path, {**params, "offset": offset, "limit": limit})
+            for offset in range(limit, total, limit)
+        ))
+        for page in pages:
+            results.extend(page.get("results") or [])
+        return results
+    
+    async def fetch_groups(self) -> List[Dict[str, Any]]:
+        """
+        Every group (set) of the category
+        """
+        return await self.get_all(f"/catalog/categories/{config.API_CATEGORY_ID}/groups")
+    
+    async def fetch_products(self, group_id: int) -> List[Dict[str, Any]]:
+        """
+        Products of a group, with extended fields (card number, rarity)
+        """
+        return await self.get_all("/catalog/products", {
+            "categoryId": config.API_CATEGORY_ID,
+            "groupId": group_id,
+            "productTypes": ",".join(config.API_PRODUCT_TYPES),
+            "getExtendedFields": "true",
+        })
+    
+    async def fetch_prices(self, product_ids: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Market prices of products, API_PRICING_BATCH_SIZE IDs per request
+        
+        Returns:
+            One entry per product and sub-type (Normal, Holofoil, ...)
+        """
+        batch_size = max(1, config.API_PRICING_BATCH_SIZE)
+        batches = [product_ids[i:i + batch_size] for i in range(0, len(product_ids), batch_size)]
+        
+        pages = await asyncio.gather(*(
+            self.get_json(f"/pricing/product/{','.join(str(product_id) for product_id in batch)}")
+            for batch in batches
+        ))
+        return [price for page in pages for price in page.get("results") or []]
+    
+    async def close(self):
+        """Close HTTP client"""
+        await self.client.aclose()
+
+
+def match_groups(target_sets: Sequence[str], groups: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    The group of each target set name
+
+    API_GROUP_IDS wins; otherwise the group whose name (with or without its
+    "SV02: " style code prefix) equals the set name, then one starting with
+    it, then one containing it. Within a tier the oldest group (lowest
+    groupId) wins, so "Scarlet & Violet" is the base set, not "151".
+
+    Args:
+        target_sets: Set names (TARGET_SETS)
+        groups: fetch_groups() results
+
+    Returns:
+        {set name: group} for the sets that were found
+    """
+    by_id = {group["groupId"]: group for group in groups}
+    matched: Dict[str, Dict[str, Any]] = {}
+
+    for set_name in target_sets:
+        group_id = config.API_GROUP_IDS.get(set_name)
+        if group_id is not None:
+            matched[set_name] = by_id.get(group_id) or {"groupId": group_id, "name": set_name}
+            continue
+
+        target = set_name.lower()
+        tiers: List[List[Dict[str, Any]]] = [[], [], []]
+        for group in groups:
+            name = (group.get("name") or "").lower()
+            bare = name.split(": ", 1)[1] if ": " in name else name
+            if target in (name, bare):
+                tiers[0].append(group)
+            elif bare.startswith(target):
+                tiers[1].append(group)
+            elif target in name:
+                tiers[2].append(group)
+
+        for tier in tiers:
+            if tier:
+                matched[set_name] = min(tier, key=lambda group: group["groupId"])
+                break
+
+    return matched
@@ -6,8 +6,10 @@ TCGPlayer is the largest US Pokemon card marketplace, but many EU buyers
 use it for international purchases due to competitive prices and large inventory.
 """
 
+import asyncio
 import logging
 import re
+import time
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from decimal import Decimal
@@ -16,11 +18,19 @@ import httpx
 from bs4 import BeautifulSoup
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.raw_price import RawPrice
+from app.database import AsyncSessionLocal
 from app.models.scrape_log import ScrapeLog
 from app.utils.delay_manager import DelayManager
 from app.utils.user_agent_rotator import UserAgentRotator
 from app.utils.retry import retry
+from app.utils.html_parser import parse_document
+from app.utils.parse_pool import run_parse
+from app.utils.ingest_pipeline import RawPriceIngestPipeline
+from app.utils.rate_limiter import get_host_limiter
+from app.utils.circuit_breaker import circuit_breaker_states, get_breaker
+from app.utils.replay import client_transport
+from app.utils.scrape_metrics import format_breakdown, get_scrape_metrics, run_breakdown
+from app.scrapers.tcgplayer_api import TCGPlayerApiClient, match_groups
 from app.config_tcgplayer import config
 
 
@@ -39,18 +49,29 @@ class TCGPlayerScraper:
     - Filters for international shipping
     """
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: Optional[AsyncSession] = None):
         self.session = session
+        self.source_name = "TCGPlayer"
+        self.metrics = get_scrape_metrics(self.source_name)
         self.delay_manager = DelayManager(
             min_delay=config.MIN_DELAY_SECONDS,
-            max_delay=config.MAX_DELAY_SECONDS
+            max_delay=config.MAX_DELAY_SECONDS,
+            source=self.source_name
         )
         self.user_agent_rotator = UserAgentRotator(config.USER_AGENTS)
+        self.pipeline = RawPriceIngestPipeline()
+        self.failed_sets = 0  # Sets of the current run that errored
         self.http_client = httpx.AsyncClient(
             timeout=30.0,
-            follow_redirects=True
+            follow_redirects=True,
+            transport=client_transport(),  # None = network
         )
         
+        # Partner API client (None = scrape the HTML search pages)
+        self.api: Optional[TCGPlayerApiClient] = None
+        if config.USE_API and config.API_PUBLIC_KEY and config.API_PRIVATE_KEY:
+            self.api = TCGPlayerApiClient()
+        
         # Condition mapping
         self.condition_map = {
             "Near Mint": "NM",
@@ -65,44 +86,175 @@ class TCGPlayerScraper:
         """
         Scrape Pokemon cards from target sets
         
+        The run is logged as partial when some sets errored or rows could
+        not be written, and as failed when nothing was written because of it.
+        
         Returns:
-            Total number of listings scraped
+            Number of listings written
         """
         logger.info("=" * 60)
         logger.info("Starting TCGPlayer scraper")
         logger.info("=" * 60)
         
-        if config.USE_API:
+        if self.api:
             logger.info("💡 Using TCGPlayer API")
         else:
             logger.info("Using web scraping (no API credentials)")
             logger.info("💡 Tip: Get API access from tcgplayer.com/partner")
         
         total_count = 0
+        self.failed_sets = 0
+        metrics_before = self.metrics.snapshot()
         
-        for set_name in config.TARGET_SETS:
-            try:
-                logger.info(f"Scraping set: {set_name}")
-                count = await self.scrape_set(set_name)
-                total_count += count
-                logger.info(f"  ✅ {set_name}: {count} listings")
-                
-                # Delay between sets
-                await self.delay_manager.delay()
-                
-            except Exception as e:
-                logger.error(f"Error scraping {set_name}: {e}")
+        if self.api:
+            total_count = await self.scrape_sets_api(config.TARGET_SETS)
+        else:
+            for set_name in config.TARGET_SETS:
+                try:
+                    logger.info(f"Scraping set: {set_name}")
+                    count = await self.scrape_set(set_name)
+                    total_count += count
+                    logger.info(f"  ✅ {set_name}: {count} listings")
+                    
+                    # Delay between sets
+                    await self.delay_manager.delay()
+                    
+                except Exception as e:
+                    logger.error(f"Error scraping {set_name}: {e}")
+                    self.failed_sets += 1
         
         logger.info(f"📊 Total: {total_count} listings across {len(config.TARGET_SETS)} sets")
         
+        await self.pipeline.close()
+        
+        # Queued is not written: count what the pipeline committed
+        written = self.pipeline.total_written
+        problems = []
+        if self.failed_sets:
+            problems.append(f"{self.failed_sets} sets errored")
+        if self.pipeline.failed_batches:
+            problems.append(f"{self.pipeline.failed_rows} rows in {self.pipeline.failed_batches} batches not written")
+        
+        if not problems:
+            status = "success"
+        elif written:
+            status = "partial"
+        else:
+            status = "failed"
+        
+        timings = run_breakdown(metrics_before, self.metrics.snapshot())
+        logger.info(f"💾 Written: {written} listings ({status})")
+        logger.info(f"⏱️ Time: {format_breakdown(timings)}")
+        
         # Log scrape run
         await self._log_scrape(
             source="tcgplayer",
-            items_scraped=total_count,
-            success=True
+            items_scraped=written,
+            status=status,
+            errors_count=self.failed_sets + self.pipeline.failed_batches,
+            error_message="; ".join(problems) or None,
+            timings=timings
         )
         
-        return total_count
+        return written
+    
+    async def scrape_sets_api(self, set_names: List[str]) -> int:
+        """
+        Ingest market prices of sets through the Partner API
+        
+        Sets are looked up once in the category's group list, then every
+        set is fetched concurrently; the API client keeps all of their
+        requests within one concurrency limit and the partner rate limit.
+        
+        Args:
+            set_names: Set names (TARGET_SETS)
+        
+        Returns:
+            Number of prices saved
+        """
+        requests_before, tokens_before = self.api.requests_sent, self.api.tokens_fetched
+        groups = match_groups(set_names, await self.api.fetch_groups())
+        for set_name in set_names:
+            if set_name not in groups:
+                logger.warning(f"  ⚠️ {set_name}: no TCGPlayer group found (set API_GROUP_IDS)")
+        
+        async def scrape_one(set_name: str, group: Dict[str, Any]) -> int:
+            try:
+                count = await self.scrape_group_api(set_name, group["groupId"])
+                logger.info(f"  ✅ {set_name} ({group['name']}): {count} prices")
+                return count
+            except Exception as e:
+                logger.error(f"Error scraping {set_name} via API: {e}")
+                self.failed_sets += 1
+                return 0
+        
+        counts = await asyncio.gather(*(scrape_one(set_name, group) for set_name, group in groups.items()))
+        requests = self.api.requests_sent - requests_before
+        logger.info(f"  🔌 {requests} API requests ({self.api.tokens_fetched - tokens_before} token fetches)")
+        return sum(counts)
+    
+    async def scrape_group_api(self, set_name: str, group_id: int) -> int:
+        """
+        Save the market prices of one group (set)
+        
+        Catalog pages and pricing batches are requested concurrently: a set
+        of a few hundred products costs a few catalog requests plus one
+        pricing request per API_PRICING_BATCH_SIZE products.
+        
+        Args:
+            set_name: Set name stored on the rows
+            group_id: TCGPlayer groupId of the set
+        
+        Returns:
+            Number of prices saved
+        """
+        products = {product["productId"]: product for product in await self.api.fetch_products(group_id)}
+        if not products:
+            return 0
+        
+        count = 0
+        for price in await self.api.fetch_prices(list(products)):
+            product = products.get(price.get("productId"))
+            row = self._api_price_row(product, price, set_name) if product else None
+            if row and await self._save_product(row):
+                count += 1
+        return count
+    
+    def _api_price_row(self, product: Dict[str, Any], price: Dict[str, Any], set_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Product dict (as _parse_product_card returns) from an API product and price entry
+        
+        Uses the market price, or the mid price for products without recent
+        sales. Sub-types other than Normal (Holofoil, Reverse Holofoil, 1st
+        Edition) are priced separately, so they are kept apart by name.
+        """
+        value = price.get("marketPrice") or price.get("midPrice")
+        if not value:
+            return None
+        
+        amount = Decimal(str(value))
+        if not config.MIN_PRICE_USD <= amount <= config.MAX_PRICE_USD:
+            return None
+        
+        product_name = product.get("name") or product.get("cleanName") or ""
+        sub_type = price.get("subTypeName")
+        if sub_type and sub_type != "Normal":
+            product_name = f"{product_name} ({sub_type})"
+        
+        card_number = ""
+        for field in product.get("extendedData") or []:
+            if field.get("name") == "Number":
+                card_number = field.get("value") or ""
+                break
+        
+        return {
+            "product_name": product_name,
+            "set_name": set_name,
+            "card_number": card_number,
+            "price": amount,
+            "condition": "NM",  # Market prices are for Near Mint
+            "url": product.get("url") or "",
+        }
     
     async def scrape_set(self, set_name: str) -> int:
         """Scrape cards from a specific Pokemon set"""
@@ -125,6 +277,8 @@ class TCGPlayerScraper:
                 
             except Exception as e:
                 logger.error(f"Error scraping page {page} of {set_name}: {e}")
+                # The rest of the set is missing
+                self.failed_sets += 1
                 break
         
         return count
@@ -149,11 +303,30 @@ class TCGPlayerScraper:
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         }
         
+        rate_limiter = get_host_limiter(
+            url,
+            initial_rate=config.REQUESTS_PER_MINUTE / 60,
+            max_rate=config.REQUESTS_PER_MINUTE_MAX / 60,
+        )
+        breaker = get_breaker(url, source="TCGPlayer")
+        breaker.before_request()
+        
         try:
-            response = await self.http_client.get(url, headers=headers, params=params)
+            with self.metrics.timer("rate_limit"):
+                await rate_limiter.acquire()
+            started = time.monotonic()
+            try:
+                response = await self.http_client.get(url, headers=headers, params=params)
+            except httpx.RequestError as e:
+                self.metrics.observe_fetch(time.monotonic() - started)
+                breaker.on_error(e)
+                raise
+            self.metrics.observe_fetch(time.monotonic() - started, response.status_code, response.num_bytes_downloaded)
+            rate_limiter.on_response(response.status_code, response.headers.get("Retry-After"))
+            breaker.on_response(response.status_code)
             response.raise_for_status()
             
-            return self._parse_search_results(response.text, set_name)
+            return await run_parse(self, "_parse_search_results", response.text, set_name)
             
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
@@ -166,15 +339,15 @@ class TCGPlayerScraper:
     
     def _parse_search_results(self, html: str, set_name: str) -> List[Dict[str, Any]]:
         """Parse search results page"""
-        soup = BeautifulSoup(html, "html.parser")
+        soup = parse_document(html, features="html.parser")
         products = []
         
         # Find product cards (TCGPlayer uses various classes)
-        product_cards = soup.find_all("div", class_=re.compile(r"search-result"))
+        product_cards = soup.select('div[class*="search-result"]')
         
         if not product_cards:
             # Try alternative selector
-            product_cards = soup.find_all("div", class_=re.compile(r"product-card"))
+            product_cards = soup.select('div[class*="product-card"]')
         
         for card in product_cards:
             try:
@@ -191,9 +364,9 @@ class TCGPlayerScraper:
         """Parse individual product card"""
         try:
             # Product name
-            name_elem = card_soup.find("a", class_=re.compile(r"product-name|card-name"))
+            name_elem = card_soup.select_one('a[class*="product-name"], a[class*="card-name"]')
             if not name_elem:
-                name_elem = card_soup.find("span", class_=re.compile(r"product-name"))
+                name_elem = card_soup.select_one('span[class*="product-name"]')
             
             if not name_elem:
                 return None
@@ -201,7 +374,7 @@ class TCGPlayerScraper:
             product_name = name_elem.get_text(strip=True)
             
             # Price (TCGPlayer shows multiple prices - get the lowest)
-            price_elem = card_soup.find("span", class_=re.compile(r"product-price|market-price"))
+            price_elem = card_soup.select_one('span[class*="product-price"], span[class*="market-price"]')
             if not price_elem:
                 return None
             
@@ -211,7 +384,7 @@ class TCGPlayerScraper:
                 return None
             
             # Product URL
-            link_elem = card_soup.find("a", href=re.compile(r"/product/"))
+            link_elem = card_soup.select_one('a[href*="/product/"]')
             url = link_elem["href"] if link_elem else ""
             if url and not url.startswith("http"):
                 url = config.BASE_URL + url
@@ -266,25 +439,21 @@ class TCGPlayerScraper:
     async def _save_product(self, product: Dict[str, Any]) -> bool:
         """Save product to database"""
         try:
-            raw_price = RawPrice(
-                card_name=product["product_name"],
-                card_set=product["set_name"],
-                card_number=product["card_number"],
-                condition=product["condition"],
-                language="EN",  # TCGPlayer is primarily English
-                price=product["price"],
-                currency="USD",  # TCGPlayer uses USD
-                source="TCGPlayer",
-                source_url=product["url"],
-                seller_name="",  # Market price (aggregate)
-                seller_rating=None,
-                stock_quantity=1,
-                country="US",  # TCGPlayer is US-based
-                scraped_at=datetime.utcnow(),
-            )
-            
-            self.session.add(raw_price)
-            await self.session.flush()
+            await self.pipeline.put({
+                "card_name": product["product_name"],
+                "card_set": product["set_name"],
+                "card_number": product["card_number"],
+                "condition": product["condition"],
+                "language": "EN",  # TCGPlayer is primarily English
+                "price": product["price"],
+                "currency": "USD",  # TCGPlayer uses USD
+                "source": "TCGPlayer",
+                "source_url": product["url"],
+                "seller_name": "",  # Market price (aggregate)
+                "seller_rating": None,
+                "stock_quantity": 1,
+                "scraped_at": datetime.utcnow(),
+            })
             
             return True
             
@@ -292,24 +461,46 @@ class TCGPlayerScraper:
             logger.error(f"Error saving product: {e}")
             return False
     
-    async def _log_scrape(self, source: str, items_scraped: int, success: bool):
-        """Log scrape run"""
+    async def _log_scrape(
+        self,
+        source: str,
+        items_scraped: int,
+        status: str,
+        errors_count: int = 0,
+        error_message: Optional[str] = None,
+        timings: Optional[Dict[str, Any]] = None,
+    ):
+        """Log scrape run (status: success, partial or failed)"""
         try:
             log = ScrapeLog(
                 source=source,
-                status="success" if success else "failed",
+                status=status,
                 items_scraped=items_scraped,
-                error_message=None if success else "Check logs",
-                scraped_at=datetime.utcnow()
+                errors_count=errors_count,
+                error_message=error_message,
+                completed_at=datetime.utcnow(),
+                circuit_state=circuit_breaker_states("TCGPlayer"),
+                timings=timings,
             )
-            self.session.add(log)
-            await self.session.commit()
+            if self.session is not None:
+                self.session.add(log)
+                await self.session.commit()
+            else:
+                # Long-running callers don't hold a session; borrow one from the pool
+                async with AsyncSessionLocal() as session:
+                    session.add(log)
+                    await session.commit()
         except Exception as e:
             logger.error(f"Error logging scrape: {e}")
     
     async def close(self):
-        """Close HTTP client"""
-        await self.http_client.aclose()
+        """Write queued rows and close HTTP clients"""
+        try:
+            await self.pipeline.close()
+        finally:
+            await self.http_client.aclose()
+            if self.api:
+                await self.api.close()
 
 
 async def run_tcgplayer_scraper(session: AsyncSession) -> int:
@@ -2,8 +2,18 @@
 Scraper Utilities
 """
 
-from app.utils.rate_limiter import RateLimiter
+from app.utils.rate_limiter import AdaptiveRateLimiter, RateLimiter, get_host_limiter
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, get_breaker
 from app.utils.retry import retry_with_backoff
 from app.utils.proxy_manager import proxy_manager
 
-__all__ = ["RateLimiter", "retry_with_backoff", "proxy_manager"]
+__all__ = [
+    "RateLimiter",
+    "AdaptiveRateLimiter",
+    "get_host_limiter",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "get_breaker",
+    "retry_with_backoff",
+    "proxy_manager",
+]
@@ -0,0 +1,308 @@
+"""
+Bulk Writer for raw_prices
+Buffers scraped rows and streams them to Postgres with COPY
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.database import engine
+from app.utils.scrape_metrics import get_scrape_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class RawPriceBulkWriter:
+    """
+    Bulk writer for the raw_prices table
+
+    Rows are plain dicts keyed by RawPrice column names. They are buffered
+    and written in batches with asyncpg's copy_records_to_table, which is
+    one round-trip per batch instead of one INSERT per row.
+
+    Rows with a listing_key are upserted instead of appended: the batch is
+    COPYed into a temporary table and merged with one INSERT ... ON
+    CONFLICT (source, listing_key), which only touches an existing row when
+    its price or stock changed or it was seen later than recorded.
+
+    Keyed listings a scraper saw but did not re-send (unchanged since the
+    last fetch) are marked seen instead, which only moves last_seen_at of
+    their existing rows forward.
+    """
+
+    TABLE = "raw_prices"
+    STAGING_TABLE = "raw_prices_incoming"
+    COLUMNS = (
+        "card_name",
+        "card_set",
+        "card_number",
+        "condition",
+        "language",
+        "price",
+        "currency",
+        "source",
+        "source_url",
+        "seller_name",
+        "seller_rating",
+        "stock_quantity",
+        "listing_key",
+        "scraped_at",
+        "last_seen_at",
+    )
+
+    # Latest sighting per key wins; a batch must not touch a row twice
+    UPSERT_SQL = f"""
+        INSERT INTO {TABLE} ({", ".join(COLUMNS)})
+        SELECT DISTINCT ON (source, listing_key) {", ".join(COLUMNS)}
+        FROM {STAGING_TABLE}
+        ORDER BY source, listing_key, last_seen_at DESC
+        ON CONFLICT (source, listing_key) DO UPDATE SET
+            price = EXCLUDED.price,
+            currency = EXCLUDED.currency,
+            stock_quantity = EXCLUDED.stock_quantity,
+            last_seen_at = GREATEST({TABLE}.last_seen_at, EXCLUDED.last_seen_at)
+        WHERE ({TABLE}.price, {TABLE}.currency, {TABLE}.stock_quantity)
+                IS DISTINCT FROM (EXCLUDED.price, EXCLUDED.currency, EXCLUDED.stock_quantity)
+            OR {TABLE}.last_seen_at IS NULL
+            OR {TABLE}.last_seen_at < EXCLUDED.last_seen_at
+    """
+
+    SEEN_SQL = f"""
+        UPDATE {TABLE} SET last_seen_at = seen.last_seen_at
+        FROM unnest($1::varchar[], $2::varchar[], $3::timestamptz[])
+            AS seen (source, listing_key, last_seen_at)
+        WHERE {TABLE}.source = seen.source
+            AND {TABLE}.listing_key = seen.listing_key
+            AND ({TABLE}.last_seen_at IS NULL OR {TABLE}.last_seen_at < seen.last_seen_at)
+    """
+
+    def __init__(self, batch_size: Optional[int] = None, upsert: Optional[bool] = None):
+        """
+        Initialize bulk writer
+
+        Args:
+            batch_size: Rows per COPY (defaults to settings.BATCH_SIZE)
+            upsert: Upsert rows with a listing_key (defaults to
+                settings.LISTING_UPSERT_ENABLED); when off, keys are dropped
+                and every row is appended
+        """
+        self.batch_size = batch_size or settings.BATCH_SIZE
+        self.upsert = settings.LISTING_UPSERT_ENABLED if upsert is None else upsert
+        self.total_written = 0
+        self.total_upserted = 0  # Keyed rows inserted or changed (unchanged ones aren't touched)
+        self.total_seen = 0  # Existing keyed rows whose last_seen_at was moved forward
+        self._buffer: List[Tuple[Any, ...]] = []
+        self._seen: Dict[Tuple[str, str], datetime] = {}
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "RawPriceBulkWriter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.flush()
+
+    async def add(self, row: Dict[str, Any]) -> None:
+        """
+        Buffer a row, flushing when the batch is full
+
+        Args:
+            row: Dict keyed by raw_prices column names
+        """
+        self._buffer.append(self._to_record(row))
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+
+    async def add_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """
+        Buffer several rows
+        """
+        for row in rows:
+            await self.add(row)
+
+    async def mark_seen(self, source: str, listing_keys: Iterable[Any], seen_at: Optional[datetime] = None) -> None:
+        """
+        Buffer a sighting of keyed rows that were not re-sent, flushing when the batch is full
+
+        Args:
+            source: Row source (as in raw_prices.source)
+            listing_keys: listing_key of each sighted row
+            seen_at: Time of the sighting (defaults to now)
+        """
+        if not self.upsert:
+            return  # Rows carry no keys to mark
+
+        seen_at = seen_at or datetime.now(timezone.utc)
+        for key in listing_keys:
+            if key is not None:
+                self._seen[(source, str(key))] = seen_at
+
+        if len(self._seen) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write all buffered rows and sightings
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            The database error; the batch is put back into the buffer first,
+            so the next flush() retries it
+        """
+        if not self._buffer and not self._seen:
+            return 0
+
+        # Swap the buffers out first so concurrent add() calls keep buffering
+        records, self._buffer = self._buffer, []
+        seen, self._seen = self._seen, {}
+
+        key_index = self.COLUMNS.index("listing_key")
+        keyed = [record for record in records if record[key_index] is not None]
+        appended = [record for record in records if record[key_index] is None]
+
+        upserted = marked = 0
+        try:
+            async with self._lock:
+                started = time.perf_counter()
+                async with engine.begin() as conn:
+                    raw_conn = await conn.get_raw_connection()
+                    driver_conn = raw_conn.driver_connection
+                    if appended:
+                        await driver_conn.copy_records_to_table(
+                            self.TABLE,
+                            records=appended,
+                            columns=self.COLUMNS,
+                        )
+                    if keyed:
+                        upserted = await self._upsert(driver_conn, keyed)
+                    if seen:
+                        marked = await self._mark_seen(driver_conn, seen)
+                elapsed = time.perf_counter() - started
+        except BaseException:
+            # Nothing was committed: put the batch back ahead of rows buffered
+            # meanwhile (newer sightings of the same key win)
+            self._buffer[:0] = records
+            for key, seen_at in seen.items():
+                self._seen.setdefault(key, seen_at)
+            raise
+
+        if records:
+            self._record_metrics(records, elapsed)
+        self.total_upserted += upserted
+        self.total_seen += marked
+        self.total_written += len(records)
+        logger.debug(f"COPY {len(appended)} rows into {self.TABLE}, upserted {len(keyed)} keyed rows, {len(seen)} sightings")
+        return len(records)
+
+    @property
+    def buffered(self) -> int:
+        """Rows and sightings waiting for the next flush()"""
+        return len(self._buffer) + len(self._seen)
+
+    def discard(self) -> int:
+        """
+        Drop buffered rows and sightings (a batch that cannot be written)
+
+        Returns:
+            Number of rows dropped
+        """
+        dropped = len(self._buffer)
+        self._buffer = []
+        self._seen = {}
+        return dropped
+
+    async def _upsert(self, driver_conn: Any, records: List[Tuple[Any, ...]]) -> int:
+        """
+        Merge keyed rows on (source, listing_key) via a staging table
+
+        Returns:
+            Rows inserted or updated
+        """
+        # Dropped with the transaction, so concurrent connections never clash
+        await driver_conn.execute(
+            f"CREATE TEMP TABLE {self.STAGING_TABLE} ON COMMIT DROP AS "
+            f"SELECT {', '.join(self.COLUMNS)} FROM {self.TABLE} WITH NO DATA"
+        )
+        await driver_conn.copy_records_to_table(
+            self.STAGING_TABLE,
+            records=records,
+            columns=self.COLUMNS,
+        )
+        status = await driver_conn.execute(self.UPSERT_SQL)  # "INSERT 0 <rows>"
+        return int(status.split()[-1])
+
+    async def _mark_seen(self, driver_conn: Any, seen: Dict[Tuple[str, str], datetime]) -> int:
+        """
+        Move last_seen_at of sighted rows forward in one UPDATE
+
+        Returns:
+            Rows updated
+        """
+        keys = list(seen)
+        status = await driver_conn.execute(
+            self.SEEN_SQL,
+            [source for source, _ in keys],
+            [listing_key for _, listing_key in keys],
+            list(seen.values()),
+        )  # "UPDATE <rows>"
+        return int(status.split()[-1])
+
+    def _record_metrics(self, records: List[Tuple[Any, ...]], seconds: float) -> None:
+        """
+        Attribute a batch's write time and rows to their sources
+        """
+        # Row sources like "eBay-DE" count towards their scraper ("eBay")
+        source_index = self.COLUMNS.index("source")
+        for source, rows in Counter(record[source_index].split("-")[0] for record in records).items():
+            metrics = get_scrape_metrics(source)
+            metrics.add_time("write", seconds * rows / len(records))
+            metrics.count("rows_written", rows)
+
+    def _to_record(self, row: Dict[str, Any]) -> Tuple[Any, ...]:
+        """
+        Convert a row dict to a tuple in COLUMNS order with COPY-safe types
+        """
+        price = row["price"]
+        if not isinstance(price, Decimal):
+            price = Decimal(str(price))
+
+        seller_rating = row.get("seller_rating")
+        if seller_rating is not None and not isinstance(seller_rating, Decimal):
+            seller_rating = Decimal(str(seller_rating))
+
+        # raw_prices timestamps are timestamptz; scrapers use naive UTC
+        scraped_at = row.get("scraped_at") or datetime.utcnow()
+        if scraped_at.tzinfo is None:
+            scraped_at = scraped_at.replace(tzinfo=timezone.utc)
+
+        # Appended rows carry no key, or repeat sightings would hit the unique index
+        listing_key = row.get("listing_key") if self.upsert else None
+        if listing_key:
+            listing_key = str(listing_key)
+        else:
+            listing_key = None
+
+        return (
+            row["card_name"],
+            row.get("card_set"),
+            row.get("card_number"),
+            row.get("condition"),
+            row.get("language") or "EN",
+            price,
+            row.get("currency") or "EUR",
+            row["source"],
+            row.get("source_url"),
+            row.get("seller_name"),
+            seller_rating,
+            row.get("stock_quantity"),
+            listing_key,
+            scraped_at,
+            scraped_at,
+        )
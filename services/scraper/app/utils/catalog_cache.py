@@ -0,0 +1,150 @@
+"""
+Catalog Cache
+Keeps slow-changing catalog metadata in Postgres between runs
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import AsyncSessionLocal
+from app.models.catalog_cache import CatalogCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogCache:
+    """
+    Catalog metadata of one source (expansion lists, blueprints per expansion)
+
+    An entry is served from the cache while it is younger than its TTL and,
+    if the caller passes a version (e.g. a hash of the parent expansion
+    record), while that version still matches; otherwise it is fetched
+    again and stored. Keys are prefixed with a schema version, so bumping it
+    invalidates every entry of the source at once.
+
+    Empty payloads are never cached: an expansion announced before its
+    cards are listed has no blueprints yet and is checked again every run.
+    """
+
+    def __init__(self, source: str, schema_version: int = 1):
+        """
+        Initialize catalog cache
+
+        Args:
+            source: Source name (entries are stored per source)
+            schema_version: Bump to ignore everything cached before
+        """
+        self.source = source
+        self.prefix = f"v{schema_version}:"
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+
+        # Counters for monitoring
+        self.hits = 0
+        self.refreshes = 0
+
+    async def load(self, keys: Optional[List[str]] = None) -> None:
+        """
+        Load stored entries (all of this schema version, or only the given keys)
+        """
+        query = select(CatalogCacheEntry).where(CatalogCacheEntry.source == self.source)
+        if keys is None:
+            query = query.where(CatalogCacheEntry.cache_key.startswith(self.prefix))
+        else:
+            query = query.where(CatalogCacheEntry.cache_key.in_([self.prefix + key for key in keys]))
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(query)
+            for entry in result.scalars():
+                self._entries[entry.cache_key[len(self.prefix):]] = {
+                    "payload": entry.payload,
+                    "version": entry.version,
+                    "fetched_at": entry.fetched_at,
+                }
+
+        if keys is None:
+            self._loaded = True
+            logger.info(f"Loaded {len(self._entries)} cached {self.source} catalog entries")
+
+    def is_fresh(self, key: str, ttl_hours: float, version: Optional[str] = None) -> bool:
+        """
+        Check whether an entry is within its TTL and of the expected version
+        """
+        entry = self._entries.get(key)
+        if not entry or not entry["payload"]:
+            return False
+
+        if version is not None and entry["version"] != version:
+            return False
+        return datetime.now(timezone.utc) - entry["fetched_at"] < timedelta(hours=ttl_hours)
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[List[Any]]],
+        ttl_hours: float,
+        version: Optional[str] = None,
+    ) -> List[Any]:
+        """
+        Cached payload for a key, fetched and stored if missing or stale
+
+        Args:
+            key: Entry key, e.g. "expansions" or "blueprints:1234"
+            fetch: Coroutine function returning the fresh payload
+            ttl_hours: Max age of a cached entry
+            version: Version the entry must have been fetched for (None = any)
+
+        Returns:
+            Cached or freshly fetched payload
+        """
+        if not self._loaded:
+            await self.load()
+
+        if not self.is_fresh(key, ttl_hours, version) and key in self._entries:
+            # Another worker may have refreshed it since we loaded
+            await self.load([key])
+
+        if self.is_fresh(key, ttl_hours, version):
+            self.hits += 1
+            return self._entries[key]["payload"]
+
+        payload = await fetch()
+        if payload:
+            await self.store(key, payload, version)
+        self.refreshes += 1
+        return payload
+
+    async def store(self, key: str, payload: List[Any], version: Optional[str] = None) -> None:
+        """
+        Upsert an entry
+        """
+        now = datetime.now(timezone.utc)
+        self._entries[key] = {"payload": payload, "version": version, "fetched_at": now}
+
+        stmt = insert(CatalogCacheEntry).values(
+            source=self.source,
+            cache_key=self.prefix + key,
+            payload=payload,
+            version=version,
+            item_count=len(payload),
+            fetched_at=now,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CatalogCacheEntry.source, CatalogCacheEntry.cache_key],
+            set_={
+                "payload": stmt.excluded.payload,
+                "version": stmt.excluded.version,
+                "item_count": stmt.excluded.item_count,
+                "fetched_at": stmt.excluded.fetched_at,
+            },
+        )
+
+        async with AsyncSessionLocal() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+        logger.debug(f"Cached {self.source} {key} ({len(payload)} items)")
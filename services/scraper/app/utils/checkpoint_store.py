@@ -0,0 +1,136 @@
+"""
+Scrape Checkpoint Store
+Records per-run progress so long scrapes can resume after a crash
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import AsyncSessionLocal
+from app.models.scrape_checkpoint import ScrapeCheckpoint
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeCheckpointStore:
+    """
+    Checkpoint of one source's current run
+
+    A unit of work (a CardTrader expansion, a CardMarket set) is marked done
+    only after its rows have been written, so a resumed run can skip every
+    completed unit without losing data.
+    """
+
+    def __init__(self, source: str):
+        """
+        Initialize checkpoint store
+
+        Args:
+            source: Source name (one checkpoint row per source)
+        """
+        self.source = source
+        self.run_id: Optional[str] = None
+        self.completed: Set[str] = set()
+        self.items_scraped = 0
+        self.started_at: Optional[datetime] = None
+        self.last_completed_key: Optional[str] = None
+        self.last_blueprint_id: Optional[int] = None
+        self._lock = asyncio.Lock()  # Keep concurrent saves in order
+
+    async def start(self, resume: bool = False) -> None:
+        """
+        Begin a run, continuing the last unfinished one if resume is set
+
+        Args:
+            resume: Pick up the previous run's progress instead of starting over
+        """
+        previous = None
+        if resume:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(ScrapeCheckpoint).where(ScrapeCheckpoint.source == self.source)
+                )
+                previous = result.scalar_one_or_none()
+
+        if previous and previous.status != "completed":
+            self.run_id = previous.run_id
+            self.completed = set(previous.completed_keys or [])
+            self.items_scraped = previous.items_scraped or 0
+            self.started_at = previous.started_at
+            self.last_completed_key = previous.last_completed_key
+            self.last_blueprint_id = previous.last_blueprint_id
+            logger.info(
+                f"⏩ Resuming {self.source} run {self.run_id}: "
+                f"{len(self.completed)} done, last was {self.last_completed_key}"
+            )
+        else:
+            if resume:
+                logger.info(f"No unfinished {self.source} run to resume, starting fresh")
+            self.run_id = str(uuid.uuid4())
+            self.started_at = datetime.now(timezone.utc)
+
+        await self._save("running")
+
+    def is_done(self, key: str) -> bool:
+        """
+        Check whether a unit of work was completed earlier in this run
+        """
+        return str(key) in self.completed
+
+    async def mark_done(self, key: str, items: int = 0, last_blueprint_id: Optional[int] = None) -> None:
+        """
+        Record a completed unit of work (call after its rows are written)
+
+        Args:
+            key: Expansion ID, set name, ...
+            items: Rows scraped for this unit
+            last_blueprint_id: Last blueprint processed, for CardTrader
+        """
+        self.completed.add(str(key))
+        self.items_scraped += items
+        self.last_completed_key = str(key)
+        if last_blueprint_id is not None:
+            self.last_blueprint_id = last_blueprint_id
+
+        await self._save("running")
+
+    async def finish(self, status: str = "completed") -> None:
+        """
+        Close the run; a "failed" run stays resumable
+        """
+        await self._save(status)
+
+    async def _save(self, status: str) -> None:
+        """Upsert the checkpoint row"""
+        async with self._lock:
+            await self._upsert(status)
+
+    async def _upsert(self, status: str) -> None:
+        """Write the in-memory state (caller holds the lock)"""
+        values = {
+            "source": self.source,
+            "run_id": self.run_id,
+            "status": status,
+            "completed_keys": sorted(self.completed),
+            "last_completed_key": self.last_completed_key,
+            "last_blueprint_id": self.last_blueprint_id,
+            "items_scraped": self.items_scraped,
+            "started_at": self.started_at,
+            "updated_at": datetime.now(timezone.utc),
+        }
+
+        stmt = insert(ScrapeCheckpoint).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ScrapeCheckpoint.source],
+            set_={key: stmt.excluded[key] for key in values if key != "source"},
+        )
+
+        async with AsyncSessionLocal() as session:
+            await session.execute(stmt)
+            await session.commit()
@@ -0,0 +1,265 @@
+"""
+Circuit Breaker
+Fails fast on hosts (or proxies) that keep blocking or timing out
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Responses that mean the host is blocking us or down (429 is left to the rate limiter)
+FAILURE_STATUS_CODES = (403,)
+
+# Responses that say nothing about whether the host has recovered
+THROTTLED_STATUS_CODES = (429,)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit open for {name}, next probe in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one host, or one host through one proxy
+
+    Closed: requests go through and consecutive failures (403, 5xx,
+    timeouts, connection errors) are counted. After failure_threshold of
+    them the circuit opens: requests fail immediately with
+    CircuitOpenError instead of waiting through retries. Once
+    recovery_timeout has passed it goes half-open and lets a few probe
+    requests through; a successful probe closes it, a failed one opens it
+    again for twice as long (up to max_recovery_timeout). A throttled
+    (429) probe does neither: the circuit stays half-open and probes again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        source: Optional[str] = None,
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: Optional[float] = None,
+        max_recovery_timeout: Optional[float] = None,
+        half_open_max_calls: Optional[int] = None,
+    ):
+        """
+        Initialize circuit breaker
+
+        Args:
+            name: Host (and proxy) this breaker guards
+            source: Scraper source using the host, for reporting
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds open before the first probe
+            max_recovery_timeout: Cap for the doubled timeout after failed probes
+            half_open_max_calls: Probe requests allowed at once while half-open
+        """
+        self.name = name
+        self.source = source
+        self.failure_threshold = failure_threshold or settings.CIRCUIT_FAILURE_THRESHOLD
+        self.base_recovery_timeout = recovery_timeout or settings.CIRCUIT_RECOVERY_SECONDS
+        self.max_recovery_timeout = max_recovery_timeout or settings.CIRCUIT_MAX_RECOVERY_SECONDS
+        self.half_open_max_calls = half_open_max_calls or settings.CIRCUIT_HALF_OPEN_PROBES
+
+        self.state = CLOSED
+        self.recovery_timeout = self.base_recovery_timeout
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+
+        # Counters for monitoring
+        self.failures = 0
+        self.rejected = 0
+        self.trips = 0
+
+        self._opened_at = 0.0
+        self._opened_at_wall: Optional[datetime] = None
+        self._probes_in_flight = 0
+
+    def before_request(self) -> None:
+        """
+        Check the circuit before sending a request
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or half-open with all
+                probe slots taken)
+        """
+        if self.state == CLOSED:
+            return
+
+        now = time.monotonic()
+        retry_in = self._opened_at + self.recovery_timeout - now
+
+        if self.state == OPEN:
+            if retry_in > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, retry_in)
+            self.state = HALF_OPEN
+            self._probes_in_flight = 0
+            logger.info(f"🔌 {self.name} half-open, probing")
+
+        # A probe that never reported back (cancelled) must not block the circuit forever
+        if retry_in < -self.recovery_timeout:
+            self._probes_in_flight = 0
+            self._opened_at = now - self.recovery_timeout
+
+        if self._probes_in_flight >= self.half_open_max_calls:
+            self.rejected += 1
+            raise CircuitOpenError(self.name, 0)
+        self._probes_in_flight += 1
+
+    def on_response(self, status_code: int) -> None:
+        """
+        Feed a response status back into the breaker
+        """
+        if status_code in FAILURE_STATUS_CODES or status_code >= 500:
+            self.record_failure(f"HTTP {status_code}")
+        elif status_code in THROTTLED_STATUS_CODES:
+            self.record_throttled()
+        else:
+            self.record_success()
+
+    def on_error(self, error: Exception) -> None:
+        """
+        Feed a request error (timeout, connection failure) back into the breaker
+        """
+        self.record_failure(f"{error.__class__.__name__}: {error}"[:200])
+
+    def record_success(self) -> None:
+        """
+        A request went through: reset the failure count, close after a probe
+        """
+        self.consecutive_failures = 0
+        if self.state != CLOSED:
+            logger.info(f"🔌 {self.name} recovered, circuit closed")
+            self.state = CLOSED
+            self.recovery_timeout = self.base_recovery_timeout
+            self._probes_in_flight = 0
+
+    def record_throttled(self) -> None:
+        """
+        A request was throttled: keep the failure count and state, free a probe slot
+        """
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record_failure(self, reason: str) -> None:
+        """
+        A request failed: open the circuit at the threshold or on a failed probe
+        """
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = reason
+
+        if self.state == HALF_OPEN:
+            self.recovery_timeout = min(self.recovery_timeout * 2, self.max_recovery_timeout)
+            self._open()
+        elif self.state == CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.trips += 1
+        self._opened_at = time.monotonic()
+        self._opened_at_wall = datetime.now(timezone.utc)
+        self._probes_in_flight = 0
+        logger.warning(
+            f"⛔ {self.name} circuit open after {self.consecutive_failures} failures "
+            f"({self.last_error}), failing fast for {self.recovery_timeout:.0f}s"
+        )
+
+    @property
+    def is_open(self) -> bool:
+        """True while requests would be rejected without a probe"""
+        return self.state == OPEN and time.monotonic() < self._opened_at + self.recovery_timeout
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current state for monitoring and ScrapeLog
+        """
+        snapshot: Dict[str, Any] = {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "trips": self.trips,
+            "last_error": self.last_error,
+        }
+        if self.state != CLOSED and self._opened_at_wall:
+            snapshot["opened_at"] = self._opened_at_wall.isoformat()
+            snapshot["next_probe_at"] = (self._opened_at_wall + timedelta(seconds=self.recovery_timeout)).isoformat()
+        return snapshot
+
+
+# One breaker per host (and proxy), shared by every scraper and worker that talks to it
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def breaker_key(url: str, proxy: Optional[str] = None) -> str:
+    """
+    Registry key for a URL's host, through a proxy if one is used
+    """
+    host = urlsplit(url).hostname or url
+    if proxy:
+        proxy_host = urlsplit(proxy).hostname or proxy
+        return f"{host} via {proxy_host}"
+    return host
+
+
+def get_breaker(url: str, proxy: Optional[str] = None, source: Optional[str] = None) -> CircuitBreaker:
+    """
+    Get the shared circuit breaker for a URL's host (and proxy), creating it on first use
+
+    Args:
+        url: Any URL (or bare host name) on the host
+        proxy: Proxy URL the requests go through, if any
+        source: Scraper source name, for reporting (first caller wins)
+    """
+    key = breaker_key(url, proxy)
+
+    breaker = _breakers.get(key)
+    if breaker is None:
+        breaker = _breakers[key] = CircuitBreaker(key, source=source)
+    return breaker
+
+
+def circuit_breaker_states(source: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    State of every breaker (or only those of one source)
+    """
+    return {
+        key: breaker.snapshot()
+        for key, breaker in _breakers.items()
+        if source is None or breaker.source == source
+    }
+
+
+def open_sources(sources: Optional[List[str]] = None) -> Set[str]:
+    """
+    Sources all of whose hosts currently have an open circuit
+
+    A source with at least one usable host (e.g. one healthy eBay site)
+    is not counted as open.
+    """
+    by_source: Dict[str, List[CircuitBreaker]] = {}
+    for breaker in _breakers.values():
+        if breaker.source and (sources is None or breaker.source in sources):
+            by_source.setdefault(breaker.source, []).append(breaker)
+
+    return {
+        source
+        for source, breakers in by_source.items()
+        if all(breaker.is_open for breaker in breakers)
+    }
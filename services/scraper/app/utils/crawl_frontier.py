@@ -0,0 +1,143 @@
+"""
+Crawl Frontier
+De-duplicated, budgeted queue of pages to fetch during a crawl
+"""
+
+import asyncio
+import logging
+from typing import Dict, NamedTuple, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+
+class FrontierItem(NamedTuple):
+    """A page waiting to be fetched"""
+    url: str
+    key: str  # Group the page belongs to (e.g. a set name)
+    page: int  # 1-based position within its group
+
+
+def canonicalize_url(url: str, default_params: Optional[Dict[str, str]] = None) -> str:
+    """
+    Normalize a URL for de-duplication (lowercase host, sorted query, no fragment)
+
+    Args:
+        url: Absolute URL
+        default_params: Query parameters dropped when they have their default
+            value, e.g. {"site": "1"} so page 1 matches the bare set URL
+    """
+    parts = urlsplit(url)
+    params = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not default_params or default_params.get(name) != value
+    ]
+    query = urlencode(sorted(params))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+
+
+class CrawlFrontier:
+    """
+    Queue of pages to crawl, grouped by key
+
+    Every URL is queued at most once per run. The whole run is bounded by a
+    page budget, and each key (set) by its own page cap. The frontier also
+    tracks outstanding pages per key, so callers know when a key has been
+    fully crawled, and which keys were cut short (by the run budget or a
+    failed page).
+    """
+
+    def __init__(self, budget: int, max_pages_per_key: int = 0, default_params: Optional[Dict[str, str]] = None):
+        """
+        Initialize crawl frontier
+
+        Args:
+            budget: Max pages queued in this run
+            max_pages_per_key: Max pages per key (0 = no limit)
+            default_params: Query parameters ignored at their default value
+                when de-duplicating (see canonicalize_url)
+        """
+        self.budget = budget
+        self.max_pages_per_key = max_pages_per_key
+        self.default_params = default_params
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+        self._seen: Set[str] = set()
+        self._pages_per_key: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+        self.incomplete: Set[str] = set()  # Keys cut short by the budget or an error
+        self.scheduled = 0
+
+    def add(self, url: str, key: str) -> bool:
+        """
+        Queue a page unless already seen or over budget
+
+        Args:
+            url: Absolute page URL
+            key: Group the page belongs to
+
+        Returns:
+            True if the page was queued
+        """
+        canonical = canonicalize_url(url, self.default_params)
+        if canonical in self._seen:
+            return False
+
+        pages = self._pages_per_key.get(key, 0)
+        if self.max_pages_per_key and pages >= self.max_pages_per_key:
+            return False
+
+        if self.scheduled >= self.budget:
+            if key not in self.incomplete:
+                logger.info(f"Crawl budget of {self.budget} pages reached, {key} is incomplete")
+            self.incomplete.add(key)
+            return False
+
+        self._seen.add(canonical)
+        self._pages_per_key[key] = pages + 1
+        self._pending[key] = self._pending.get(key, 0) + 1
+        self.scheduled += 1
+        self.queue.put_nowait(FrontierItem(url, key, pages + 1))
+        return True
+
+    async def get(self) -> FrontierItem:
+        """
+        Next page to fetch (waits while the frontier is empty)
+        """
+        return await self.queue.get()
+
+    def done(self, item: FrontierItem) -> bool:
+        """
+        Mark a page as processed (after its links were added)
+
+        Returns:
+            True if this was the last outstanding page of its key
+        """
+        self.queue.task_done()
+        self._pending[item.key] -= 1
+        return self._pending[item.key] == 0
+
+    def mark_incomplete(self, key: str) -> None:
+        """
+        Record that a page of the key could not be crawled
+        """
+        self.incomplete.add(key)
+
+    async def join(self) -> None:
+        """
+        Wait until every queued page has been processed
+        """
+        await self.queue.join()
+
+    def is_complete(self, key: str) -> bool:
+        """
+        True if every page of the key was crawled
+        """
+        return self._pending.get(key, 0) == 0 and key not in self.incomplete
+
+    def pages(self, key: Optional[str] = None) -> int:
+        """
+        Pages queued so far (for one key, or in total)
+        """
+        return self.scheduled if key is None else self._pages_per_key.get(key, 0)
@@ -8,6 +8,8 @@ import random
 import logging
 from typing import Optional
 
+from app.utils.scrape_metrics import get_scrape_metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,16 +18,18 @@ class DelayManager:
     Manages delays between requests with randomization
     """
     
-    def __init__(self, min_delay: float = 2.0, max_delay: float = 5.0):
+    def __init__(self, min_delay: float = 2.0, max_delay: float = 5.0, source: Optional[str] = None):
         """
         Initialize delay manager
         
         Args:
             min_delay: Minimum delay in seconds
             max_delay: Maximum delay in seconds
+            source: Source whose sleep time the delays count towards
         """
         self.min_delay = min_delay
         self.max_delay = max_delay
+        self.source = source
         logger.info(f"DelayManager initialized: {min_delay}s - {max_delay}s")
     
     async def wait(self, custom_delay: Optional[float] = None):
@@ -41,7 +45,13 @@ class DelayManager:
             delay = random.uniform(self.min_delay, self.max_delay)
         
         logger.debug(f"Waiting {delay:.2f}s before next request")
-        await asyncio.sleep(delay)
+        await self._sleep(delay)
+    
+    async def delay(self):
+        """
+        Wait for a randomized delay (alias of wait() used by the scrapers)
+        """
+        await self.wait()
     
     async def wait_random(self, min_override: Optional[float] = None, 
                           max_override: Optional[float] = None):
@@ -57,7 +67,7 @@ class DelayManager:
         
         delay = random.uniform(min_d, max_d)
         logger.debug(f"Random delay: {delay:.2f}s")
-        await asyncio.sleep(delay)
+        await self._sleep(delay)
     
     async def wait_exponential(self, attempt: int, base_delay: float = 1.0):
         """
@@ -69,4 +79,12 @@ class DelayManager:
         """
         delay = base_delay * (2 ** attempt)
         logger.debug(f"Exponential backoff: attempt {attempt}, delay {delay:.2f}s")
+        await self._sleep(delay)
+    
+    async def _sleep(self, delay: float):
+        """
+        Sleep, counting the time towards the source's sleep stage
+        """
         await asyncio.sleep(delay)
+        if self.source:
+            get_scrape_metrics(self.source).add_time("sleep", delay)
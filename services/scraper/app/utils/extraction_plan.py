@@ -0,0 +1,150 @@
+"""
+Extraction Plans
+Selector variants per field, resolved once per page instead of once per row
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.utils.html_parser import SelectolaxNode
+
+logger = logging.getLogger(__name__)
+
+
+def _within(row_selector: str, selector: str) -> str:
+    """
+    Scope a selector (or selector list) to descendants of the row selector
+    """
+    return ", ".join(f"{row_selector} {part.strip()}" for part in selector.split(","))
+
+
+class ExtractionPlan:
+    """
+    Row and field selectors of one page type, with fallbacks in priority order
+
+    Scrapers used to try every fallback selector for every field of every
+    row. A page has one layout, though, so the plan resolves the row
+    selector and each field's variant once per page: the first variant
+    (in priority order) that matches anywhere in the page's rows. Rows then
+    only query that variant, plus the lower-priority ones for the rows it
+    misses, which gives the same nodes as trying every variant per row.
+
+    With selectolax each field is fetched for all rows with a single
+    page-wide query (lexbor parses the selector on every call, so one query
+    per field beats one per field per row); with BeautifulSoup, whose
+    selectors are compiled once and cached, rows are queried one by one.
+    """
+
+    def __init__(self, rows: Sequence[str], fields: Dict[str, Sequence[str]]):
+        """
+        Initialize extraction plan
+
+        Args:
+            rows: Row selectors in priority order
+            fields: Selector variants per field in priority order (one
+                variant may itself be a selector list, "a.x, span.y")
+        """
+        self.rows = tuple(rows)
+        self.fields = {name: tuple(variants) for name, variants in fields.items()}
+
+    def extract(self, doc: Any) -> List[Tuple[Any, Dict[str, Any]]]:
+        """
+        Rows of a page with each field's node
+
+        Args:
+            doc: Parsed page (parse_document)
+
+        Returns:
+            [(row, {field: node or None})] in document order
+        """
+        row_selector, rows = self._select_rows(doc)
+        if not rows:
+            return []
+
+        if isinstance(doc, SelectolaxNode):
+            row_index = {row.key: i for i, row in enumerate(rows)}
+            columns = {
+                field: self._page_column(doc, row_selector, rows, row_index, variants)
+                for field, variants in self.fields.items()
+            }
+        else:
+            columns = {
+                field: self._row_column(doc, row_selector, rows, variants)
+                for field, variants in self.fields.items()
+            }
+
+        return [
+            (row, {field: column[i] for field, column in columns.items()})
+            for i, row in enumerate(rows)
+        ]
+
+    def extract_row(self, row: Any) -> Dict[str, Any]:
+        """
+        Field nodes of a single row, trying every variant (no page to learn from)
+        """
+        return {field: self._first_match(row, variants) for field, variants in self.fields.items()}
+
+    def _select_rows(self, doc: Any) -> Tuple[Optional[str], List[Any]]:
+        """First row selector with matches, and its rows"""
+        for selector in self.rows:
+            rows = doc.select(selector)
+            if rows:
+                return selector, rows
+        return None, []
+
+    def _page_column(
+        self,
+        doc: SelectolaxNode,
+        row_selector: str,
+        rows: List[SelectolaxNode],
+        row_index: Dict[int, int],
+        variants: Tuple[str, ...],
+    ) -> List[Any]:
+        """One field of every row, from one page-wide query per variant tried"""
+        column: List[Any] = [None] * len(rows)
+        for i, variant in enumerate(variants):
+            matches = doc.select(_within(row_selector, variant))
+            if not matches:
+                continue
+
+            for match in matches:
+                # The nearest enclosing row owns the match; its first one wins
+                row_key = match.closest_key(row_index)
+                if row_key is not None and column[row_index[row_key]] is None:
+                    column[row_index[row_key]] = match
+
+            return self._fill_misses(column, rows, variants[i + 1:])
+        return column
+
+    def _row_column(
+        self,
+        doc: Any,
+        row_selector: str,
+        rows: List[Any],
+        variants: Tuple[str, ...],
+    ) -> List[Any]:
+        """One field of every row, querying each row with the page's variant"""
+        for i, variant in enumerate(variants):
+            if doc.select_one(_within(row_selector, variant)) is None:
+                continue
+
+            column = [row.select_one(variant) for row in rows]
+            return self._fill_misses(column, rows, variants[i + 1:])
+        return [None] * len(rows)
+
+    def _fill_misses(self, column: List[Any], rows: List[Any], fallbacks: Tuple[str, ...]) -> List[Any]:
+        """Rows the page's variant missed fall back to the lower-priority ones"""
+        if fallbacks:
+            for i, node in enumerate(column):
+                if node is None:
+                    column[i] = self._first_match(rows[i], fallbacks)
+        return column
+
+    @staticmethod
+    def _first_match(row: Any, variants: Sequence[str]) -> Any:
+        """First variant's node within a row, or None"""
+        for variant in variants:
+            node = row.select_one(variant)
+            if node is not None:
+                return node
+        return None
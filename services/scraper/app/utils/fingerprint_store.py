@@ -0,0 +1,227 @@
+"""
+Blueprint Fingerprint Store
+Change detection for incremental CardTrader crawls
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import AsyncSessionLocal
+from app.models.blueprint_fingerprint import BlueprintFingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def listing_fingerprint(listing: Dict[str, Any]) -> str:
+    """
+    Hash the fields of a listing that end up in raw_prices
+
+    Args:
+        listing: CardTrader marketplace listing
+
+    Returns:
+        Short hex digest
+    """
+    properties = listing.get("properties_hash") or {}
+    payload = json.dumps(
+        [
+            listing.get("price_cents"),
+            listing.get("price_currency"),
+            listing.get("quantity"),
+            properties.get("condition"),
+            properties.get("pokemon_language"),
+        ],
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class BlueprintFingerprintStore:
+    """
+    Tracks the last-seen listing set of every CardTrader blueprint
+
+    Fingerprints are loaded once per run, compared in memory and written
+    back in batches with an upsert. Recorded fingerprints stay in memory
+    until flush(), which callers only run once the listings' rows are in
+    the database: a listing whose row was lost must not look unchanged
+    to the next run. Pending fingerprints are kept per unit of work, so
+    concurrent units flush or discard only their own.
+    """
+
+    def __init__(self, stable_after_hours: float, stable_recheck_hours: float, batch_size: int = 500):
+        """
+        Initialize fingerprint store
+
+        Args:
+            stable_after_hours: Unchanged for this long counts as stable
+            stable_recheck_hours: Minimum interval between fetches of a stable blueprint
+            batch_size: Fingerprints written per upsert
+        """
+        self.stable_after = timedelta(hours=stable_after_hours)
+        self.stable_recheck = timedelta(hours=stable_recheck_hours)
+        self.batch_size = batch_size
+        self._fingerprints: Dict[int, Dict[str, Any]] = {}
+        self._pending: Dict[Any, Dict[int, Dict[str, Any]]] = {}  # unit -> blueprint_id -> fingerprint
+
+    async def load(self, blueprint_ids: Optional[List[int]] = None) -> None:
+        """
+        Load stored fingerprints (all, or only the given blueprints)
+        """
+        query = select(BlueprintFingerprint)
+        if blueprint_ids is None:
+            # A new run: nothing recorded by an unfinished earlier one carries over
+            self._fingerprints = {}
+            self._pending = {}
+        else:
+            query = query.where(BlueprintFingerprint.blueprint_id.in_(blueprint_ids))
+            for blueprint_id in blueprint_ids:
+                self._fingerprints.pop(blueprint_id, None)
+        
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(query)
+            for fp in result.scalars():
+                self._fingerprints[fp.blueprint_id] = {
+                    "blueprint_id": fp.blueprint_id,
+                    "expansion_id": fp.expansion_id,
+                    "listings_hash": fp.listings_hash,
+                    "listing_hashes": fp.listing_hashes or {},
+                    "listing_count": fp.listing_count,
+                    "unchanged_runs": fp.unchanged_runs or 0,
+                    "last_seen_at": fp.last_seen_at,
+                    "last_changed_at": fp.last_changed_at,
+                }
+
+        logger.info(f"Loaded {len(self._fingerprints)} blueprint fingerprints")
+
+    def should_skip(self, blueprint_id: int) -> bool:
+        """
+        Check whether a stable blueprint was fetched recently enough to skip
+        """
+        fp = self._fingerprints.get(blueprint_id)
+        if not fp:
+            return False
+
+        now = datetime.now(timezone.utc)
+        is_stable = now - fp["last_changed_at"] >= self.stable_after
+        return is_stable and now - fp["last_seen_at"] < self.stable_recheck
+
+    def fingerprint(self, listing: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Key and content hash of a listing
+        """
+        return self._listing_key(listing), listing_fingerprint(listing)
+
+    def is_changed(self, blueprint_id: int, key: str, digest: str) -> bool:
+        """
+        Check whether a listing (by key and hash) is new or changed since the last fetch
+        """
+        previous = (self._fingerprints.get(blueprint_id) or {}).get("listing_hashes", {})
+        return previous.get(key) != digest
+
+    def listing_keys(self, blueprint_id: int) -> List[str]:
+        """
+        Keys of the listings recorded at the last fetch of a blueprint
+        """
+        return list((self._fingerprints.get(blueprint_id) or {}).get("listing_hashes", {}))
+
+    def record_hashes(
+        self,
+        blueprint_id: int,
+        expansion_id: Optional[int],
+        listing_hashes: Dict[str, str],
+        unit: Any = None,
+    ) -> bool:
+        """
+        Store the fingerprint of a listing set from its per-listing hashes
+
+        Lets a streamed listing set be recorded without keeping the listings.
+
+        Args:
+            blueprint_id: CardTrader blueprint
+            expansion_id: Its expansion
+            listing_hashes: Hash of each listing, by listing key
+            unit: Unit of work whose rows the fingerprint depends on
+                (None for a full run)
+
+        Returns:
+            True if the set differs from the previous fetch
+        """
+        listings_hash = hashlib.sha256(
+            json.dumps(listing_hashes, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+        now = datetime.now(timezone.utc)
+        previous = self._fingerprints.get(blueprint_id)
+        changed = not previous or previous["listings_hash"] != listings_hash
+
+        fp = {
+            "blueprint_id": blueprint_id,
+            "expansion_id": expansion_id,
+            "listings_hash": listings_hash,
+            "listing_hashes": listing_hashes,
+            "listing_count": len(listing_hashes),
+            "unchanged_runs": 0 if changed else previous["unchanged_runs"] + 1,
+            "last_seen_at": now,
+            "last_changed_at": now if changed else previous["last_changed_at"],
+        }
+        self._fingerprints[blueprint_id] = fp
+        self._pending.setdefault(unit, {})[blueprint_id] = fp
+
+        return changed
+
+    async def flush(self, unit: Any = None) -> None:
+        """
+        Upsert a unit's pending fingerprints (call once its listings' rows are written)
+
+        Args:
+            unit: Unit passed to record_hashes()
+        """
+        pending = self._pending.pop(unit, None)
+        if not pending:
+            return
+
+        rows = list(pending.values())
+
+        async with AsyncSessionLocal() as session:
+            for start in range(0, len(rows), self.batch_size):
+                stmt = insert(BlueprintFingerprint).values(rows[start:start + self.batch_size])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[BlueprintFingerprint.blueprint_id],
+                    set_={
+                        "expansion_id": stmt.excluded.expansion_id,
+                        "listings_hash": stmt.excluded.listings_hash,
+                        "listing_hashes": stmt.excluded.listing_hashes,
+                        "listing_count": stmt.excluded.listing_count,
+                        "unchanged_runs": stmt.excluded.unchanged_runs,
+                        "last_seen_at": stmt.excluded.last_seen_at,
+                        "last_changed_at": stmt.excluded.last_changed_at,
+                    },
+                )
+                await session.execute(stmt)
+            await session.commit()
+
+        logger.debug(f"Saved {len(rows)} blueprint fingerprints")
+
+    def discard(self, unit: Any = None) -> None:
+        """
+        Forget a unit's pending fingerprints whose listings' rows may not have been written
+
+        Their blueprints count as new again, so the next fetch rewrites them.
+
+        Args:
+            unit: Unit passed to record_hashes()
+        """
+        for blueprint_id in self._pending.pop(unit, {}):
+            self._fingerprints.pop(blueprint_id, None)
+
+    def _listing_key(self, listing: Dict[str, Any]) -> str:
+        """Stable key for a listing (its CardTrader ID, else its content)"""
+        if listing.get("id") is not None:
+            return str(listing["id"])
+        return listing_fingerprint(listing)
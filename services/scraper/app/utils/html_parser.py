@@ -0,0 +1,101 @@
+"""
+HTML Parser Backends
+Pluggable parsing layer: BeautifulSoup or the much faster selectolax (lexbor)
+"""
+
+import logging
+from typing import Any, Container, List, Optional
+
+from bs4 import BeautifulSoup
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# selectolax is optional; without it every parse falls back to BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+
+class SelectolaxNode:
+    """
+    Wraps a selectolax node in the subset of the BeautifulSoup Tag API the
+    scrapers use (select, select_one, get_text, get, [], name), so the same
+    extraction code runs on either backend and produces the same dicts.
+    """
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node: Any):
+        self._node = node
+
+    @property
+    def name(self) -> str:
+        return self._node.tag
+
+    @property
+    def key(self) -> int:
+        """Identity of the underlying node (a new wrapper is made per query)"""
+        return self._node.mem_id
+
+    def closest_key(self, keys: Container[int]) -> Optional[int]:
+        """
+        Key of the nearest ancestor whose key is in keys, or None
+        """
+        node = self._node.parent
+        while node is not None:
+            key = node.mem_id
+            if key in keys:
+                return key
+            node = node.parent
+        return None
+
+    def select(self, selector: str) -> List["SelectolaxNode"]:
+        return [SelectolaxNode(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector: str) -> Optional["SelectolaxNode"]:
+        node = self._node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        return self._node.text(deep=True, separator=separator, strip=strip)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._node.attributes.get(key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> str:
+        attributes = self._node.attributes
+        if key not in attributes:
+            raise KeyError(key)
+        return attributes[key] or ""
+
+
+def parse_document(html: str, backend: Optional[str] = None, features: str = "lxml") -> Any:
+    """
+    Parse an HTML document with the configured backend
+
+    Args:
+        html: Page HTML
+        backend: "selectolax" or "bs4" (defaults to settings.PARSER_BACKEND)
+        features: BeautifulSoup tree builder, used by the bs4 backend
+
+    Returns:
+        Root node supporting select/select_one/get_text/get
+    """
+    backend = backend or settings.PARSER_BACKEND
+
+    if backend == "selectolax" and SELECTOLAX_AVAILABLE:
+        tree = LexborHTMLParser(html)
+        # BeautifulSoup's get_text() skips script/style contents
+        tree.strip_tags(["script", "style", "template"])
+        return SelectolaxNode(tree.root)
+
+    return BeautifulSoup(html, features)
+
+
+if settings.PARSER_BACKEND == "selectolax" and not SELECTOLAX_AVAILABLE:
+    logger.warning("PARSER_BACKEND=selectolax but selectolax is not installed, using BeautifulSoup")
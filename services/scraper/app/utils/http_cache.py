@@ -0,0 +1,150 @@
+"""
+HTTP Response Cache
+On-disk cache of page bodies and validators for conditional requests
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HttpCache:
+    """
+    Stores ETag / Last-Modified validators and bodies per URL
+
+    Every fetch of a cached URL is revalidated with If-None-Match /
+    If-Modified-Since, so an unchanged page costs a 304 instead of a full
+    download, parse and write, while a changed one is always picked up.
+    Entries not fetched or revalidated within the TTL are ignored, so their
+    page is downloaded in full again. Callers invalidate() a page whose
+    rows could not be parsed or written, so a 304 never hides lost data.
+    """
+
+    def __init__(self, cache_dir: str, ttl: int, enabled: bool = True):
+        """
+        Initialize HTTP cache
+
+        Args:
+            cache_dir: Directory for cache entries
+            ttl: Seconds an entry is kept since it was last fetched or revalidated
+            enabled: If False, every method is a no-op
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.enabled = enabled
+
+        if self.enabled:
+            logger.info(f"HTTP cache enabled: {self.cache_dir} (TTL {ttl}s)")
+
+    def _path(self, url: str) -> Path:
+        """Cache file for a URL"""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cache entry for a URL
+
+        Returns:
+            Dict with url, etag, last_modified, stored_at and body, or None
+            (also when the entry is older than the TTL)
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Unreadable cache entry for {url}: {e}")
+            return None
+
+        if time.time() - entry.get("stored_at", 0) >= self.ttl:
+            return None
+        return entry
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Build If-None-Match / If-Modified-Since headers for a URL
+        """
+        entry = self.get(url)
+        headers = {}
+
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        return headers
+
+    def store(self, url: str, response: httpx.Response) -> None:
+        """
+        Save a 200 response's validators and body
+        """
+        if not self.enabled:
+            return
+
+        self._write(url, {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "stored_at": time.time(),
+            "body": response.text,
+        })
+
+    def touch(self, url: str) -> None:
+        """
+        Mark an entry as freshly revalidated (after a 304)
+        """
+        entry = self.get(url)
+        if entry:
+            entry["stored_at"] = time.time()
+            self._write(url, entry)
+
+    def invalidate(self, url: str) -> None:
+        """
+        Drop the entry for a URL, so its next fetch downloads it in full
+        """
+        if not self.enabled:
+            return
+
+        try:
+            self._path(url).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not drop cache entry for {url}: {e}")
+
+    def _write(self, url: str, entry: Dict[str, Any]) -> None:
+        """Write an entry atomically"""
+        path = self._path(url)
+        tmp_path = path.with_suffix(".tmp")
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry for {url}: {e}")
+
+
+# Singleton instance
+http_cache = HttpCache(
+    cache_dir=settings.CACHE_DIR,
+    ttl=settings.CACHE_TTL,
+    enabled=settings.CACHE_ENABLED,
+)
@@ -0,0 +1,283 @@
+"""
+Ingest Pipeline
+Bounded producer/consumer queue between scraping and persistence
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import asyncpg
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from app.config import settings
+from app.utils.bulk_writer import RawPriceBulkWriter
+
+logger = logging.getLogger(__name__)
+
+# Sentinel telling the writer task to flush and exit
+_STOP = object()
+
+# Write errors worth one retry: the connection dropped or the transaction lost a race
+_TRANSIENT_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.InterfaceError,
+    asyncpg.exceptions.TransactionRollbackError,
+    OperationalError,
+    InterfaceError,
+)
+
+
+class IngestWriteError(Exception):
+    """Raised by flush() when queued rows were dropped because they could not be written"""
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed write may succeed when retried"""
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return True
+    return isinstance(error, _TRANSIENT_ERRORS)
+
+
+class _Sighting(NamedTuple):
+    """Keyed listings seen again without changes (see mark_seen)"""
+    source: str
+    listing_keys: List[Any]
+    seen_at: datetime
+
+
+class _Queued(NamedTuple):
+    """A row or sighting with its position in the pipeline (see mark)"""
+    position: int
+    item: Any
+
+
+class RawPriceIngestPipeline:
+    """
+    Streams raw_prices rows from scrapers to the database
+
+    Scrapers put() rows as soon as they are parsed. A background writer task
+    drains the bounded queue into a RawPriceBulkWriter, so fetching, parsing
+    and DB writes overlap and memory stays flat regardless of catalog size.
+    When the queue is full, put() blocks until the writer catches up.
+
+    A batch that fails to write is retried once when the error looks
+    transient, otherwise logged and dropped; the writer keeps draining, so
+    one bad row or connection drop costs a batch, not the rest of the run.
+    Callers take a mark() before queuing a unit of work and pass it to
+    flush(), which raises IngestWriteError if any dropped batch held rows
+    queued since then, so work whose rows were lost is not checkpointed
+    and other units' failures are not blamed on it.
+    """
+
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        """
+        Initialize ingest pipeline
+
+        Args:
+            queue_size: Max rows waiting to be written (defaults to settings.INGEST_QUEUE_SIZE)
+            batch_size: Rows per COPY (defaults to settings.BATCH_SIZE)
+            flush_interval: Seconds of producer silence before a partial batch is written
+        """
+        self.queue: asyncio.Queue = asyncio.Queue(
+            maxsize=queue_size or settings.INGEST_QUEUE_SIZE
+        )
+        self.writer = RawPriceBulkWriter(batch_size=batch_size)
+        self.flush_interval = flush_interval or settings.INGEST_FLUSH_INTERVAL
+        self._task: Optional[asyncio.Task] = None
+        self.failed_rows = 0
+        self.failed_batches = 0
+        self._queued = 0  # Position of the next row or sighting
+        self._batch_end: Optional[int] = None  # Last position in the writer's uncommitted batch
+        self._dropped_ends: List[int] = []  # Last position of each dropped batch
+
+    @property
+    def total_written(self) -> int:
+        """Rows committed to the database so far"""
+        return self.writer.total_written
+
+    async def __aenter__(self) -> "RawPriceIngestPipeline":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def put(self, row: Dict[str, Any]) -> None:
+        """
+        Queue a row for writing (blocks while the queue is full)
+
+        Args:
+            row: Dict keyed by raw_prices column names
+        """
+        await self._enqueue(row)
+
+    async def put_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """
+        Queue several rows
+        """
+        for row in rows:
+            await self.put(row)
+
+    async def mark_seen(self, source: str, listing_keys: Iterable[Any]) -> None:
+        """
+        Queue a sighting of listings that were not put() because they did not change
+
+        Their upserted rows keep counting as live (last_seen_at) without
+        being rewritten.
+
+        Args:
+            source: Row source (as in raw_prices.source)
+            listing_keys: listing_key of each sighted listing
+        """
+        keys = [key for key in listing_keys if key is not None]
+        if not keys:
+            return
+
+        await self._enqueue(_Sighting(source, keys, datetime.now(timezone.utc)))
+
+    def mark(self) -> int:
+        """
+        Position of the next row or sighting, to pass to flush(since=...)
+
+        Returns:
+            Pipeline position
+        """
+        return self._queued
+
+    def failures_since(self, mark: int) -> int:
+        """
+        Dropped batches holding rows or sightings queued at or after a mark
+
+        Args:
+            mark: Position from mark()
+
+        Returns:
+            Number of such batches (so far; flush() first to count them all)
+        """
+        return sum(1 for end in self._dropped_ends if end >= mark)
+
+    async def flush(self, since: int = 0) -> None:
+        """
+        Wait until every row queued so far has been written
+
+        Args:
+            since: Position from mark() taken before the caller queued its
+                rows; only batches holding rows from there on count
+                (defaults to the whole life of the pipeline)
+
+        Raises:
+            IngestWriteError: A batch holding rows queued since the mark was dropped
+        """
+        if self._task is not None and not self._task.done():
+            written = asyncio.get_running_loop().create_future()
+            await self.queue.put(written)
+            await written
+
+        failures = self.failures_since(since)
+        if failures:
+            raise IngestWriteError(f"{failures} ingest batch(es) could not be written and were dropped")
+
+    async def close(self) -> None:
+        """
+        Write everything still queued and stop the writer task
+
+        Dropped batches are logged here rather than raised, so a run keeps
+        the rows that were written.
+        """
+        if self._task is not None and not self._task.done():
+            await self.queue.put(_STOP)
+            await self._task
+
+        if self.failed_batches:
+            logger.warning(f"⚠️ {self.failed_rows} rows in {self.failed_batches} batches could not be written")
+
+    async def _enqueue(self, item: Any) -> None:
+        """
+        Number a row or sighting and queue it, starting the writer task if needed
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+
+        # Numbered before the (possibly blocking) put so mark() taken after
+        # this call returns is always past it
+        position = self._queued
+        self._queued += 1
+        await self.queue.put(_Queued(position, item))
+
+    async def _drain(self) -> None:
+        """
+        Writer task: move queued rows into the bulk writer
+        """
+        while True:
+            try:
+                row = await asyncio.wait_for(self.queue.get(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                # Producer is busy fetching; land the partial batch meanwhile
+                await self._write()
+                continue
+
+            if row is _STOP:
+                await self._write()
+                return
+
+            if isinstance(row, asyncio.Future):
+                # flush() marker: everything queued before it is now in the writer
+                await self._write()
+                row.set_result(None)
+                continue
+
+            await self._write(row.item, row.position)
+
+    async def _write(self, row: Optional[Any] = None, position: Optional[int] = None) -> None:
+        """
+        Buffer a row or sighting in the bulk writer, or flush it when row is None
+
+        The bulk writer keeps a failed batch buffered; it is retried once
+        if the error is transient, otherwise dropped. The batch's last
+        position is tracked so a drop is charged to every mark before it.
+        """
+        if position is not None:
+            self._batch_end = position
+
+        try:
+            if row is None:
+                await self.writer.flush()
+            elif isinstance(row, _Sighting):
+                await self.writer.mark_seen(row.source, row.listing_keys, row.seen_at)
+            else:
+                await self.writer.add(row)
+            self._batch_committed()
+            return
+        except Exception as e:
+            error = e
+
+        if _is_transient(error):
+            logger.warning(f"Ingest batch write failed ({error}), retrying once")
+            try:
+                await self.writer.flush()
+                self._batch_committed()
+                return
+            except Exception as e:
+                error = e
+
+        dropped = self.writer.discard()
+        self.failed_rows += dropped
+        self.failed_batches += 1
+        # No position is tracked only if the batch held nothing numbered;
+        # charge it to everything queued so far to be safe
+        self._dropped_ends.append(self._queued - 1 if self._batch_end is None else self._batch_end)
+        self._batch_end = None
+        logger.error(f"Ingest pipeline dropped a batch of {dropped} rows: {error}", exc_info=error)
+
+    def _batch_committed(self) -> None:
+        """Forget the uncommitted batch's last position once the writer holds nothing"""
+        if not self.writer.buffered:
+            self._batch_end = None
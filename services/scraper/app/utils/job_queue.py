@@ -0,0 +1,317 @@
+"""
+Scrape Job Queue
+Postgres work queue of scrape units, claimed with FOR UPDATE SKIP LOCKED
+"""
+
+import logging
+import os
+import socket
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.scrape_job import ScrapeJob
+
+logger = logging.getLogger(__name__)
+
+# Columns handed to workers for a claimed job
+_JOB_COLUMNS = (
+    ScrapeJob.id,
+    ScrapeJob.source,
+    ScrapeJob.unit_type,
+    ScrapeJob.unit_key,
+    ScrapeJob.payload,
+    ScrapeJob.attempts,
+    ScrapeJob.max_attempts,
+)
+
+# Rows per INSERT when enqueueing (asyncpg allows 32767 bind parameters)
+_ENQUEUE_CHUNK = 1000
+
+
+class ScrapeJobQueue:
+    """
+    Shared queue of scrape units in the scrape_jobs table
+
+    Any number of workers, in one process or many containers, claim units
+    with SELECT ... FOR UPDATE SKIP LOCKED, so each unit goes to exactly one
+    worker without an external broker. A claim is a lease: if the worker
+    dies and stops heartbeating, the unit is claimed again once the lease
+    expires. Failed units are retried with exponential backoff until
+    max_attempts, then parked as failed.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        lease_seconds: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        """
+        Initialize job queue
+
+        Args:
+            worker_id: Lease owner name (defaults to hostname:pid)
+            lease_seconds: Lease length (defaults to settings.JOB_LEASE_SECONDS)
+            max_attempts: Attempts per unit (defaults to settings.JOB_MAX_ATTEMPTS)
+        """
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease = timedelta(seconds=lease_seconds or settings.JOB_LEASE_SECONDS)
+        self.max_attempts = max_attempts or settings.JOB_MAX_ATTEMPTS
+
+    def for_slot(self, slot: int) -> "ScrapeJobQueue":
+        """
+        Queue handle for one concurrency slot of this worker
+
+        Leases are matched by owner, so slots that share a process must not
+        share a name: a slot could otherwise heartbeat or complete a unit
+        another slot re-claimed after its lease expired.
+
+        Args:
+            slot: Slot number within the worker
+
+        Returns:
+            Queue whose leases are owned by worker_id:slot
+        """
+        return ScrapeJobQueue(
+            worker_id=f"{self.worker_id}:{slot}",
+            lease_seconds=int(self.lease.total_seconds()),
+            max_attempts=self.max_attempts,
+        )
+
+    async def enqueue_many(self, units: List[Dict[str, Any]]) -> int:
+        """
+        Add units to the queue, or re-arm them if their last run finished
+
+        Units that are still pending or running are left alone, so several
+        planners can enqueue the same cycle without duplicating work.
+
+        Args:
+            units: Dicts with source, unit_type, unit_key, payload and
+                optionally priority
+
+        Returns:
+            Number of units inserted or re-armed
+        """
+        queued = 0
+
+        for start in range(0, len(units), _ENQUEUE_CHUNK):
+            rows = [
+                {
+                    "source": unit["source"],
+                    "unit_type": unit["unit_type"],
+                    "unit_key": str(unit["unit_key"]),
+                    "payload": unit.get("payload") or {},
+                    "priority": unit.get("priority", 0),
+                    "status": "pending",
+                    "attempts": 0,
+                    "max_attempts": self.max_attempts,
+                }
+                for unit in units[start:start + _ENQUEUE_CHUNK]
+            ]
+
+            stmt = insert(ScrapeJob).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ScrapeJob.unit_type, ScrapeJob.unit_key],
+                set_={
+                    "payload": stmt.excluded.payload,
+                    "priority": stmt.excluded.priority,
+                    "status": "pending",
+                    "attempts": 0,
+                    "max_attempts": stmt.excluded.max_attempts,
+                    "available_at": func.now(),
+                    "lease_owner": None,
+                    "lease_expires_at": None,
+                    "last_error": None,
+                    "updated_at": func.now(),
+                },
+                where=ScrapeJob.status.in_(("done", "failed")),
+            )
+
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(stmt)
+                await session.commit()
+                queued += result.rowcount
+
+        return queued
+
+    async def enqueue(self, source: str, unit_type: str, unit_key: str, payload: Optional[Dict[str, Any]] = None, priority: int = 0) -> int:
+        """
+        Add a single unit (see enqueue_many)
+        """
+        return await self.enqueue_many([{
+            "source": source,
+            "unit_type": unit_type,
+            "unit_key": unit_key,
+            "payload": payload,
+            "priority": priority,
+        }])
+
+    async def claim(self, limit: int = 1, sources: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Lease up to `limit` runnable units
+
+        Runnable means pending and past its backoff, or running with an
+        expired lease (its worker died). Rows locked by another claimer are
+        skipped rather than waited on.
+
+        Args:
+            limit: Max units to claim
+            sources: Only claim units of these sources
+
+        Returns:
+            Claimed jobs as dicts (id, source, unit_type, unit_key, payload,
+            attempts, max_attempts)
+        """
+        now = func.now()
+        lease_expired = and_(ScrapeJob.status == "running", ScrapeJob.lease_expires_at < now)
+
+        # Units whose worker died on their last attempt have nothing left to retry
+        reap = (
+            update(ScrapeJob)
+            .where(lease_expired, ScrapeJob.attempts >= ScrapeJob.max_attempts)
+            .values(
+                status="failed",
+                last_error="Lease expired on final attempt",
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=now,
+            )
+        )
+
+        candidates = (
+            select(ScrapeJob.id)
+            .where(
+                or_(
+                    and_(ScrapeJob.status == "pending", ScrapeJob.available_at <= now),
+                    lease_expired,
+                ),
+                ScrapeJob.attempts < ScrapeJob.max_attempts,
+            )
+            .order_by(ScrapeJob.priority.desc(), ScrapeJob.available_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if sources:
+            candidates = candidates.where(ScrapeJob.source.in_(sources))
+
+        claim = (
+            update(ScrapeJob)
+            .where(ScrapeJob.id.in_(candidates.scalar_subquery()))
+            .values(
+                status="running",
+                lease_owner=self.worker_id,
+                lease_expires_at=now + self.lease,
+                attempts=ScrapeJob.attempts + 1,
+                updated_at=now,
+            )
+            .returning(*_JOB_COLUMNS)
+        )
+
+        async with AsyncSessionLocal() as session:
+            await session.execute(reap)
+            result = await session.execute(claim)
+            jobs = [dict(row) for row in result.mappings()]
+            await session.commit()
+
+        return jobs
+
+    async def heartbeat(self, job_id: int) -> bool:
+        """
+        Extend the lease of a unit this worker is still processing
+
+        Returns:
+            False if the lease was lost (expired and claimed by someone else)
+        """
+        return await self._update_owned(
+            job_id,
+            lease_expires_at=func.now() + self.lease,
+            updated_at=func.now(),
+        )
+
+    async def complete(self, job_id: int, items_scraped: int = 0) -> bool:
+        """
+        Mark a unit done
+
+        Returns:
+            False if the lease was lost before completion
+        """
+        return await self._update_owned(
+            job_id,
+            status="done",
+            items_scraped=items_scraped,
+            lease_owner=None,
+            lease_expires_at=None,
+            last_error=None,
+            completed_at=func.now(),
+            updated_at=func.now(),
+        )
+
+    async def fail(self, job: Dict[str, Any], error: str) -> bool:
+        """
+        Record a failed attempt: retry later with backoff, or park as failed
+
+        Args:
+            job: Claimed job dict
+            error: Error message to store
+
+        Returns:
+            False if the lease was lost before the failure was recorded
+        """
+        if job["attempts"] >= job["max_attempts"]:
+            logger.error(f"❌ {job['unit_type']}:{job['unit_key']} failed after {job['attempts']} attempts: {error}")
+            return await self._update_owned(
+                job["id"],
+                status="failed",
+                last_error=error,
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=func.now(),
+            )
+
+        backoff = timedelta(seconds=min(settings.RETRY_DELAY * 2 ** (job["attempts"] - 1), 3600))
+        logger.warning(f"⚠️  {job['unit_type']}:{job['unit_key']} attempt {job['attempts']} failed, retry in {backoff.total_seconds():.0f}s: {error}")
+        return await self._update_owned(
+            job["id"],
+            status="pending",
+            available_at=func.now() + backoff,
+            last_error=error,
+            lease_owner=None,
+            lease_expires_at=None,
+            updated_at=func.now(),
+        )
+
+    async def counts(self) -> Dict[str, int]:
+        """
+        Number of units per status
+        """
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(ScrapeJob.status, func.count()).group_by(ScrapeJob.status)
+            )
+            return {status: count for status, count in result.all()}
+
+    async def _update_owned(self, job_id: int, **values: Any) -> bool:
+        """Update a running unit only while this worker holds its lease"""
+        stmt = (
+            update(ScrapeJob)
+            .where(
+                ScrapeJob.id == job_id,
+                ScrapeJob.status == "running",
+                ScrapeJob.lease_owner == self.worker_id,
+            )
+            .values(**values)
+        )
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+
+        if result.rowcount == 0:
+            logger.warning(f"Lost lease on scrape job {job_id}")
+            return False
+        return True
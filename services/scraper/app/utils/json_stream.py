@@ -0,0 +1,102 @@
+"""
+Streaming JSON Decoding
+Yield items out of large JSON responses while the body is still arriving
+"""
+
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Iterator, Optional
+
+import httpx
+
+from app.utils.scrape_metrics import ScrapeMetrics
+
+logger = logging.getLogger(__name__)
+
+# ijson is optional; without it the body is read in full and decoded at once
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+def _select(data: Any, prefix: str) -> Iterator[Any]:
+    """
+    Items of an already decoded document at an ijson-style prefix
+    ("item" = each element of an array, other parts = object keys)
+    """
+    if not prefix:
+        yield data
+        return
+
+    head, _, rest = prefix.partition(".")
+    if head == "item":
+        if isinstance(data, list):
+            for element in data:
+                yield from _select(element, rest)
+    elif isinstance(data, dict) and head in data:
+        yield from _select(data[head], rest)
+
+
+async def iter_json_items(
+    response: httpx.Response,
+    prefix: str,
+    min_stream_bytes: int = 0,
+    metrics: Optional[ScrapeMetrics] = None,
+) -> AsyncIterator[Any]:
+    """
+    Decode the objects at `prefix` of a streamed response one at a time
+
+    With ijson each object is yielded as soon as its bytes have arrived,
+    so neither the whole body nor the whole object tree is ever held in
+    memory. Without it, and for bodies known to be smaller than
+    min_stream_bytes (incremental decoding costs more CPU per object),
+    the body is decoded in one go (with orjson if installed) and the
+    objects are yielded from the result.
+
+    Args:
+        response: Response opened with stream=True
+        prefix: ijson prefix, e.g. "item" for the elements of a top-level
+            array or "123.item" for the array under key "123"
+        min_stream_bytes: Content-Length below which the body is decoded
+            in one go (bodies without a length are always streamed)
+        metrics: Source metrics to record decoding time under "parse"
+
+    Yields:
+        Decoded objects (numbers as int/float, like response.json())
+    """
+    content_length = response.headers.get("Content-Length")
+    small = content_length is not None and content_length.isdigit() and int(content_length) < min_stream_bytes
+
+    if IJSON_AVAILABLE and not small:
+        # Push each chunk into the parser and hand out whatever it completed
+        decoded = ijson.sendable_list()
+        parser = ijson.items_coro(decoded, prefix, use_float=True)
+        async for chunk in response.aiter_bytes():
+            started = time.perf_counter()
+            parser.send(chunk)
+            if metrics is not None:
+                metrics.add_time("parse", time.perf_counter() - started)
+            for item in decoded:
+                yield item
+            del decoded[:]
+        parser.close()
+        for item in decoded:
+            yield item
+        return
+
+    body = await response.aread()
+    started = time.perf_counter()
+    data = _loads(body)
+    if metrics is not None:
+        metrics.add_time("parse", time.perf_counter() - started)
+    for item in _select(data, prefix):
+        yield item
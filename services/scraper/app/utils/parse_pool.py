@@ -0,0 +1,85 @@
+"""
+Parse Process Pool
+Runs CPU-bound HTML parsing in worker processes so the event loop keeps fetching
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.utils.scrape_metrics import get_scrape_metrics, source_of
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+# Parser instances living in a worker process, one per scraper class
+_parsers: Dict[type, Any] = {}
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool, creating it on first use
+    """
+    global _executor
+
+    if _executor is None:
+        workers = settings.PARSE_WORKERS or None  # None = one per CPU
+        # spawn: don't fork a process that has an event loop and DB pools running
+        _executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(f"Parse process pool started ({workers or 'cpu_count'} workers)")
+
+    return _executor
+
+
+def shutdown_parse_pool() -> None:
+    """
+    Stop the worker processes (no-op if the pool was never started)
+    """
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+def _call_parser(scraper_class: type, method_name: str, *args: Any) -> Any:
+    """
+    Worker-process entry point: run a parse method on a per-process instance
+    """
+    parser = _parsers.get(scraper_class)
+    if parser is None:
+        parser = _parsers[scraper_class] = scraper_class()
+    return getattr(parser, method_name)(*args)
+
+
+async def run_parse(scraper: Any, method_name: str, *args: Any) -> Any:
+    """
+    Run a synchronous parse method, in the process pool if enabled
+
+    The method must only depend on the scraper's configuration (not on its
+    client or session), take picklable arguments and return plain data;
+    the scraper class must be constructible without arguments.
+
+    Args:
+        scraper: Scraper instance that owns the method
+        method_name: Name of the parse method
+        *args: Arguments for the parse method
+
+    Returns:
+        Whatever the parse method returns
+    """
+    with get_scrape_metrics(source_of(scraper)).timer("parse"):
+        if not settings.PARSE_IN_PROCESS_POOL:
+            return getattr(scraper, method_name)(*args)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_executor(), _call_parser, type(scraper), method_name, *args
+        )
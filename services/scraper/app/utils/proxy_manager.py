@@ -1,49 +1,228 @@
 """
-Proxy Manager with Rotation
+Proxy Manager with Health-Scored Rotation
 """
 
-from typing import Dict, Optional, List
+from collections import deque
+from typing import Any, Dict, Optional, List
+from urllib.parse import quote, urlsplit, urlunsplit
 import random
+import time
 import logging
 
+import httpx
+
 from app.config import settings
+from app.utils.replay import client_transport
 
 logger = logging.getLogger(__name__)
 
+# Responses that mean the proxy's exit IP is refused or the proxy itself failed
+PROXY_FAILURE_STATUS_CODES = (403, 407, 429)
+
+
+class ProxyStats:
+    """
+    Rolling success and latency record of one proxy
+    """
+
+    def __init__(self, window: int):
+        self.samples: deque = deque(maxlen=window)  # (ok, latency in seconds)
+        self.requests = 0
+        self.consecutive_failures = 0
+        self.quarantined_until = 0.0
+        self.quarantines = 0
+
+    def record(self, ok: bool, latency: Optional[float] = None):
+        self.requests += 1
+        self.samples.append((ok, latency))
+        self.consecutive_failures = 0 if ok else self.consecutive_failures + 1
+
+    def reset(self):
+        """Forget the window (a proxy back from quarantine starts fresh)"""
+        self.samples.clear()
+        self.consecutive_failures = 0
+
+    @property
+    def success_rate(self) -> float:
+        if not self.samples:
+            return 1.0
+        return sum(1 for ok, _ in self.samples if ok) / len(self.samples)
+
+    def latency(self, percentile: float) -> Optional[float]:
+        """
+        Latency percentile of successful requests in the window, in seconds
+        """
+        latencies = sorted(latency for ok, latency in self.samples if ok and latency is not None)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, round(percentile / 100 * (len(latencies) - 1)))
+        return latencies[index]
+
 
 class ProxyManager:
     """
-    Manages proxy rotation for scraping
+    Manages a pool of proxies for scraping
+
+    Every request through a proxy is reported back with report(), so the
+    pool knows each proxy's success rate and p50/p95 latency over the last
+    PROXY_HEALTH_WINDOW requests. select() sends traffic to healthy proxies
+    weighted towards the fastest ones; proxies that fail repeatedly or drop
+    below PROXY_MIN_SUCCESS_RATE are quarantined for PROXY_QUARANTINE_SECONDS.
     """
 
-    def __init__(self):
-        self.enabled = settings.PROXY_ENABLED
+    def __init__(self, servers: Optional[List[str]] = None):
+        """
+        Initialize proxy manager
+
+        Args:
+            servers: Proxy URLs for a dedicated pool (defaults to the
+                PROXY_URL / PROXY_URLS settings if PROXY_ENABLED)
+        """
+        self.enabled = settings.PROXY_ENABLED if servers is None else bool(servers)
         self.proxies: List[Dict[str, str]] = []
-        self.current_index = 0
-        
-        if self.enabled and settings.PROXY_URL:
-            # Add main proxy
-            self.proxies.append({
-                "server": settings.PROXY_URL,
-                "username": settings.PROXY_USERNAME,
-                "password": settings.PROXY_PASSWORD,
-            })
+        self.stats: Dict[str, ProxyStats] = {}
+
+        if servers is not None:
+            for server in servers:
+                self.add_proxy(server)
+        elif self.enabled:
+            for server in [settings.PROXY_URL, *settings.PROXY_URLS]:
+                if server:
+                    self.add_proxy(server, settings.PROXY_USERNAME, settings.PROXY_PASSWORD)
             logger.info(f"Proxy manager initialized with {len(self.proxies)} proxy(ies)")
         else:
             logger.info("Proxy manager disabled")
 
-    def get_proxy(self) -> Optional[Dict[str, str]]:
+    def select(self) -> Optional[Dict[str, str]]:
         """
-        Get next proxy in rotation
+        Pick a proxy for the next request: healthy ones, fastest most often
+
+        Returns:
+            Proxy dict (server, username, password), or None if disabled
         """
         if not self.enabled or not self.proxies:
             return None
-        
-        # Round-robin selection
-        proxy = self.proxies[self.current_index]
-        self.current_index = (self.current_index + 1) % len(self.proxies)
-        
-        return proxy
+
+        now = time.monotonic()
+        healthy = [p for p in self.proxies if self.stats[p["server"]].quarantined_until <= now]
+
+        if not healthy:
+            # Everything is quarantined: use the proxy that comes back first
+            return min(self.proxies, key=lambda p: self.stats[p["server"]].quarantined_until)
+
+        for proxy in healthy:
+            stats = self.stats[proxy["server"]]
+            if stats.quarantined_until:
+                logger.info(f"🔁 Proxy {self.label(proxy['server'])} back from quarantine")
+                stats.quarantined_until = 0.0
+                stats.reset()
+
+        # Weighted rather than always-the-best, so slower proxies keep
+        # getting some traffic and their latency stays measured
+        weights = self._scores(healthy)
+        return random.choices(healthy, weights=weights)[0]
+
+    def _scores(self, proxies: List[Dict[str, str]]) -> List[float]:
+        """
+        Selection weight per proxy: success rate squared over p50 latency
+
+        The success rate is smoothed (one success and one failure assumed)
+        so a proxy with a single early failure isn't starved of traffic.
+        """
+        p50s = {p["server"]: self.stats[p["server"]].latency(50) for p in proxies}
+        measured = [latency for latency in p50s.values() if latency is not None]
+
+        # Proxies without latency samples yet rank as the median proxy
+        default_p50 = sorted(measured)[len(measured) // 2] if measured else 1.0
+
+        scores = []
+        for proxy in proxies:
+            stats = self.stats[proxy["server"]]
+            p50 = p50s[proxy["server"]] or default_p50
+            successes = sum(1 for ok, _ in stats.samples if ok)
+            success_rate = (successes + 1) / (len(stats.samples) + 2)
+            scores.append(success_rate ** 2 / max(p50, 0.01))
+        return scores
+
+    def report(self, server: str, ok: bool, latency: Optional[float] = None):
+        """
+        Record the outcome of a request sent through a proxy
+
+        Args:
+            server: Proxy server the request went through
+            ok: False for connection errors, timeouts and blocked responses
+            latency: Seconds until the response arrived
+        """
+        stats = self.stats.get(server)
+        if stats is None:
+            return
+
+        stats.record(ok, latency)
+        if ok or stats.quarantined_until > time.monotonic():
+            return
+
+        too_many_failures = stats.consecutive_failures >= settings.PROXY_MAX_CONSECUTIVE_FAILURES
+        unhealthy = (
+            len(stats.samples) >= settings.PROXY_MIN_SAMPLES
+            and stats.success_rate < settings.PROXY_MIN_SUCCESS_RATE
+        )
+        if too_many_failures or unhealthy:
+            stats.quarantined_until = time.monotonic() + settings.PROXY_QUARANTINE_SECONDS
+            stats.quarantines += 1
+            logger.warning(
+                f"🚫 Proxy {self.label(server)} quarantined for {settings.PROXY_QUARANTINE_SECONDS:.0f}s "
+                f"(success {stats.success_rate:.0%}, {stats.consecutive_failures} failures in a row)"
+            )
+
+    def report_response(self, server: str, status_code: int, latency: float):
+        """
+        Record a response received through a proxy
+        """
+        self.report(server, status_code not in PROXY_FAILURE_STATUS_CODES, latency)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Health of every proxy for monitoring
+        """
+        now = time.monotonic()
+        metrics = {}
+        for proxy in self.proxies:
+            stats = self.stats[proxy["server"]]
+            p50, p95 = stats.latency(50), stats.latency(95)
+            metrics[self.label(proxy["server"])] = {
+                "requests": stats.requests,
+                "success_rate": round(stats.success_rate, 3),
+                "p50_ms": round(p50 * 1000) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000) if p95 is not None else None,
+                "quarantined": stats.quarantined_until > now,
+                "quarantines": stats.quarantines,
+            }
+        return metrics
+
+    @staticmethod
+    def label(server: str) -> str:
+        """Proxy host:port without credentials, for logs"""
+        parts = urlsplit(server)
+        return parts.netloc.rsplit("@", 1)[-1] or server
+
+    @staticmethod
+    def proxy_url(proxy: Dict[str, str]) -> str:
+        """
+        Proxy URL for httpx, with credentials if the proxy has them
+        """
+        server = proxy["server"]
+        parts = urlsplit(server)
+        if not proxy.get("username") or "@" in parts.netloc:
+            return server
+
+        credentials = f"{quote(proxy['username'], safe='')}:{quote(proxy.get('password') or '', safe='')}"
+        return urlunsplit(parts._replace(netloc=f"{credentials}@{parts.netloc}"))
+
+    def get_proxy(self) -> Optional[Dict[str, str]]:
+        """
+        Get next proxy (health-aware, see select())
+        """
+        return self.select()
 
     def get_random_proxy(self) -> Optional[Dict[str, str]]:
         """
@@ -51,26 +230,83 @@ class ProxyManager:
         """
         if not self.enabled or not self.proxies:
             return None
-        
+
         return random.choice(self.proxies)
 
     def add_proxy(self, server: str, username: str = "", password: str = ""):
         """
         Add proxy to rotation pool
         """
+        if server in self.stats:
+            return
+
         self.proxies.append({
             "server": server,
             "username": username,
             "password": password,
         })
-        logger.info(f"Added proxy: {server}")
+        self.stats[server] = ProxyStats(settings.PROXY_HEALTH_WINDOW)
+        logger.info(f"Added proxy: {self.label(server)}")
 
     def remove_proxy(self, server: str):
         """
         Remove proxy from pool
         """
         self.proxies = [p for p in self.proxies if p["server"] != server]
-        logger.info(f"Removed proxy: {server}")
+        self.stats.pop(server, None)
+        logger.info(f"Removed proxy: {self.label(server)}")
+
+
+class ProxyClientPool:
+    """
+    One pooled HTTP client per proxy (plus one for direct connections)
+
+    httpx binds a proxy to a client, so rotating proxies with a single
+    client means rebuilding it and its connections every time. Keeping a
+    client per proxy keeps each proxy's connections warm while requests
+    rotate between them.
+    """
+
+    def __init__(self, **client_kwargs: Any):
+        """
+        Initialize client pool
+
+        Args:
+            client_kwargs: httpx.AsyncClient arguments shared by every client
+        """
+        self.client_kwargs = client_kwargs
+        self._clients: Dict[Optional[str], httpx.AsyncClient] = {}
+
+    def get(self, proxy: Optional[Dict[str, str]] = None) -> httpx.AsyncClient:
+        """
+        The client for a proxy (None = direct), created on first use
+        """
+        key = proxy["server"] if proxy else None
+
+        client = self._clients.get(key)
+        if client is None:
+            kwargs = dict(self.client_kwargs)
+
+            # Recording / replay (see app.utils.replay) replaces the network transport
+            transport_kwargs = {name: kwargs[name] for name in ("http2", "limits") if name in kwargs}
+            if proxy:
+                transport_kwargs["proxy"] = ProxyManager.proxy_url(proxy)
+            transport = client_transport(**transport_kwargs)
+
+            if transport is not None:
+                kwargs["transport"] = transport
+            elif proxy:
+                kwargs["proxies"] = ProxyManager.proxy_url(proxy)
+            client = self._clients[key] = httpx.AsyncClient(**kwargs)
+        return client
+
+    async def aclose(self):
+        """
+        Close every client
+        """
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients = {}
 
 
 # Singleton instance
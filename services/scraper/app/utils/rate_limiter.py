@@ -3,8 +3,17 @@ Rate Limiter Implementation
 """
 
 import asyncio
+import logging
 import time
 from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
 
 
 class RateLimiter:
@@ -30,18 +39,224 @@ class RateLimiter:
         Acquire permission to make a call (blocks if rate limit exceeded)
         """
         async with self._lock:
-            now = time.time()
-            
-            # Remove old calls outside the time window
-            while self.calls and self.calls[0] <= now - self.period:
-                self.calls.popleft()
-            
-            # If we've hit the limit, wait
-            if len(self.calls) >= self.max_calls:
+            while True:
+                now = time.time()
+                
+                # Remove old calls outside the time window
+                while self.calls and self.calls[0] <= now - self.period:
+                    self.calls.popleft()
+                
+                if len(self.calls) < self.max_calls:
+                    break
+                
+                # If we've hit the limit, wait for the oldest call to expire
+                # (asyncio.Lock is not re-entrant, so loop instead of recursing)
                 sleep_time = self.calls[0] + self.period - now
                 if sleep_time > 0:
                     await asyncio.sleep(sleep_time)
-                    return await self.acquire()
             
             # Record this call
             self.calls.append(now)
+
+
+# Responses that mean "slow down"
+THROTTLE_STATUS_CODES = (429, 503)
+
+# Responses that usually mean bot detection: slow down, but don't retry
+BLOCKED_STATUS_CODES = (403,)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date)
+    
+    Returns:
+        Seconds to wait, or None if missing/unparseable
+    """
+    if not value:
+        return None
+    
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveRateLimiter:
+    """
+    Per-host AIMD rate limiter driven by server feedback
+    
+    Requests are paced at the current rate (1 / rate seconds apart). Every
+    successful response raises the rate additively towards max_rate; a
+    429/503 cuts it multiplicatively and, if the server sent Retry-After,
+    pauses the host until then. A 403 cuts it too, since hosts block
+    scrapers that go too fast. Slots are reserved without holding a lock
+    across the sleep, so waiting callers never block each other.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_rate: float,
+        max_rate: float,
+        min_rate: float = settings.RATE_LIMIT_MIN_PER_SECOND,
+        increase: float = settings.RATE_LIMIT_INCREASE,
+        decrease_factor: float = settings.RATE_LIMIT_DECREASE_FACTOR,
+        max_retry_after: float = settings.RATE_LIMIT_MAX_RETRY_AFTER,
+    ):
+        """
+        Initialize adaptive rate limiter
+        
+        Args:
+            name: Host (or label) used in logs and metrics
+            initial_rate: Starting rate in requests per second
+            max_rate: Ceiling the rate ramps up to
+            min_rate: Floor the rate backs off to
+            increase: Requests per second gained per second of healthy traffic
+            decrease_factor: Multiplier applied to the rate on a throttle response
+            max_retry_after: Upper bound for honoured Retry-After pauses (seconds)
+        """
+        self.name = name
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.rate = max(self.min_rate, min(initial_rate, max_rate))
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.max_retry_after = max_retry_after
+        
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        
+        # Counters for metrics
+        self.requests = 0
+        self.throttled = 0
+
+    @property
+    def current_rate(self) -> float:
+        """Current allowed rate in requests per second"""
+        return self.rate
+
+    async def acquire(self):
+        """
+        Wait for this caller's slot (and for any Retry-After pause to end)
+        """
+        while True:
+            now = time.monotonic()
+            slot = max(now, self._next_slot, self._paused_until)
+            self._next_slot = slot + 1.0 / self.rate
+            
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            
+            # A throttle response may have paused the host while we slept
+            if time.monotonic() >= self._paused_until:
+                break
+        
+        self.requests += 1
+
+    def on_response(self, status_code: int, retry_after: Optional[str] = None):
+        """
+        Feed a response back into the limiter
+        
+        Args:
+            status_code: HTTP status of the response
+            retry_after: Raw Retry-After header value, if any
+        """
+        if status_code in THROTTLE_STATUS_CODES:
+            self.on_throttle(parse_retry_after(retry_after))
+        elif status_code in BLOCKED_STATUS_CODES:
+            self.on_throttle()
+        elif status_code < 500:
+            self.on_success()
+
+    def on_success(self):
+        """
+        Additive increase: about +increase req/s per second at the current rate
+        """
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """
+        Multiplicative decrease, plus a pause if the server asked for one
+        """
+        self.throttled += 1
+        now = time.monotonic()
+        
+        # Concurrent requests tend to get throttled together; back off once per window
+        if now - self._last_decrease >= 1.0 / self.rate:
+            previous = self.rate
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._last_decrease = now
+            logger.warning(f"🐢 {self.name} throttled: {previous:.2f} -> {self.rate:.2f} req/s")
+        
+        if retry_after:
+            pause = min(retry_after, self.max_retry_after)
+            self._paused_until = max(self._paused_until, now + pause)
+            logger.warning(f"⏸️  {self.name} asked to retry after {pause:.0f}s")
+
+    def cap(self, max_rate: float):
+        """
+        Lower the ceiling to a stricter limit another caller configured for the host
+        """
+        if max_rate >= self.max_rate:
+            return
+        
+        logger.warning(f"⚠️ Conflicting rate limits for {self.name}: lowering ceiling {self.max_rate:.2f} -> {max_rate:.2f} req/s")
+        self.max_rate = max_rate
+        self.min_rate = min(self.min_rate, max_rate)
+        self.rate = max(self.min_rate, min(self.rate, max_rate))
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Current state for monitoring
+        """
+        return {
+            "rate": round(self.rate, 3),
+            "max_rate": self.max_rate,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 1),
+        }
+
+
+# One limiter per host, shared by every scraper and worker that talks to it
+_host_limiters: Dict[str, AdaptiveRateLimiter] = {}
+
+
+def get_host_limiter(url: str, initial_rate: float, max_rate: float) -> AdaptiveRateLimiter:
+    """
+    Get the shared adaptive limiter for a URL's host, creating it on first use
+    
+    Callers configured with different limits for one host share the
+    strictest ceiling, whichever of them asks first.
+    
+    Args:
+        url: Any URL (or bare host name) on the host
+        initial_rate: Starting rate in requests per second (first caller wins)
+        max_rate: Ceiling in requests per second (the lowest one asked for applies)
+    """
+    host = urlsplit(url).hostname or url
+    
+    limiter = _host_limiters.get(host)
+    if limiter is None:
+        limiter = _host_limiters[host] = AdaptiveRateLimiter(host, initial_rate, max_rate)
+    else:
+        limiter.cap(max_rate)
+    return limiter
+
+
+def rate_limiter_metrics() -> Dict[str, Dict[str, float]]:
+    """
+    Current rate and counters of every host limiter
+    """
+    return {host: limiter.metrics() for host, limiter in _host_limiters.items()}
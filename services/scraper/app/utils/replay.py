@@ -0,0 +1,250 @@
+"""
+HTTP Record / Replay
+Records real responses once and serves them offline, with injected latency and errors
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+import httpx
+
+from app.config import settings
+from app.utils.crawl_frontier import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Headers worth keeping; bodies are stored decoded, so encodings and lengths are dropped
+RECORDED_HEADERS = ("content-type", "etag", "last-modified", "retry-after", "location")
+
+
+def recording_key(method: str, url: str) -> str:
+    """
+    Key a request is recorded and looked up under
+    """
+    return f"{method.upper()} {canonicalize_url(url)}"
+
+
+def save_recording(
+    directory: str,
+    method: str,
+    url: str,
+    status_code: int,
+    headers: Mapping[str, str],
+    content: bytes,
+) -> Path:
+    """
+    Write one recorded response (one JSON file per request key)
+
+    Args:
+        directory: Recording directory
+        method: Request method
+        url: Request URL
+        status_code: Response status
+        headers: Response headers (only RECORDED_HEADERS are kept)
+        content: Decoded response body
+
+    Returns:
+        Path of the recording
+    """
+    key = recording_key(method, url)
+    entry: Dict[str, Any] = {
+        "key": key,
+        "status": status_code,
+        "headers": {name: headers[name] for name in RECORDED_HEADERS if name in headers},
+    }
+    try:
+        entry["body"] = content.decode("utf-8")
+    except UnicodeDecodeError:
+        entry["body_base64"] = base64.b64encode(content).decode("ascii")
+
+    path = Path(directory) / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _replayed_response(entry: Dict[str, Any], request: httpx.Request) -> httpx.Response:
+    """Build a response from a recording"""
+    if "body_base64" in entry:
+        content = base64.b64decode(entry["body_base64"])
+    else:
+        content = entry.get("body", "").encode("utf-8")
+    return httpx.Response(entry["status"], headers=entry["headers"], content=content, request=request)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Sends requests through a real transport and records every response
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, directory: str):
+        """
+        Initialize recording transport
+
+        Args:
+            transport: Transport that does the actual network I/O
+            directory: Where recordings are written
+        """
+        self.transport = transport
+        self.directory = directory
+        self.recorded = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+
+        try:
+            save_recording(self.directory, request.method, str(request.url), response.status_code, response.headers, content)
+            self.recorded += 1
+        except OSError as e:
+            logger.warning(f"Could not record {request.url}: {e}")
+
+        # Hand back the decoded body without its original Content-Encoding
+        headers = {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers}
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serves recorded responses instead of touching the network
+
+    Every request waits latency (+ up to jitter) seconds like a network
+    round trip would. A share of requests can be failed on purpose, as
+    connection errors or as error_status responses, to exercise retries,
+    rate limiters and circuit breakers. Requests without a recording get a
+    404 and are counted as missing.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        connect_error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize replay transport
+
+        Args:
+            directory: Recording directory
+            latency: Seconds added to every request
+            jitter: Max extra seconds added at random
+            error_rate: Share of requests answered with error_status
+            error_status: Status of injected error responses
+            connect_error_rate: Share of requests failed with a connection error
+            seed: Random seed, for repeatable error patterns
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.connect_error_rate = connect_error_rate
+        self._random = random.Random(seed)
+
+        self.recordings: Dict[str, Dict[str, Any]] = {}
+        for path in Path(directory).glob("*.json"):
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            self.recordings[entry["key"]] = entry
+
+        # Counters for reporting
+        self.requests = 0
+        self.served = 0
+        self.missing = 0
+        self.injected_errors = 0
+        self.bytes_served = 0
+
+        logger.info(f"Replaying {len(self.recordings)} recorded responses from {directory}")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        roll = self._random.random()
+        if roll < self.connect_error_rate:
+            self.injected_errors += 1
+            raise httpx.ConnectError("Injected connection error", request=request)
+        if roll < self.connect_error_rate + self.error_rate:
+            self.injected_errors += 1
+            return httpx.Response(self.error_status, request=request)
+
+        entry = self.recordings.get(recording_key(request.method, str(request.url)))
+        if entry is None:
+            self.missing += 1
+            logger.debug(f"No recording for {request.method} {request.url}")
+            return httpx.Response(404, request=request)
+
+        self.served += 1
+        response = _replayed_response(entry, request)
+        self.bytes_served += len(response.content)
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Request counters for reporting
+        """
+        return {
+            "requests": self.requests,
+            "served": self.served,
+            "missing": self.missing,
+            "injected_errors": self.injected_errors,
+            "bytes_served": self.bytes_served,
+        }
+
+
+# Transport every scraper client uses instead of the network (None = network)
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+def install_transport(transport: Optional[httpx.AsyncBaseTransport]) -> None:
+    """
+    Route every HTTP client created from now on through a transport (None = network)
+    """
+    global _transport
+    _transport = transport
+
+
+def client_transport(**transport_kwargs: Any) -> Optional[httpx.AsyncBaseTransport]:
+    """
+    Transport for a new scraper HTTP client
+
+    The installed transport if any (HTTP_REPLAY_DIR installs a replay
+    transport on first use), a recording transport if HTTP_RECORD_DIR is
+    set, otherwise None so httpx uses the network as usual.
+
+    Args:
+        transport_kwargs: httpx.AsyncHTTPTransport arguments (http2, limits,
+            proxy) for the real transport when recording
+    """
+    if _transport is None and settings.HTTP_REPLAY_DIR:
+        install_transport(ReplayTransport(settings.HTTP_REPLAY_DIR))
+
+    if _transport is not None:
+        return _transport
+
+    if settings.HTTP_RECORD_DIR:
+        return RecordingTransport(httpx.AsyncHTTPTransport(**transport_kwargs), settings.HTTP_RECORD_DIR)
+
+    return None
@@ -7,9 +7,20 @@ import functools
 from typing import Callable, Any
 import logging
 
+from app.utils.circuit_breaker import CircuitOpenError
+from app.utils.scrape_metrics import get_scrape_metrics, source_of
+
 logger = logging.getLogger(__name__)
 
 
+def _count_retry(args: tuple, delay: float) -> None:
+    """Count a retry and its backoff towards the scraper's metrics (methods only)"""
+    if args:
+        metrics = get_scrape_metrics(source_of(args[0]))
+        metrics.count("retries")
+        metrics.add_time("sleep", delay)
+
+
 def retry_with_backoff(
     max_retries: int = 3,
     base_delay: float = 1.0,
@@ -33,6 +44,9 @@ def retry_with_backoff(
             for attempt in range(max_retries + 1):
                 try:
                     return await func(*args, **kwargs)
+                except CircuitOpenError:
+                    # The host is known to be down or blocking; retrying only wastes time
+                    raise
                 except Exception as e:
                     last_exception = e
                     
@@ -53,6 +67,7 @@ def retry_with_backoff(
                         f"Retrying in {delay:.2f}s..."
                     )
                     
+                    _count_retry(args, delay)
                     await asyncio.sleep(delay)
             
             raise last_exception
@@ -76,12 +91,15 @@ def retry(max_attempts: int = 3, delay: float = 5.0):
             for attempt in range(max_attempts):
                 try:
                     return await func(*args, **kwargs)
+                except CircuitOpenError:
+                    raise
                 except Exception as e:
                     if attempt == max_attempts - 1:
                         logger.error(f"{func.__name__} failed after {max_attempts} attempts: {e}")
                         raise
                     
                     logger.warning(f"{func.__name__} attempt {attempt + 1} failed: {e}. Retrying in {delay}s...")
+                    _count_retry(args, delay)
                     await asyncio.sleep(delay)
         
         return wrapper
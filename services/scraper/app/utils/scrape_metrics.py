@@ -0,0 +1,230 @@
+"""
+Scrape Metrics
+Per-source stage timers and counters, per-run breakdowns and Prometheus export
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Where a scraper's time goes
+STAGES = ("fetch", "parse", "write", "sleep", "rate_limit")
+
+# Plain counters
+COUNTERS = ("requests", "errors", "retries", "bytes_downloaded", "rows_written")
+
+# Fetch latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class ScrapeMetrics:
+    """
+    Cumulative timers and counters of one source
+
+    Fetch sites, parsers, the bulk writer, DelayManager and the retry
+    decorators all report into the source's metrics. The values only ever
+    grow (like Prometheus counters), so the breakdown of one run is the
+    difference between a snapshot taken at its start and one at its end.
+    """
+
+    def __init__(self, source: str):
+        """
+        Initialize metrics
+
+        Args:
+            source: Source name (e.g. "CardMarket")
+        """
+        self.source = source
+        self.stage_seconds: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self.stage_count: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self.counters: Dict[str, int] = {name: 0 for name in COUNTERS}
+        self.latency_buckets: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)  # Last one is +Inf
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """
+        Add time spent in a stage
+        """
+        self.stage_seconds[stage] += seconds
+        self.stage_count[stage] += 1
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """
+        Time a block as one occurrence of a stage
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - started)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Increase a counter
+        """
+        self.counters[name] += value
+
+    def observe_fetch(self, seconds: float, status_code: Optional[int] = None, bytes_downloaded: int = 0) -> None:
+        """
+        Record one HTTP request
+
+        Args:
+            seconds: Time until the response (or the error)
+            status_code: Response status (None for transport errors)
+            bytes_downloaded: Body bytes received
+        """
+        self.add_time("fetch", seconds)
+        self.counters["requests"] += 1
+        self.counters["bytes_downloaded"] += bytes_downloaded
+        if status_code is None or status_code >= 400:
+            self.counters["errors"] += 1
+
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.latency_buckets[i] += 1
+                break
+        else:
+            self.latency_buckets[-1] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current cumulative values
+        """
+        return {
+            "stage_seconds": dict(self.stage_seconds),
+            "stage_count": dict(self.stage_count),
+            "counters": dict(self.counters),
+            "latency_buckets": list(self.latency_buckets),
+        }
+
+
+def run_breakdown(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Per-run breakdown for ScrapeLog.timings from two snapshots
+
+    The counters are per source, not per run: anything else of the source
+    running in between (a job worker unit or an orchestrator trigger next
+    to the service cycle) is included too. Stage seconds are summed over
+    concurrent tasks, so with parallel fetches (eBay sites, CardTrader
+    workers) a stage such as sleep can exceed the run's wall-clock time.
+
+    Args:
+        before: snapshot() at the start of the run
+        after: snapshot() at the end of the run
+
+    Returns:
+        {"stages": {stage: {"seconds", "count"}}, counters...,
+         "fetch_latency": {"le_<bound>": requests, ..., "le_inf": requests}}
+    """
+    breakdown: Dict[str, Any] = {
+        "stages": {
+            stage: {
+                "seconds": round(after["stage_seconds"][stage] - before["stage_seconds"][stage], 3),
+                "count": after["stage_count"][stage] - before["stage_count"][stage],
+            }
+            for stage in STAGES
+        },
+    }
+    for name in COUNTERS:
+        breakdown[name] = after["counters"][name] - before["counters"][name]
+
+    # Per-bucket (not cumulative) request counts
+    bounds = [f"le_{bound:g}" for bound in LATENCY_BUCKETS] + ["le_inf"]
+    breakdown["fetch_latency"] = {
+        bound: new - old
+        for bound, old, new in zip(bounds, before["latency_buckets"], after["latency_buckets"])
+    }
+    return breakdown
+
+
+def format_breakdown(breakdown: Dict[str, Any]) -> str:
+    """
+    One-line summary of a run breakdown for logs
+    """
+    stages = breakdown["stages"]
+    return (
+        f"fetch {stages['fetch']['seconds']:.1f}s ({breakdown['requests']} req, "
+        f"{breakdown['bytes_downloaded'] / 1024 / 1024:.1f} MiB, {breakdown['errors']} errors) | "
+        f"parse {stages['parse']['seconds']:.1f}s | write {stages['write']['seconds']:.1f}s | "
+        f"sleep {stages['sleep']['seconds']:.1f}s | rate limit {stages['rate_limit']['seconds']:.1f}s | "
+        f"{breakdown['retries']} retries"
+    )
+
+
+# One metrics object per source, shared by every scraper and worker of it
+_metrics: Dict[str, ScrapeMetrics] = {}
+
+
+def get_scrape_metrics(source: str) -> ScrapeMetrics:
+    """
+    Get the metrics of a source, creating them on first use
+    """
+    metrics = _metrics.get(source)
+    if metrics is None:
+        metrics = _metrics[source] = ScrapeMetrics(source)
+    return metrics
+
+
+def source_of(scraper: Any) -> str:
+    """
+    Metrics source name of a scraper instance
+    """
+    return getattr(scraper, "source_name", None) or type(scraper).__name__
+
+
+def prometheus_metrics() -> str:
+    """
+    Every source's metrics in the Prometheus text exposition format
+    """
+    lines = [
+        "# HELP scraper_stage_seconds_total Time spent per scrape stage",
+        "# TYPE scraper_stage_seconds_total counter",
+    ]
+    for source, metrics in _metrics.items():
+        for stage in STAGES:
+            lines.append(f'scraper_stage_seconds_total{{source="{source}",stage="{stage}"}} {metrics.stage_seconds[stage]:.6f}')
+
+    for name in COUNTERS:
+        lines.append(f"# TYPE scraper_{name}_total counter")
+        for source, metrics in _metrics.items():
+            lines.append(f'scraper_{name}_total{{source="{source}"}} {metrics.counters[name]}')
+
+    lines.append("# HELP scraper_fetch_duration_seconds HTTP request latency")
+    lines.append("# TYPE scraper_fetch_duration_seconds histogram")
+    for source, metrics in _metrics.items():
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, metrics.latency_buckets):
+            cumulative += count
+            lines.append(f'scraper_fetch_duration_seconds_bucket{{source="{source}",le="{bound:g}"}} {cumulative}')
+        cumulative += metrics.latency_buckets[-1]
+        lines.append(f'scraper_fetch_duration_seconds_bucket{{source="{source}",le="+Inf"}} {cumulative}')
+        lines.append(f'scraper_fetch_duration_seconds_sum{{source="{source}"}} {metrics.stage_seconds["fetch"]:.6f}')
+        lines.append(f'scraper_fetch_duration_seconds_count{{source="{source}"}} {cumulative}')
+
+    return "\n".join(lines) + "\n"
+
+
+async def start_metrics_server(port: int) -> Any:
+    """
+    Serve prometheus_metrics() on http://0.0.0.0:<port>/metrics
+
+    Returns:
+        The aiohttp runner (call cleanup() on shutdown)
+    """
+    # Only the service process serves metrics; parse workers never import aiohttp
+    from aiohttp import web
+
+    async def handle_metrics(request: Any) -> Any:
+        return web.Response(text=prometheus_metrics(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", port).start()
+    logger.info(f"📈 Metrics at http://0.0.0.0:{port}/metrics")
+    return runner
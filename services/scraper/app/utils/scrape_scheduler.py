@@ -0,0 +1,187 @@
+"""
+Priority Scrape Scheduler
+Spends a per-cycle request budget on the scrape units most likely to have changed
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, text
+
+from app.config import settings
+from app.config_cardmarket import cardmarket_config
+from app.database import AsyncSessionLocal
+from app.models.blueprint_fingerprint import BlueprintFingerprint
+from app.models.scrape_job import ScrapeJob
+
+logger = logging.getLogger(__name__)
+
+# Estimated requests per unit type (CardTrader expansions are sized per
+# blueprint, CardMarket singles by the per-set page cap)
+UNIT_REQUEST_COST = {
+    "cardtrader_expansion": 1,
+    "cardmarket_singles": 1,
+    "cardmarket_sealed": 1,
+    "ebay_search": 3,
+}
+
+# Blueprints assumed for an expansion that was never crawled
+DEFAULT_EXPANSION_BLUEPRINTS = 150
+
+# Queue priorities are integers; scores are scaled by this before storing
+PRIORITY_SCALE = 10
+
+_SET_STATS_QUERY = text("""
+    SELECT product_set, AVG(volatility) AS volatility, AVG(liquidity_score) AS liquidity
+    FROM market_statistics
+    WHERE calculated_at > NOW() - make_interval(days => :days)
+      AND product_set IS NOT NULL
+    GROUP BY product_set
+""")
+
+
+def normalize_set_name(name: Optional[str]) -> str:
+    """
+    Match key for set names across sources ("Scarlet-Violet-151" == "scarlet violet 151")
+    """
+    return " ".join((name or "").replace("-", " ").replace("_", " ").lower().split())
+
+
+class PriorityScheduler:
+    """
+    Ranks scrape units by expected information gain per request
+
+    A unit's gain grows with the hours since it was last fetched, scaled by
+    how much its set's prices move (volatility), how actively it trades
+    (liquidity) and how popular the set is. Units are then picked by gain
+    per estimated request until the cycle's budget is spent; everything
+    else waits a cycle and ranks higher next time because it has aged.
+    """
+
+    def __init__(self, request_budget: Optional[int] = None):
+        """
+        Initialize scheduler
+
+        Args:
+            request_budget: Estimated requests per cycle (defaults to settings.SCRAPE_REQUEST_BUDGET)
+        """
+        self.request_budget = request_budget or settings.SCRAPE_REQUEST_BUDGET
+        self.popularity = {normalize_set_name(name): score for name, score in settings.POPULAR_SETS.items()}
+
+        self._set_stats: Dict[str, Tuple[float, float]] = {}
+        self._last_fetched: Dict[Tuple[str, str], datetime] = {}
+        self._expansion_sizes: Dict[str, int] = {}
+        self._default_stats: Tuple[float, float] = (0.0, 0.0)
+
+    async def load_signals(self) -> None:
+        """
+        Load market statistics, fetch history and expansion sizes
+        """
+        async with AsyncSessionLocal() as session:
+            try:
+                result = await session.execute(_SET_STATS_QUERY, {"days": settings.PRIORITY_STATS_DAYS})
+                self._set_stats = {
+                    normalize_set_name(row.product_set): (float(row.volatility or 0), float(row.liquidity or 0))
+                    for row in result
+                }
+            except Exception as e:
+                # market_statistics belongs to the analysis service and may not exist yet
+                logger.warning(f"No market statistics for prioritization: {e}")
+                await session.rollback()
+                self._set_stats = {}
+
+            result = await session.execute(
+                select(ScrapeJob.unit_type, ScrapeJob.unit_key, ScrapeJob.completed_at)
+                .where(ScrapeJob.unit_type.in_(UNIT_REQUEST_COST), ScrapeJob.completed_at.isnot(None))
+            )
+            self._last_fetched = {(row.unit_type, row.unit_key): row.completed_at for row in result}
+
+            result = await session.execute(
+                select(BlueprintFingerprint.expansion_id, func.count())
+                .group_by(BlueprintFingerprint.expansion_id)
+            )
+            self._expansion_sizes = {str(expansion_id): count for expansion_id, count in result.all()}
+
+        # Units without set statistics (eBay keywords, new sets) rank as an average set
+        if self._set_stats:
+            volatilities, liquidities = zip(*self._set_stats.values())
+            self._default_stats = (
+                sum(volatilities) / len(volatilities),
+                sum(liquidities) / len(liquidities),
+            )
+
+        logger.info(
+            f"Scheduler signals: {len(self._set_stats)} sets with stats, "
+            f"{len(self._last_fetched)} units with fetch history"
+        )
+
+    def estimated_cost(self, unit: Dict[str, Any]) -> int:
+        """
+        Estimated requests to scrape a unit
+        """
+        if unit["unit_type"] == "cardtrader_expansion":
+            blueprints = self._expansion_sizes.get(str(unit["unit_key"]), DEFAULT_EXPANSION_BLUEPRINTS)
+            return 1 + blueprints
+        if unit["unit_type"] == "cardmarket_singles":
+            return max(1, cardmarket_config.MAX_PAGES_PER_SET)
+        return UNIT_REQUEST_COST.get(unit["unit_type"], 1)
+
+    def score(self, unit: Dict[str, Any], now: Optional[datetime] = None) -> float:
+        """
+        Expected information gain of scraping a unit now
+        """
+        now = now or datetime.now(timezone.utc)
+        max_age = settings.PRIORITY_MAX_AGE_HOURS
+
+        # Staleness: hours since the last fetch, never-fetched units count as maximally stale
+        last_fetched = self._last_fetched.get((unit["unit_type"], str(unit["unit_key"])))
+        age_hours = max_age if last_fetched is None else (now - last_fetched).total_seconds() / 3600
+        age_hours = min(max(age_hours, 0.0), max_age)
+
+        set_key = normalize_set_name(unit.get("set_name"))
+        volatility, liquidity = self._set_stats.get(set_key, self._default_stats)
+        popularity = self.popularity.get(set_key, settings.DEFAULT_POPULARITY)
+
+        value = (
+            1.0
+            + settings.PRIORITY_WEIGHT_VOLATILITY * min(volatility, 100.0) / 100.0
+            + settings.PRIORITY_WEIGHT_LIQUIDITY * min(liquidity, 100.0) / 100.0
+            + settings.PRIORITY_WEIGHT_POPULARITY * min(popularity, 100.0) / 100.0
+        )
+        return age_hours * value
+
+    def select(self, units: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Pick the units to scrape this cycle within the request budget
+
+        Each selected unit gets a queue priority, so the best ones are also
+        claimed first.
+
+        Args:
+            units: Candidate units; set_name is used to look up set signals
+
+        Returns:
+            Selected units, best first
+        """
+        now = datetime.now(timezone.utc)
+        ranked = sorted(
+            ((self.score(unit, now), self.estimated_cost(unit), unit) for unit in units),
+            key=lambda item: item[0] / item[1],
+            reverse=True,
+        )
+
+        selected = []
+        spent = 0
+        for gain, cost, unit in ranked:
+            if gain <= 0 or spent + cost > self.request_budget:
+                continue
+            unit["priority"] = int(gain * PRIORITY_SCALE)
+            selected.append(unit)
+            spent += cost
+
+        logger.info(
+            f"🎯 Scheduled {len(selected)}/{len(units)} units, "
+            f"~{spent}/{self.request_budget} requests"
+        )
+        return selected
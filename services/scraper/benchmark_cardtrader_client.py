@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+CardTrader HTTP Client Benchmark
+Compares a new httpx client per request (old behaviour) against the pooled
+client used by CardTraderScraperV2, using a local stub of the CardTrader API.
+
+Usage:
+    python benchmark_cardtrader_client.py [--requests 500] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+# The scraper config requires a database URL and token; the benchmark never
+# connects to the database or the real API
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/benchmark")
+os.environ.setdefault("CARDTRADER_API_TOKEN", "benchmark")
+
+import httpx
+from aiohttp import web
+
+from app.scrapers.cardtrader_scraper_new import CardTraderScraperV2
+from app.utils.rate_limiter import AdaptiveRateLimiter
+
+
+def build_stub_app(listings_per_blueprint: int = 20) -> web.Application:
+    """Minimal stand-in for GET /marketplace/products"""
+
+    async def marketplace_products(request: web.Request) -> web.Response:
+        blueprint_id = request.query.get("blueprint_id", "0")
+        listings = [
+            {
+                "id": i,
+                "price_cents": 100 + i,
+                "price_currency": "EUR",
+                "quantity": 1,
+                "properties_hash": {"condition": "Near Mint", "pokemon_language": "en"},
+            }
+            for i in range(listings_per_blueprint)
+        ]
+        return web.json_response({blueprint_id: listings})
+
+    app = web.Application()
+    app.router.add_get("/marketplace/products", marketplace_products)
+    return app
+
+
+async def run_per_call_clients(api_base: str, total: int, workers: int) -> list:
+    """Old behaviour: open and close a client for every request"""
+    latencies = []
+
+    async def fetch(blueprint_id: int):
+        start = time.perf_counter()
+        async with httpx.AsyncClient() as client:
+            response = await client.get(
+                f"{api_base}/marketplace/products",
+                params={"blueprint_id": blueprint_id},
+                timeout=30.0,
+            )
+            response.raise_for_status()
+            response.json()
+        latencies.append(time.perf_counter() - start)
+
+    await run_workers(fetch, total, workers)
+    return latencies
+
+
+async def run_pooled_client(api_base: str, total: int, workers: int) -> list:
+    """New behaviour: every request goes through the scraper's shared client"""
+    latencies = []
+    scraper = CardTraderScraperV2()
+    scraper.api_base = api_base
+    scraper.rate_limiter = AdaptiveRateLimiter("benchmark", total, total)  # Don't throttle the benchmark
+
+    async def fetch(blueprint_id: int):
+        start = time.perf_counter()
+        async for _ in scraper._iter_marketplace_listings(blueprint_id):
+            pass
+        latencies.append(time.perf_counter() - start)
+
+    await scraper.setup_client()
+    try:
+        await run_workers(fetch, total, workers)
+    finally:
+        await scraper.cleanup_client()
+    return latencies
+
+
+async def run_workers(fetch, total: int, workers: int):
+    """Run fetch(i) for i in range(total) across a fixed number of workers"""
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async def worker():
+        while not queue.empty():
+            await fetch(queue.get_nowait())
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+
+
+def report(label: str, latencies: list, wall: float):
+    """Print latency summary"""
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<22} {len(latencies):>6} req  "
+        f"{len(latencies) / wall:>8.1f} req/s  "
+        f"p50 {statistics.median(ordered) * 1000:>6.2f} ms  "
+        f"p95 {p95 * 1000:>6.2f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    runner = web.AppRunner(build_stub_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    api_base = f"http://127.0.0.1:{port}"
+
+    try:
+        for label, bench in (
+            ("per-call clients", run_per_call_clients),
+            ("pooled client", run_pooled_client),
+        ):
+            start = time.perf_counter()
+            latencies = await bench(api_base, args.requests, args.workers)
+            report(label, latencies, time.perf_counter() - start)
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+CardTrader JSON Decoding Benchmark
+Compares response.json() on a large marketplace response (old behaviour)
+against the streamed decode used by CardTraderScraperV2: time to the first
+listing, total time and peak Python memory.
+
+The body is served in chunks by an in-process transport, with a small
+delay per chunk to stand in for the network.
+
+Usage:
+    python benchmark_cardtrader_json.py [--listings 20000] [--chunk-kb 64] [--chunk-delay-ms 1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+# The app config requires a database URL; the benchmark never connects
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/benchmark")
+
+import httpx
+
+from app.utils.json_stream import IJSON_AVAILABLE, iter_json_items
+
+BLUEPRINT_ID = 12345
+
+
+def build_body(listings: int) -> bytes:
+    """A /marketplace/products response with `listings` listings"""
+    return json.dumps({
+        str(BLUEPRINT_ID): [
+            {
+                "id": i,
+                "blueprint_id": BLUEPRINT_ID,
+                "name_en": "Charizard ex",
+                "price_cents": 100 + i,
+                "price_currency": "EUR",
+                "quantity": 1 + i % 4,
+                "description": "Pack fresh, shipped in a toploader",
+                "properties_hash": {"condition": "Near Mint", "pokemon_language": "en", "signed": False},
+                "user": {"id": i % 500, "username": f"seller_{i % 500}", "country_code": "DE"},
+            }
+            for i in range(listings)
+        ]
+    }).encode("utf-8")
+
+
+def build_client(body: bytes, chunk_size: int, chunk_delay: float) -> httpx.AsyncClient:
+    """Client whose every response is `body`, streamed in chunks"""
+
+    async def chunks():
+        for start in range(0, len(body), chunk_size):
+            await asyncio.sleep(chunk_delay)
+            yield body[start:start + chunk_size]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"Content-Type": "application/json"}, content=chunks())
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def full_decode(client: httpx.AsyncClient):
+    """Old behaviour: read the whole body, build the whole object tree"""
+    response = await client.get("http://cardtrader.test/marketplace/products")
+    for listing in response.json()[str(BLUEPRINT_ID)]:
+        yield listing
+
+
+async def streamed_decode(client: httpx.AsyncClient):
+    """New behaviour: decode listings one at a time while the body arrives"""
+    request = client.build_request("GET", "http://cardtrader.test/marketplace/products")
+    response = await client.send(request, stream=True)
+    try:
+        async for listing in iter_json_items(response, f"{BLUEPRINT_ID}.item"):
+            yield listing
+    finally:
+        await response.aclose()
+
+
+async def consume(decode, client: httpx.AsyncClient):
+    """Consume one response like _process_blueprint does"""
+    start = time.perf_counter()
+    first = None
+    count = 0
+
+    async for listing in decode(client):
+        if first is None:
+            first = time.perf_counter() - start
+        count += listing["price_cents"] > 0
+
+    return count, first, time.perf_counter() - start
+
+
+async def measure(label: str, decode, client_factory):
+    """Time one pass, then measure peak memory in a second (traced) pass"""
+    async with client_factory() as client:
+        count, first, total = await consume(decode, client)
+
+    # tracemalloc slows allocation down a lot, so it gets its own pass
+    async with client_factory() as client:
+        tracemalloc.start()
+        await consume(decode, client)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(
+        f"{label:<18} {count:>7} listings  "
+        f"first {first * 1000:>8.1f} ms  "
+        f"total {total * 1000:>8.1f} ms  "
+        f"peak {peak / 1024 / 1024:>7.1f} MiB"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--listings", type=int, default=20000)
+    parser.add_argument("--chunk-kb", type=int, default=64)
+    parser.add_argument("--chunk-delay-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    body = build_body(args.listings)
+    print(f"Body: {len(body) / 1024 / 1024:.1f} MiB, ijson {'available' if IJSON_AVAILABLE else 'not installed (full-decode fallback)'}")
+
+    for label, decode in (
+        ("response.json()", full_decode),
+        ("streamed", streamed_decode),
+    ):
+        await measure(label, decode, lambda: build_client(body, args.chunk_kb * 1024, args.chunk_delay_ms / 1000))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
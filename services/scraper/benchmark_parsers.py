@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+HTML Parser Parity Check and Benchmark
+Runs the CardMarket, eBay and TCGPlayer parsers over the saved HTML fixtures
+with every parser backend, checks that they produce the same rows, and
+reports rows parsed per second.
+
+Usage:
+    python benchmark_parsers.py [--seconds 2.0]
+
+Exits with status 1 if any backend's output differs from BeautifulSoup's.
+The same parity is asserted by test_parsers.py (python -m pytest test_parsers.py).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+# The scraper config requires a database URL; the benchmark never connects
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/benchmark")
+
+from app.config import settings
+from app.scrapers.cardmarket_production import CardMarketProductionScraper
+from app.scrapers.ebay_scraper import EbayScraper
+from app.scrapers.tcgplayer_scraper import TCGPlayerScraper
+from app.utils.html_parser import SELECTOLAX_AVAILABLE
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "html"
+
+# Timestamps differ between runs, so they are left out of the comparison
+VOLATILE_FIELDS = {"scraped_at", "sold_date"}
+
+
+def build_cases():
+    """(label, fixture file, async parse function) for every parser"""
+    cardmarket = CardMarketProductionScraper()
+    ebay = EbayScraper(session=None)
+    tcgplayer = TCGPlayerScraper(session=None)
+
+    async def ebay_parse(html):
+        return ebay._parse_search_results(html, "ebay.de", "Pokemon Card")
+
+    async def tcgplayer_parse(html):
+        return tcgplayer._parse_search_results(html, "151")
+
+    return [
+        ("cardmarket singles", "cardmarket_singles.html",
+         lambda html: cardmarket.parse_singles_page(html, "Scarlet-Violet-151")),
+        ("cardmarket sealed", "cardmarket_sealed.html", cardmarket.parse_sealed_page),
+        ("ebay sold", "ebay_sold.html", ebay_parse),
+        ("tcgplayer search", "tcgplayer_search.html", tcgplayer_parse),
+    ]
+
+
+def comparable(rows):
+    """Drop volatile fields so rows can be compared across backends"""
+    return [{k: v for k, v in row.items() if k not in VOLATILE_FIELDS} for row in rows]
+
+
+async def run_backend(backend: str, parse, html: str, seconds: float):
+    """Parse repeatedly for ~seconds; return (rows, rows per second)"""
+    settings.PARSER_BACKEND = backend
+    rows = await parse(html)
+
+    parsed = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        parsed += len(await parse(html))
+    return rows, parsed / (time.perf_counter() - start)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=2.0, help="Time per backend per fixture")
+    args = parser.parse_args()
+
+    backends = ["bs4"]
+    if SELECTOLAX_AVAILABLE:
+        backends.append("selectolax")
+    else:
+        print("selectolax is not installed; only benchmarking bs4")
+
+    mismatches = 0
+    print(f"{'parser':<20} {'backend':<12} {'rows':>6} {'rows/s':>10} {'speedup':>8}  parity")
+
+    for label, fixture, parse in build_cases():
+        html = (FIXTURES_DIR / fixture).read_text(encoding="utf-8")
+        baseline_rows, baseline_rate = None, None
+
+        for backend in backends:
+            rows, rate = await run_backend(backend, parse, html, args.seconds)
+
+            if baseline_rows is None:
+                baseline_rows, baseline_rate = comparable(rows), rate
+                parity = "baseline"
+            elif comparable(rows) == baseline_rows:
+                parity = "ok"
+            else:
+                parity = "MISMATCH"
+                mismatches += 1
+                for expected, actual in zip(baseline_rows, comparable(rows)):
+                    if expected != actual:
+                        print(f"  expected {expected}\n  actual   {actual}")
+                        break
+
+            print(f"{label:<20} {backend:<12} {len(rows):>6} {rate:>10.0f} {rate / baseline_rate:>7.1f}x  {parity}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
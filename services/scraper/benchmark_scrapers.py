@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+Offline Scraper Throughput Benchmark
+Runs CardMarket, CardTrader, eBay and TCGPlayer (HTML search and Partner
+API) through their real fetch, parse and ingest code against recorded
+responses (app.utils.replay), and reports pages/sec, rows/sec, rows per
+request, CPU per row and peak RSS per scraper.
+
+Responses come from recordings made once against the live sites:
+
+    HTTP_RECORD_DIR=fixtures/replay/ebay python run_ebay.py
+    python benchmark_scrapers.py --fixtures fixtures/replay
+
+Without --fixtures, recordings are generated from the saved HTML fixtures
+(fixtures/html) and synthetic CardTrader and TCGPlayer API catalogs (a
+stub of each API), so the benchmark runs
+out of the box. Rows go through the ingest pipeline and row conversion but
+are discarded instead of COPYed, so no database is needed. Each scraper
+runs in its own process so its peak RSS is its own.
+
+Politeness delays and rate limits are lifted unless --pacing is given, so
+the numbers reflect the scrapers' own overhead plus the injected latency.
+
+Usage:
+    python benchmark_scrapers.py [--sources cardmarket,ebay] [--units 5]
+        [--latency-ms 20] [--jitter-ms 10] [--error-rate 0.0]
+        [--connect-error-rate 0.0] [--pacing]
+        [--save results.json] [--compare baseline.json] [--tolerance 0.2]
+
+Exits with status 1 if --compare finds a metric worse than the baseline by
+more than the tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import urlsplit
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+# The scraper config requires a database URL; the benchmark never connects
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/benchmark")
+os.environ.setdefault("CARDTRADER_API_TOKEN", "benchmark")
+
+import httpx
+
+from app.config_cardmarket import cardmarket_config
+from app.config_cardtrader import config as cardtrader_config
+from app.config_ebay import config as ebay_config
+from app.config_tcgplayer import config as tcgplayer_config
+from app.utils.bulk_writer import RawPriceBulkWriter
+from app.utils.delay_manager import DelayManager
+from app.utils import rate_limiter
+from app.utils.http_cache import http_cache
+from app.utils.rate_limiter import AdaptiveRateLimiter
+from app.utils.replay import ReplayTransport, install_transport, save_recording
+
+SOURCES = ("cardmarket", "cardtrader", "ebay", "tcgplayer", "tcgplayer_api")
+HTML_FIXTURES_DIR = Path(__file__).parent / "fixtures" / "html"
+
+# CardTrader catalog generated when there are no recordings
+SEED_BLUEPRINTS_PER_EXPANSION = 20
+SEED_LISTINGS_PER_BLUEPRINT = 50
+
+# TCGPlayer API catalog generated when there are no recordings
+SEED_API_GROUPS = 150
+SEED_API_PRODUCTS_PER_GROUP = 250
+SEED_API_SUB_TYPES = ("Normal", "Reverse Holofoil")
+
+# Higher is better for these; lower is better for the rest
+HIGHER_IS_BETTER = ("pages_per_sec", "rows_per_sec")
+COMPARED_METRICS = ("pages_per_sec", "rows_per_sec", "cpu_us_per_row", "peak_rss_mib")
+
+UNTHROTTLED = 1_000_000.0
+
+
+class DiscardingBulkWriter(RawPriceBulkWriter):
+    """Bulk writer that converts rows like the real one but drops them instead of COPY"""
+
+    async def flush(self) -> int:
+        records, self._buffer = self._buffer, []
+        self._seen = {}
+        self.total_written += len(records)
+        return len(records)
+
+
+# ---------------------------------------------------------------------------
+# Work plan (shared by seeding and the benchmark runs)
+# ---------------------------------------------------------------------------
+
+def cardmarket_sets(units: int) -> List[str]:
+    return cardmarket_config.PRIORITY_SETS[:units]
+
+
+def ebay_keywords(units: int) -> List[str]:
+    return ebay_config.SEARCH_KEYWORDS[:units]
+
+
+def tcgplayer_sets(units: int) -> List[str]:
+    return tcgplayer_config.TARGET_SETS[:units]
+
+
+# ---------------------------------------------------------------------------
+# Seeded recordings (used when no real recordings are given)
+# ---------------------------------------------------------------------------
+
+def seed_recordings(root: Path, units: int) -> None:
+    """Generate recordings for every source from the HTML fixtures"""
+    html = lambda name: (HTML_FIXTURES_DIR / name).read_text(encoding="utf-8")
+    html_headers = {"content-type": "text/html; charset=utf-8"}
+    json_headers = {"content-type": "application/json"}
+
+    # CardMarket: three linked pages per set
+    singles = html("cardmarket_singles.html")
+    for set_name in cardmarket_sets(units):
+        body = singles.replace("Scarlet-Violet-151", set_name).encode("utf-8")
+        first_page = f"{cardmarket_config.POKEMON_BASE}/Products/Singles/{set_name}"
+        for url in (first_page, f"{first_page}?site=2", f"{first_page}?site=3"):
+            save_recording(str(root / "cardmarket"), "GET", url, 200, html_headers, body)
+
+    # CardTrader: expansions -> blueprints -> marketplace listings
+    api = cardtrader_config.API_BASE_URL
+    expansions = [{"id": 1000 + i, "game_id": 5, "code": f"exp{i}", "name": f"Expansion {i}"} for i in range(units)]
+    expansions.append({"id": 1, "game_id": 1, "code": "other", "name": "Other game"})
+    save_recording(str(root / "cardtrader"), "GET", f"{api}/expansions", 200, json_headers, json.dumps(expansions).encode())
+    for expansion in expansions[:units]:
+        blueprints = [
+            {"id": expansion["id"] * 100 + b, "name": f"Card {b}", "expansion_id": expansion["id"]}
+            for b in range(SEED_BLUEPRINTS_PER_EXPANSION)
+        ]
+        save_recording(
+            str(root / "cardtrader"), "GET", f"{api}/blueprints?expansion_id={expansion['id']}",
+            200, json_headers, json.dumps(blueprints).encode(),
+        )
+        for blueprint in blueprints:
+            listings = {str(blueprint["id"]): [
+                {
+                    "id": blueprint["id"] * 1000 + n,
+                    "blueprint_id": blueprint["id"],
+                    "name_en": blueprint["name"],
+                    "price_cents": 100 + n * 7,
+                    "price_currency": "EUR",
+                    "quantity": 1 + n % 4,
+                    "properties_hash": {"condition": "Near Mint", "pokemon_language": "en"},
+                    "user": {"id": n, "username": f"seller_{n}", "country_code": "DE"},
+                }
+                for n in range(SEED_LISTINGS_PER_BLUEPRINT)
+            ]}
+            save_recording(
+                str(root / "cardtrader"), "GET", f"{api}/marketplace/products?blueprint_id={blueprint['id']}",
+                200, json_headers, json.dumps(listings).encode(),
+            )
+
+    # eBay: every site, three result pages per keyword
+    from app.scrapers.ebay_scraper import EbayScraper
+    sold = html("ebay_sold.html").encode("utf-8")
+    for site in ebay_config.EBAY_SITES:
+        for keyword in ebay_keywords(units):
+            for page in (1, 2, 3):
+                url = EbayScraper._build_search_url(None, site, keyword, page)
+                save_recording(str(root / "ebay"), "GET", url, 200, html_headers, sold)
+
+    # TCGPlayer: every page of each set, then an empty page (same URL building as scrape_page)
+    search = html("tcgplayer_search.html").encode("utf-8")
+    for set_name in tcgplayer_sets(units):
+        for page in range(1, tcgplayer_config.MAX_PAGES_PER_SEARCH + 2):
+            url = httpx.URL(f"{tcgplayer_config.BASE_URL}/search/pokemon/product", params={
+                "productLineName": "pokemon",
+                "setName": set_name.replace(" ", "%20"),
+                "page": page,
+                "view": "grid",
+            })
+            body = search if page <= tcgplayer_config.MAX_PAGES_PER_SEARCH else b"<html><body></body></html>"
+            save_recording(str(root / "tcgplayer"), "GET", str(url), 200, html_headers, body)
+
+    seed_tcgplayer_api(root / "tcgplayer_api", units)
+
+
+def seed_tcgplayer_api(directory: Path, units: int) -> None:
+    """Stub Partner API: token, group list, catalog pages and pricing batches"""
+    json_headers = {"content-type": "application/json"}
+    base = tcgplayer_config.API_BASE_URL.rstrip("/")
+    api = f"{base}/{tcgplayer_config.API_VERSION}" if tcgplayer_config.API_VERSION else base
+    limit = tcgplayer_config.API_PAGE_SIZE
+
+    def save(method: str, url: Any, payload: Dict[str, Any]) -> None:
+        save_recording(str(directory), method, str(url), 200, json_headers, json.dumps(payload).encode())
+
+    def save_pages(path: str, params: Dict[str, Any], results: List[Dict[str, Any]]) -> None:
+        for offset in range(0, max(len(results), 1), limit):
+            url = httpx.URL(f"{api}{path}", params={**params, "offset": offset, "limit": limit})
+            save("GET", url, {"success": True, "errors": [], "totalItems": len(results), "results": results[offset:offset + limit]})
+
+    save("POST", f"{base}/token", {"access_token": "benchmark", "token_type": "bearer", "expires_in": 1209599})
+
+    set_groups = [{"groupId": 3000 + i, "name": f"SV{i:02d}: {set_name}"} for i, set_name in enumerate(tcgplayer_sets(units))]
+    other_groups = [{"groupId": 1000 + i, "name": f"Other Set {i}"} for i in range(SEED_API_GROUPS - len(set_groups))]
+    save_pages(f"/catalog/categories/{tcgplayer_config.API_CATEGORY_ID}/groups", {}, other_groups + set_groups)
+
+    for group in set_groups:
+        products = [
+            {
+                "productId": group["groupId"] * 1000 + n,
+                "name": f"Card {n}",
+                "groupId": group["groupId"],
+                "url": f"https://www.tcgplayer.com/product/{group['groupId'] * 1000 + n}",
+                "extendedData": [{"name": "Number", "value": f"{n + 1:03d}/{SEED_API_PRODUCTS_PER_GROUP}"}],
+            }
+            for n in range(SEED_API_PRODUCTS_PER_GROUP)
+        ]
+        save_pages("/catalog/products", {
+            "categoryId": tcgplayer_config.API_CATEGORY_ID,
+            "groupId": group["groupId"],
+            "productTypes": ",".join(tcgplayer_config.API_PRODUCT_TYPES),
+            "getExtendedFields": "true",
+        }, products)
+
+        # Same batching as TCGPlayerApiClient.fetch_prices
+        ids = [product["productId"] for product in products]
+        batch_size = tcgplayer_config.API_PRICING_BATCH_SIZE
+        for i in range(0, len(ids), batch_size):
+            batch = ids[i:i + batch_size]
+            prices = [
+                {"productId": product_id, "subTypeName": sub_type, "marketPrice": 1.5 + product_id % 97, "midPrice": 2.0 + product_id % 97}
+                for product_id in batch
+                for sub_type in SEED_API_SUB_TYPES
+            ]
+            url = f"{api}/pricing/product/{','.join(str(product_id) for product_id in batch)}"
+            save("GET", httpx.URL(url), {"success": True, "errors": [], "results": prices})
+
+
+# ---------------------------------------------------------------------------
+# One source, in a child process
+# ---------------------------------------------------------------------------
+
+class UnthrottledLimiter(AdaptiveRateLimiter):
+    """Host limiter that never waits, whatever ceiling the scrapers configure"""
+
+    def cap(self, max_rate: float) -> None:
+        pass
+
+
+def unthrottle(url: str) -> None:
+    """Register a host limiter that never waits"""
+    host = urlsplit(url).hostname or url
+    rate_limiter._host_limiters[host] = UnthrottledLimiter(host, UNTHROTTLED, UNTHROTTLED)
+
+
+async def run_cardmarket(units: int, pacing: bool) -> int:
+    from app.scrapers.cardmarket_production import CardMarketProductionScraper
+    from app.utils.ingest_pipeline import RawPriceIngestPipeline
+
+    scraper = CardMarketProductionScraper()
+    if not pacing:
+        scraper.delay_manager = DelayManager(0, 0)
+        scraper.rate_limiter = AdaptiveRateLimiter("benchmark", UNTHROTTLED, UNTHROTTLED)
+
+    pipeline = RawPriceIngestPipeline()
+    pipeline.writer = DiscardingBulkWriter()
+    await scraper.setup_client()
+    try:
+        await scraper.crawl_singles(cardmarket_sets(units), pipeline, page_budget=10 ** 6)
+        await pipeline.close()
+    finally:
+        await scraper.cleanup_client()
+    return pipeline.total_written
+
+
+async def run_cardtrader(units: int, pacing: bool) -> int:
+    from app.scrapers.cardtrader_scraper_new import CardTraderScraperV2
+
+    scraper = CardTraderScraperV2()
+    scraper.fingerprints = None
+    scraper.catalog = None
+    scraper.pipeline.writer = DiscardingBulkWriter()
+    if not pacing:
+        scraper.rate_limiter = AdaptiveRateLimiter("benchmark", UNTHROTTLED, UNTHROTTLED)
+
+    # Same fan-out as scrape_all, without the checkpoint and scrape log
+    queue: asyncio.Queue = asyncio.Queue(maxsize=cardtrader_config.CONCURRENT_WORKERS * 10)
+
+    async def worker():
+        while True:
+            blueprint, expansion = await queue.get()
+            try:
+                await scraper._process_blueprint(blueprint, expansion)
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"Blueprint {blueprint['id']} failed: {e}")
+            finally:
+                queue.task_done()
+
+    await scraper.setup_client()
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, cardtrader_config.CONCURRENT_WORKERS))]
+    try:
+        for expansion in (await scraper.fetch_recent_expansions())[:units]:
+            for blueprint in await scraper.fetch_blueprints(expansion["id"]):
+                await queue.put((blueprint, expansion))
+        await queue.join()
+        await scraper.pipeline.close()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        await scraper.cleanup_client()
+    return scraper.pipeline.total_written
+
+
+async def run_ebay(units: int, pacing: bool) -> int:
+    from app.scrapers.ebay_scraper import EbayScraper
+
+    ebay_config.SEARCH_KEYWORDS = ebay_keywords(units)
+    scraper = EbayScraper()
+    scraper.pipeline.writer = DiscardingBulkWriter()
+    if not pacing:
+        scraper.delay_manager = DelayManager(0, 0)
+        for site in ebay_config.EBAY_SITES:
+            unthrottle(f"https://www.{site}/")
+
+    try:
+        await scraper.scrape_sites(ebay_config.EBAY_SITES)
+    finally:
+        await scraper.close()
+    return scraper.pipeline.total_written
+
+
+async def run_tcgplayer(units: int, pacing: bool) -> int:
+    from app.scrapers.tcgplayer_scraper import TCGPlayerScraper
+
+    scraper = TCGPlayerScraper()
+    scraper.pipeline.writer = DiscardingBulkWriter()
+    if not pacing:
+        scraper.delay_manager = DelayManager(0, 0)
+        unthrottle(tcgplayer_config.BASE_URL)
+
+    try:
+        for set_name in tcgplayer_sets(units):
+            await scraper.scrape_set(set_name)
+    finally:
+        await scraper.close()
+    return scraper.pipeline.total_written
+
+
+async def run_tcgplayer_api(units: int, pacing: bool) -> int:
+    from app.scrapers.tcgplayer_scraper import TCGPlayerScraper
+
+    tcgplayer_config.USE_API = True
+    tcgplayer_config.API_PUBLIC_KEY = tcgplayer_config.API_PUBLIC_KEY or "benchmark"
+    tcgplayer_config.API_PRIVATE_KEY = tcgplayer_config.API_PRIVATE_KEY or "benchmark"
+    tcgplayer_config.API_TOKEN_CACHE_FILE = ""  # Fetch the token once, like a first run
+    if not pacing:
+        unthrottle(tcgplayer_config.API_BASE_URL)  # Before the client registers the partner limit
+
+    scraper = TCGPlayerScraper()
+    scraper.pipeline.writer = DiscardingBulkWriter()
+    try:
+        await scraper.scrape_sets_api(tcgplayer_sets(units))
+    finally:
+        await scraper.close()
+    return scraper.pipeline.total_written
+
+
+RUNNERS = {
+    "cardmarket": run_cardmarket,
+    "cardtrader": run_cardtrader,
+    "ebay": run_ebay,
+    "tcgplayer": run_tcgplayer,
+    "tcgplayer_api": run_tcgplayer_api,
+}
+
+
+def cpu_seconds() -> float:
+    """CPU time of this process and its finished children (parse pool)"""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+async def run_child(args) -> Dict[str, Any]:
+    """Benchmark one source against its recordings"""
+    http_cache.enabled = False  # Every page must be fetched
+
+    transport = ReplayTransport(
+        str(Path(args.fixtures) / args.child),
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        connect_error_rate=args.connect_error_rate,
+        seed=args.seed,
+    )
+    install_transport(transport)
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    cpu_start = cpu_seconds()
+    start = time.perf_counter()
+
+    rows = await RUNNERS[args.child](args.units, args.pacing)
+
+    wall = time.perf_counter() - start
+    cpu = cpu_seconds() - cpu_start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+
+    return {
+        "source": args.child,
+        "seconds": round(wall, 3),
+        "pages": transport.served,
+        "rows": rows,
+        "pages_per_sec": round(transport.served / wall, 1),
+        "rows_per_sec": round(rows / wall, 1),
+        "rows_per_request": round(rows / transport.requests, 1) if transport.requests else None,
+        "cpu_us_per_row": round(cpu / rows * 1e6, 1) if rows else None,
+        "peak_rss_mib": round(peak_rss / 1024, 1),
+        "rss_growth_mib": round((peak_rss - rss_before) / 1024, 1),
+        **{f"http_{name}": value for name, value in transport.stats().items()},
+    }
+
+
+# ---------------------------------------------------------------------------
+# Parent: seed, run every source, report, compare
+# ---------------------------------------------------------------------------
+
+def run_source(source: str, fixtures: str, args) -> Dict[str, Any]:
+    """Run one source in a fresh interpreter and return its metrics"""
+    command = [
+        sys.executable, __file__,
+        "--child", source,
+        "--fixtures", fixtures,
+        "--units", str(args.units),
+        "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate),
+        "--connect-error-rate", str(args.connect_error_rate),
+        "--seed", str(args.seed),
+    ]
+    if args.pacing:
+        command.append("--pacing")
+
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{source} benchmark failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def report(results: List[Dict[str, Any]]) -> None:
+    print(
+        f"{'source':<14} {'pages':>6} {'rows':>7} {'pages/s':>9} {'rows/s':>10} {'rows/req':>9} "
+        f"{'CPU/row':>10} {'peak RSS':>10} {'missing':>8} {'errors':>7}"
+    )
+    for r in results:
+        cpu = f"{r['cpu_us_per_row']:.1f} us" if r["cpu_us_per_row"] is not None else "-"
+        per_request = f"{r['rows_per_request']:.1f}" if r.get("rows_per_request") is not None else "-"
+        print(
+            f"{r['source']:<14} {r['pages']:>6} {r['rows']:>7} {r['pages_per_sec']:>9.1f} {r['rows_per_sec']:>10.1f} {per_request:>9} "
+            f"{cpu:>10} {r['peak_rss_mib']:>6.1f} MiB {r['http_missing']:>8} {r['http_injected_errors']:>7}"
+        )
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, tolerance: float) -> List[str]:
+    """Metrics worse than the baseline by more than the tolerance"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {r["source"]: r for r in json.load(f)["results"]}
+
+    regressions = []
+    for r in results:
+        before = baseline.get(r["source"])
+        if not before:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), r.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            if worse > tolerance:
+                regressions.append(f"{r['source']} {metric}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", default=",".join(SOURCES), help="Comma-separated scrapers to run")
+    parser.add_argument("--fixtures", help="Recordings, one subdirectory per source (default: generated)")
+    parser.add_argument("--units", type=int, default=5, help="Sets / expansions / keywords per scraper")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Latency added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="Max random extra latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of responses turned into 503s")
+    parser.add_argument("--connect-error-rate", type=float, default=0.0, help="Share of requests failed with a connection error")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for latency and errors")
+    parser.add_argument("--pacing", action="store_true", help="Keep politeness delays and rate limits")
+    parser.add_argument("--save", help="Write results as JSON")
+    parser.add_argument("--compare", help="Baseline JSON from --save to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression")
+    parser.add_argument("--child", choices=SOURCES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+        print(json.dumps(asyncio.run(run_child(args))))
+        return 0
+
+    sources = [s.strip() for s in args.sources.split(",") if s.strip()]
+    unknown = set(sources) - set(SOURCES)
+    if unknown:
+        parser.error(f"unknown sources: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory(prefix="scraper-replay-") as seeded:
+        fixtures = args.fixtures
+        if not fixtures:
+            seed_recordings(Path(seeded), args.units)
+            fixtures = seeded
+
+        print(
+            f"Replaying {'recorded' if args.fixtures else 'generated'} responses, "
+            f"latency {args.latency_ms:.0f}+{args.jitter_ms:.0f} ms, "
+            f"errors {args.error_rate:.0%} HTTP / {args.connect_error_rate:.0%} connect, "
+            f"pacing {'on' if args.pacing else 'off'}"
+        )
+        results = [run_source(source, fixtures, args) for source in sources]
+
+    report(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"args": {k: v for k, v in vars(args).items() if k not in ("save", "compare", "child")}, "results": results}, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%} against {args.compare}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
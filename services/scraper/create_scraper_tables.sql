@@ -0,0 +1,95 @@
+-- Create scraper service tables
+
+-- Per-blueprint listing fingerprints for incremental CardTrader crawls
+CREATE TABLE IF NOT EXISTS cardtrader_blueprint_fingerprints (
+    blueprint_id INTEGER PRIMARY KEY,
+    expansion_id INTEGER,
+    
+    listings_hash VARCHAR(64) NOT NULL,
+    listing_hashes JSONB NOT NULL DEFAULT '{}'::jsonb,
+    listing_count INTEGER DEFAULT 0,
+    
+    unchanged_runs INTEGER DEFAULT 0,
+    last_seen_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_changed_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_cardtrader_blueprint_fingerprints_expansion_id ON cardtrader_blueprint_fingerprints(expansion_id);
+CREATE INDEX IF NOT EXISTS idx_cardtrader_blueprint_fingerprints_last_changed_at ON cardtrader_blueprint_fingerprints(last_changed_at);
+
+-- Catalog metadata cached between runs (CardTrader expansions and blueprints)
+CREATE TABLE IF NOT EXISTS catalog_cache (
+    source VARCHAR(255) NOT NULL,
+    cache_key VARCHAR(255) NOT NULL,
+    
+    payload JSONB NOT NULL,
+    version VARCHAR(64),
+    item_count INTEGER DEFAULT 0,
+    
+    fetched_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    
+    PRIMARY KEY (source, cache_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_catalog_cache_fetched_at ON catalog_cache(fetched_at);
+
+-- Progress of the latest run per source, for --resume after a crash
+CREATE TABLE IF NOT EXISTS scrape_checkpoints (
+    source VARCHAR(255) PRIMARY KEY,
+    run_id VARCHAR(36) NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    
+    completed_keys JSONB NOT NULL DEFAULT '[]'::jsonb,
+    last_completed_key VARCHAR(255),
+    last_blueprint_id INTEGER,
+    items_scraped INTEGER DEFAULT 0,
+    
+    started_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+-- Distributed scrape work queue (claimed with FOR UPDATE SKIP LOCKED)
+CREATE TABLE IF NOT EXISTS scrape_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    
+    source VARCHAR(50) NOT NULL,
+    unit_type VARCHAR(50) NOT NULL,
+    unit_key VARCHAR(255) NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    priority INTEGER NOT NULL DEFAULT 0,
+    
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    available_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    
+    lease_owner VARCHAR(255),
+    lease_expires_at TIMESTAMP WITH TIME ZONE,
+    
+    items_scraped INTEGER DEFAULT 0,
+    last_error TEXT,
+    
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    completed_at TIMESTAMP WITH TIME ZONE,
+    
+    CONSTRAINT uq_scrape_jobs_unit UNIQUE (unit_type, unit_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_scrape_jobs_source ON scrape_jobs(source);
+CREATE INDEX IF NOT EXISTS idx_scrape_jobs_claim ON scrape_jobs(status, priority, available_at);
+
+-- Circuit breaker state per host at the end of each scrape run
+ALTER TABLE scrape_logs ADD COLUMN IF NOT EXISTS circuit_state JSONB;
+
+-- Per-stage timing breakdown of each scrape run (fetch/parse/write/sleep/rate_limit)
+ALTER TABLE scrape_logs ADD COLUMN IF NOT EXISTS timings JSONB;
+
+-- Listing-level de-duplication: rows with a marketplace listing ID are
+-- upserted on (source, listing_key) instead of appended on every scrape
+ALTER TABLE raw_prices ADD COLUMN IF NOT EXISTS listing_key VARCHAR(255);
+ALTER TABLE raw_prices ADD COLUMN IF NOT EXISTS last_seen_at TIMESTAMP WITH TIME ZONE;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_raw_prices_source_listing_key ON raw_prices(source, listing_key);
@@ -4,6 +4,7 @@ CardMarket Scraper - Standalone Entry Point
 
 This script can be run directly or from cron:
     python run_cardmarket.py
+    python run_cardmarket.py --resume   # continue a crashed run
 
 Or with Docker:
     docker compose exec scraper python run_cardmarket.py
@@ -12,6 +13,7 @@ Cron example (daily at 3 AM):
     0 3 * * * cd /path/to/project && docker compose exec -T scraper python run_cardmarket.py >> /var/log/cardmarket_scraper.log 2>&1
 """
 
+import argparse
 import asyncio
 import logging
 import sys
@@ -30,9 +32,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def main():
+async def main(resume: bool = False):
     """
     Main entry point for CardMarket scraper
+    
+    Args:
+        resume: Skip sets completed by the last unfinished run
     """
     start_time = datetime.now()
     logger.info("=" * 80)
@@ -50,7 +55,7 @@ async def main():
         logger.info("Database initialized")
         
         # Run scraper
-        exit_code = await run_cardmarket_scraper()
+        exit_code = await run_cardmarket_scraper(resume=resume)
         
         # Calculate duration
         end_time = datetime.now()
@@ -69,5 +74,12 @@ async def main():
 
 
 if __name__ == "__main__":
-    exit_code = asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Scrape Pokemon prices from CardMarket")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip sets completed by the last unfinished run",
+    )
+    args = parser.parse_args()
+    exit_code = asyncio.run(main(resume=args.resume))
     sys.exit(exit_code)
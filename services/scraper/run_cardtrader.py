@@ -5,11 +5,13 @@ Run this script to scrape Pokemon listings from CardTrader.com
 
 Usage:
     python run_cardtrader.py
+    python run_cardtrader.py --resume   # continue a crashed run
     
 Or via Docker:
     docker compose exec scraper python run_cardtrader.py
 """
 
+import argparse
 import asyncio
 import logging
 import sys
@@ -33,7 +35,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def main():
+async def main(resume: bool = False):
     """Main execution"""
     logger.info("=" * 60)
     logger.info("CardTrader Scraper V2 - API-Based")
@@ -46,7 +48,7 @@ async def main():
         sys.exit(1)
     
     try:
-        count = await run_cardtrader_scraper()
+        count = await run_cardtrader_scraper(resume=resume)
         
         logger.info("=" * 60)
         logger.info("CardTrader scraper completed successfully")
@@ -61,4 +63,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Scrape Pokemon listings from CardTrader")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip expansions completed by the last unfinished run",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(resume=args.resume))
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Scrape Orchestrator Entry Point
+One long-running process that runs every enabled source on its own schedule
+(ORCHESTRATOR_SCHEDULES) with warm HTTP clients and DB pool, instead of one
+cron process per run_*.py script.
+
+Usage:
+    python run_orchestrator.py                            # serve enabled sources
+    python run_orchestrator.py serve --sources CardTrader eBay --run-now
+    python run_orchestrator.py run CardTrader [--resume]  # trigger a run in the served process
+    python run_orchestrator.py status                     # runs, last results, next runs
+    python run_orchestrator.py once CardMarket eBay       # run in-process once and exit
+
+Or via Docker:
+    docker compose run -d --name scraper-orchestrator scraper python run_orchestrator.py
+    docker exec scraper-orchestrator python run_orchestrator.py run eBay
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import httpx
+
+from app.config import settings
+from app.orchestrator import SOURCES, ScrapeOrchestrator
+
+
+# Configure logging
+logging.basicConfig(
+    level=getattr(logging, settings.LOG_LEVEL),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+logger = logging.getLogger(__name__)
+
+
+def control_url(path: str) -> str:
+    """URL of the served orchestrator's control API"""
+    host = settings.ORCHESTRATOR_HOST
+    if host in ("0.0.0.0", "::", ""):
+        host = "127.0.0.1"
+    return f"http://{host}:{settings.ORCHESTRATOR_PORT}{path}"
+
+
+async def serve(args: argparse.Namespace) -> int:
+    """Run the orchestrator until SIGINT / SIGTERM"""
+    orchestrator = ScrapeOrchestrator(sources=args.sources)
+    if not orchestrator.sources:
+        logger.error("No sources enabled (set CARDMARKET_ENABLED / CARDTRADER_ENABLED / EBAY_ENABLED / TCGPLAYER_ENABLED or pass --sources)")
+        return 1
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, orchestrator.request_stop)
+
+    try:
+        await orchestrator.start(run_now=args.run_now)
+        await orchestrator.run_forever()
+        return 0
+
+    except Exception as e:
+        logger.error(f"Fatal error: {e}", exc_info=True)
+        return 1
+    finally:
+        await orchestrator.stop()
+
+
+async def once(args: argparse.Namespace) -> int:
+    """Run sources once in this process (all side by side) and exit"""
+    orchestrator = ScrapeOrchestrator(sources=args.sources)
+    if not orchestrator.sources:
+        logger.error("No sources enabled (set CARDMARKET_ENABLED / CARDTRADER_ENABLED / EBAY_ENABLED / TCGPLAYER_ENABLED or name them)")
+        return 1
+
+    try:
+        runs = await orchestrator.run_once(resume=args.resume)
+    finally:
+        await orchestrator.stop()
+
+    for source, run in runs.items():
+        logger.info(f"{source}: {run['status']}, {run.get('items', 0)} items")
+    return 0 if all(run["status"] in ("success", "skipped") for run in runs.values()) else 1
+
+
+def run(args: argparse.Namespace) -> int:
+    """Trigger a run in the served orchestrator"""
+    params = {"resume": "1"} if args.resume else None
+    try:
+        response = httpx.post(control_url(f"/run/{args.source}"), params=params, timeout=10.0)
+    except httpx.RequestError as e:
+        logger.error(f"Orchestrator not reachable at {control_url('')}: {e}")
+        return 1
+
+    if response.status_code == 202:
+        logger.info(f"▶️ {args.source} run started")
+        return 0
+    if response.status_code == 409:
+        logger.info(f"⏭️ {args.source} is already running")
+        return 0
+    logger.error(f"Trigger failed ({response.status_code}): {response.text}")
+    return 1
+
+
+def status(args: argparse.Namespace) -> int:
+    """Print the served orchestrator's status"""
+    try:
+        response = httpx.get(control_url("/status"), timeout=10.0)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.error(f"Orchestrator not reachable at {control_url('')}: {e}")
+        return 1
+
+    print(json.dumps(response.json(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every scrape source from one long-running process")
+    commands = parser.add_subparsers(dest="command")
+
+    serve_parser = commands.add_parser("serve", help="Run sources on their schedules (default)")
+    serve_parser.add_argument("--sources", nargs="+", choices=SOURCES, help="Only run these sources")
+    serve_parser.add_argument("--run-now", action="store_true", help="Also run every source at startup")
+
+    once_parser = commands.add_parser("once", help="Run sources once in this process and exit")
+    once_parser.add_argument("sources", nargs="*", metavar="SOURCE", help=f"Sources to run: {', '.join(SOURCES)} (default: enabled ones)")
+    once_parser.add_argument("--resume", action="store_true", help="Continue the last unfinished runs")
+
+    run_parser = commands.add_parser("run", help="Trigger a run in the served orchestrator")
+    run_parser.add_argument("source", choices=SOURCES)
+    run_parser.add_argument("--resume", action="store_true", help="Continue the last unfinished run")
+
+    commands.add_parser("status", help="Show the served orchestrator's status")
+
+    args = parser.parse_args()
+    if args.command in (None, "serve"):
+        args.sources = getattr(args, "sources", None)
+        args.run_now = getattr(args, "run_now", False)
+        sys.exit(asyncio.run(serve(args)))
+    if args.command == "once":
+        unknown = set(args.sources) - set(SOURCES)
+        if unknown:
+            once_parser.error(f"unknown sources: {', '.join(sorted(unknown))}")
+        sys.exit(asyncio.run(once(args)))
+    if args.command == "run":
+        sys.exit(run(args))
+    sys.exit(status(args))
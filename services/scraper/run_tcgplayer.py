@@ -40,7 +40,7 @@ async def main():
     logger.info("US marketplace with international shipping")
     logger.info("=" * 60)
     
-    if config.USE_API and not config.API_PUBLIC_KEY:
+    if config.USE_API and not (config.API_PUBLIC_KEY and config.API_PRIVATE_KEY):
         logger.warning("API mode enabled but no API credentials provided!")
         logger.warning("Get access from: https://www.tcgplayer.com/partner")
         logger.warning("Falling back to web scraping...")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Scrape Job Worker Entry Point
+Works off units from the shared scrape_jobs queue. Start as many of these
+as you like, in any number of containers or hosts; they coordinate through
+Postgres (FOR UPDATE SKIP LOCKED), no broker needed.
+
+Usage:
+    python run_worker.py                          # work enabled sources
+    python run_worker.py --plan                   # enqueue a cycle first
+    python run_worker.py --sources CardTrader --concurrency 8
+
+Or via Docker:
+    docker compose run -d scraper python run_worker.py
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.config import settings
+from app.database import init_db
+from app.job_worker import ScrapeJobWorker
+
+
+# Configure logging
+logging.basicConfig(
+    level=getattr(logging, settings.LOG_LEVEL),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def main(args: argparse.Namespace) -> int:
+    """Main execution"""
+    await init_db()
+
+    worker = ScrapeJobWorker(concurrency=args.concurrency, sources=args.sources)
+    if not worker.sources:
+        logger.error("No sources enabled (set CARDTRADER_ENABLED / CARDMARKET_ENABLED / EBAY_ENABLED or pass --sources)")
+        return 1
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.stop)
+
+    try:
+        if args.plan:
+            await worker.plan_cycle()
+
+        await worker.run()
+        logger.info(f"Queue: {await worker.queue.counts()}")
+        return 0
+
+    except Exception as e:
+        logger.error(f"Fatal error: {e}", exc_info=True)
+        return 1
+    finally:
+        await worker.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Work off scrape units from the shared job queue")
+    parser.add_argument("--plan", action="store_true", help="Enqueue a scrape cycle before working")
+    parser.add_argument("--sources", nargs="+", choices=["CardTrader", "CardMarket", "eBay"], help="Only claim units of these sources")
+    parser.add_argument("--concurrency", type=int, help="Units processed at once (default JOB_WORKER_CONCURRENCY)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,45 @@
+"""
+Parser backend parity tests
+Every HTML parser must produce the same rows with selectolax as with BeautifulSoup
+"""
+
+import asyncio
+import os
+
+import pytest
+
+# The scraper config requires a database URL; parsing never connects
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/test")
+
+from app.config import settings
+from app.utils.html_parser import SELECTOLAX_AVAILABLE
+from benchmark_parsers import FIXTURES_DIR, build_cases, comparable
+
+CASES = build_cases()
+
+
+def parse_with(monkeypatch, backend, parse, html):
+    """Rows parsed from html with the given backend, in this process"""
+    monkeypatch.setattr(settings, "PARSER_BACKEND", backend)
+    monkeypatch.setattr(settings, "PARSE_IN_PROCESS_POOL", False)
+    return comparable(asyncio.run(parse(html)))
+
+
+@pytest.mark.parametrize("label,fixture,parse", CASES, ids=[case[0] for case in CASES])
+def test_bs4_parses_fixture(monkeypatch, label, fixture, parse):
+    """The BeautifulSoup baseline finds rows in every fixture"""
+    html = (FIXTURES_DIR / fixture).read_text(encoding="utf-8")
+
+    assert parse_with(monkeypatch, "bs4", parse, html), f"{label}: no rows parsed"
+
+
+@pytest.mark.skipif(not SELECTOLAX_AVAILABLE, reason="selectolax is not installed")
+@pytest.mark.parametrize("label,fixture,parse", CASES, ids=[case[0] for case in CASES])
+def test_selectolax_matches_bs4(monkeypatch, label, fixture, parse):
+    """selectolax rows equal the BeautifulSoup rows, field for field and in order"""
+    html = (FIXTURES_DIR / fixture).read_text(encoding="utf-8")
+
+    expected = parse_with(monkeypatch, "bs4", parse, html)
+    actual = parse_with(monkeypatch, "selectolax", parse, html)
+
+    assert actual == expected